@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+
+"""
+The synchronous Textract ``AnalyzeDocument`` API, for the low latency
+processing of small documents.
+
+See:
+
+- :class:`SyncAnalyzeSetting`
+- :func:`analyze_document`
+"""
+
+import typing as T
+import dataclasses
+
+from .vendor.better_dataclasses import DataClass
+from .landing import MB
+
+
+@dataclasses.dataclass
+class SyncAnalyzeSetting(DataClass):
+    """
+    The limits to analyze a document with the synchronous ``AnalyzeDocument``
+    API instead of the async ``StartDocumentAnalysis`` job. The synchronous
+    API returns the result in seconds, there is no job queueing and no
+    waiting, but it only takes one page at a time.
+
+    A document uses the synchronous API if:
+
+    - it has at most ``max_pages`` pages (components).
+    - every component is at most ``max_page_size`` bytes. The synchronous
+      API accepts at most 10 MB of document bytes.
+
+    :param max_pages: the max number of pages of the document.
+    :param max_page_size: the max size of each component in bytes.
+    """
+
+    max_pages: int = dataclasses.field(default=3)
+    max_page_size: int = dataclasses.field(default=5 * MB)
+
+    def __post_init__(self):
+        if self.max_pages < 1:
+            raise ValueError("max_pages has to be at least 1")
+        if not (0 < self.max_page_size <= 10 * MB):
+            raise ValueError("max_page_size has to be in (0, 10 MB]")
+
+
+def analyze_document(
+    textract_client,
+    content: bytes,
+    feature_types: T.List[str],
+) -> dict:
+    """
+    Analyze a single page document (PDF, PNG, JPEG or TIFF) with the
+    synchronous ``AnalyzeDocument`` API.
+
+    :param textract_client: the boto3 Textract client.
+    :param content: the document bytes.
+    :param feature_types: the Textract feature types, for example ``["FORMS"]``.
+
+    :return: the ``AnalyzeDocument`` response without ``ResponseMetadata``,
+        it has the same ``Blocks`` format as the ``GetDocumentAnalysis``
+        response.
+    """
+    res = textract_client.analyze_document(
+        Document={"Bytes": content},
+        FeatureTypes=feature_types,
+    )
+    res.pop("ResponseMetadata", None)
+    return res
@@ -15,14 +15,63 @@ from .landing import MetadataKeyEnum
 from .landing import LandingDocument
 from .landing import get_md5_of_bytes
 from .landing import get_tar_file_md5
+from .landing import get_s3_object_hash
 from .landing import get_doc_md5
+from .landing import copy_s3_object
 from .segment import SegmentPdfResult
 from .segment import segment_pdf
+from .segment import ImageFormatEnum
+from .segment import ImageSetting
+from .segment import SegmentPdfPage
+from .segment import iter_segment_pdf
+from .segment import TextLayerSetting
+from .segment import extract_page_text_layer
+from .segment import TextSection
+from .segment import iter_segment_word
+from .segment import segment_word
+from .segment import TableChunk
+from .segment import iter_segment_excel
+from .segment import segment_excel
+from .segment import iter_segment_ppt
+from .segment import segment_ppt
+from .segment import iter_segment_text
+from .segment import iter_line_chunks
+from .segment import DataChunk
+from .segment import iter_segment_data
+from .segment import iter_segment_json
+from .serializer import JsonFormatEnum
+from .serializer import JsonEngineEnum
+from .serializer import CompressionEnum
+from .serializer import JsonSetting
+from .throttle import TokenBucket
+from .throttle import is_throttling_error
+from .throttle import call_with_backoff
+from .waiter import JobStatusEnum
+from .waiter import JobTiming
+from .waiter import TextractJobFailedError
+from .waiter import wait_jobs_to_succeed
+from .waiter import wait_document_analysis_jobs_to_succeed
+from .analyze import SyncAnalyzeSetting
+from .analyze import analyze_document
 from .tracker import ComponentToTextractOutputResult
 from .tracker import TextractOutputToTextAndJsonResult
+from .tracker import TextAndJsonSummary
 from .tracker import Component
+from .tracker import ComponentProgress
 from .tracker import Data
 from .tracker import StepEnum
 from .tracker import MoveToNextStepResult
+from .tracker import PartialFailureError
+from .tracker import ComponentUploadError
+from .tracker import TextractSubmitError
+from .tracker import TextAndJsonConvertError
 from .tracker import BaseStatusAndUpdateTimeIndex
+from .tracker import ComponentStatusEnum
+from .tracker import BaseComponentTracker
 from .tracker import BaseTracker
+from .notification import TextractNotification
+from .notification import CompletionConsumerStats
+from .notification import CompletionConsumer
+from .scheduler import get_pending_status_list
+from .scheduler import SchedulerStats
+from .scheduler import Scheduler
@@ -106,13 +106,14 @@ class S3ContentTypeEnum(BetterStrEnum):
     image_bmp = "image/bmp"
     image_tiff = "image/tiff"
     image_gif = "image/gif"
+    image_webp = "image/webp"
 
     # document
     ms_word = "application/msword"
     ms_ppt = "application/mspowerpoint"
     ms_excel = "application/x-msexcel"
 
-    pdf = "	application/pdf"
+    pdf = "application/pdf"
 
     # archive
     zip = "application/zip"
@@ -122,6 +123,8 @@ class S3ContentTypeEnum(BetterStrEnum):
 
     # data format
     json = "application/json"
+    json_lines = "application/x-ndjson"
+    parquet = "application/vnd.apache.parquet"
     csv = "text/csv"
 
 
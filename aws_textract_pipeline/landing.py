@@ -7,6 +7,7 @@ Landing bucket is where the intake documents are stored at the beginning of the
 import typing as T
 import tarfile
 import dataclasses
+import concurrent.futures
 
 from s3pathlib import S3Path
 from boto_session_manager import BotoSesManager
@@ -37,11 +38,18 @@ class LandingDocument(DataClass):
             "doc_type": "pdf|word|excel|ppt|image|..." # the type of the document
             "features": ["TABLES"|"FORMS"|"QUERIES"|"SIGNATURES"|"LAYOUT", ...]
         }
+
+    The ``size``, ``content_type`` and ``metadata`` are only available
+    when it is created by :meth:`load`, so the caller can reuse them without
+    another ``head_object`` call.
     """
 
     s3uri: str = dataclasses.field()
     doc_type: str = dataclasses.field()
     features: T.List[str] = dataclasses.field()
+    size: T.Optional[int] = dataclasses.field(default=None)
+    content_type: T.Optional[str] = dataclasses.field(default=None)
+    metadata: T.Optional[T.Dict[str, str]] = dataclasses.field(default=None)
 
     @classmethod
     def load(
@@ -63,6 +71,9 @@ class LandingDocument(DataClass):
             s3uri=s3path.uri,
             doc_type=doc_type,
             features=features,
+            size=s3path.size,
+            content_type=s3path.response.get("ContentType"),
+            metadata=dict(s3path.metadata),
         )
 
     def dump(
@@ -91,6 +102,205 @@ class LandingDocument(DataClass):
         )
 
 
+KB = 1024
+MB = 1024 * KB
+GB = 1024 * MB
+
+DEFAULT_MULTIPART_THRESHOLD = 128 * MB
+DEFAULT_PART_SIZE = 64 * MB
+_MIN_PART_SIZE = 5 * MB
+_MAX_PART_SIZE = 5 * GB
+_MAX_PARTS = 10000
+
+
+def _get_part_size(size: int, part_size: int) -> int:
+    """
+    Adjust the part size to meet the S3 multipart upload limits, at least
+    5 MB, at most 5 GB, and at most 10,000 parts.
+    """
+    part_size = max(part_size, _MIN_PART_SIZE, -(-size // _MAX_PARTS))
+    return min(part_size, _MAX_PART_SIZE)
+
+
+def copy_s3_object(
+    s3_client,
+    s3path_src: "S3Path",
+    s3path_dst: "S3Path",
+    size: int,
+    metadata: T.Dict[str, str],
+    content_type: T.Optional[str] = None,
+    multipart_threshold: int = DEFAULT_MULTIPART_THRESHOLD,
+    part_size: int = DEFAULT_PART_SIZE,
+    max_workers: int = 1,
+) -> int:
+    """
+    Server side copy an S3 object and replace its metadata. The size is
+    given by the caller, so no ``head_object`` call is needed.
+
+    Objects smaller than ``multipart_threshold`` are copied with a single
+    ``CopyObject`` call, it is limited to 5 GB. Larger objects are copied
+    with multipart upload, the ``UploadPartCopy`` calls run concurrently
+    with a thread pool. The multipart upload is aborted if any part failed.
+
+    :param s3_client: the boto3 S3 client.
+    :param s3path_src: the source S3 object.
+    :param s3path_dst: the destination S3 object.
+    :param size: the size of the source object in bytes.
+    :param metadata: the metadata of the destination object.
+    :param content_type: the content type of the destination object.
+    :param multipart_threshold: use multipart copy if the size is greater
+        than or equal to this value.
+    :param part_size: the size of each part, it is adjusted to meet the S3
+        limits.
+    :param max_workers: number of threads to copy the parts.
+
+    :return: number of parts, 0 means single request copy.
+    """
+    kwargs = dict(Bucket=s3path_dst.bucket, Key=s3path_dst.key, Metadata=metadata)
+    if content_type is not None:
+        kwargs["ContentType"] = content_type
+    copy_source = dict(Bucket=s3path_src.bucket, Key=s3path_src.key)
+    if size < min(multipart_threshold, _MAX_PART_SIZE):
+        s3_client.copy_object(
+            CopySource=copy_source,
+            MetadataDirective="REPLACE",
+            **kwargs,
+        )
+        return 0
+
+    part_size = _get_part_size(size, part_size)
+    ranges = [
+        (start, min(start + part_size, size) - 1)
+        for start in range(0, size, part_size)
+    ]
+    upload_id = s3_client.create_multipart_upload(**kwargs)["UploadId"]
+
+    def upload_part_copy(part_number: int, start: int, end: int) -> dict:
+        res = s3_client.upload_part_copy(
+            Bucket=s3path_dst.bucket,
+            Key=s3path_dst.key,
+            UploadId=upload_id,
+            PartNumber=part_number,
+            CopySource=copy_source,
+            CopySourceRange=f"bytes={start}-{end}",
+        )
+        return dict(PartNumber=part_number, ETag=res["CopyPartResult"]["ETag"])
+
+    try:
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+            parts = list(
+                executor.map(
+                    upload_part_copy,
+                    range(1, len(ranges) + 1),
+                    [start for start, _ in ranges],
+                    [end for _, end in ranges],
+                )
+            )
+        s3_client.complete_multipart_upload(
+            Bucket=s3path_dst.bucket,
+            Key=s3path_dst.key,
+            UploadId=upload_id,
+            MultipartUpload=dict(Parts=parts),
+        )
+    except Exception as e:
+        s3_client.abort_multipart_upload(
+            Bucket=s3path_dst.bucket,
+            Key=s3path_dst.key,
+            UploadId=upload_id,
+        )
+        raise e
+    return len(ranges)
+
+
+DEFAULT_HASH_CHUNK_SIZE = 1 * MB
+
+
+def _hash_s3_object(
+    s3_client,
+    s3path: "S3Path",
+    algo: HashAlgoEnum,
+    chunk_size: int,
+    range_: T.Optional[T.Tuple[int, int]] = None,
+) -> str:
+    """
+    Stream the S3 object (or a byte range of it) and hash it chunk by chunk.
+    """
+    kwargs = dict(Bucket=s3path.bucket, Key=s3path.key)
+    if range_ is not None:
+        kwargs["Range"] = f"bytes={range_[0]}-{range_[1]}"
+    body = s3_client.get_object(**kwargs)["Body"]
+    try:
+        return hashes.of_file_object(
+            body,
+            chunk_size=chunk_size,
+            algo=algo,
+            hexdigest=True,
+        )
+    finally:
+        body.close()
+
+
+def get_s3_object_hash(
+    s3_client,
+    s3path: "S3Path",
+    algo: T.Union[str, HashAlgoEnum] = HashAlgoEnum.md5,
+    chunk_size: int = DEFAULT_HASH_CHUNK_SIZE,
+    size: T.Optional[int] = None,
+    part_size: T.Optional[int] = None,
+    max_workers: int = 1,
+) -> str:
+    """
+    Get the hash of an S3 object with constant memory, the body is streamed
+    and hashed ``chunk_size`` bytes at a time. The result is the same as
+    hashing the whole content at once.
+
+    If ``part_size`` is given, the object is split into byte ranges of
+    ``part_size``, each range is downloaded and hashed in parallel with
+    ranged GET, then the result is the hash of the ``-`` joined range
+    hashes (a tree hash). It is faster for very large objects, but the
+    value is different from the plain hash if the object is larger than
+    ``part_size``, always use the same ``part_size`` for the same purpose.
+
+    :param s3_client: the boto3 S3 client.
+    :param s3path: the S3 object.
+    :param algo: the hash algorithm, see ``HashAlgoEnum``.
+    :param chunk_size: the read size in bytes.
+    :param size: the object size in bytes, only used with ``part_size``,
+        if not given, it is read with a ``head_object`` call.
+    :param part_size: the range size in bytes for the tree hash, None means
+        no tree hash.
+    :param max_workers: number of threads to hash the ranges.
+    """
+    algo = HashAlgoEnum(algo)
+    if part_size is not None:
+        if size is None:
+            size = s3_client.head_object(Bucket=s3path.bucket, Key=s3path.key)[
+                "ContentLength"
+            ]
+        if size > part_size:
+            ranges = [
+                (start, min(start + part_size, size) - 1)
+                for start in range(0, size, part_size)
+            ]
+            with concurrent.futures.ThreadPoolExecutor(
+                max_workers=max_workers
+            ) as executor:
+                hash_list = list(
+                    executor.map(
+                        lambda range_: _hash_s3_object(
+                            s3_client, s3path, algo, chunk_size, range_
+                        ),
+                        ranges,
+                    )
+                )
+            return hashes.of_bytes(
+                "-".join(hash_list).encode("utf-8"),
+                algo=algo,
+                hexdigest=True,
+            )
+    return _hash_s3_object(s3_client, s3path, algo, chunk_size)
+
+
 def get_md5_of_bytes(b: bytes) -> str:
     """
     Get md5 of a binary object.
@@ -101,27 +311,36 @@ def get_md5_of_bytes(b: bytes) -> str:
 def get_tar_file_md5(
     bsm: "BotoSesManager",
     s3path: "S3Path",
+    chunk_size: int = DEFAULT_HASH_CHUNK_SIZE,
 ) -> str:
     """
     Get md5 of all files in a tar file on S3. This md5 is deterministic.
     This md5 value is used as the content-based unique id of a document.
+
+    The archive is read in a single pass with the streaming ``r|*`` mode,
+    so the compressed (``.tar.gz``, ``.tar.bz2``, ``.tar.xz``) archives
+    also work. Each member is hashed ``chunk_size`` bytes at a time while
+    reading, then the member md5 are sorted by the member name.
     """
-    with s3path.open("rb", bsm=bsm) as fileobj:
-        with tarfile.open(fileobj=fileobj, mode="r") as tar:
-            file_members = [member for member in tar.getmembers() if member.isfile()]
-            sorted_file_members = list(
-                sorted(
-                    file_members,
-                    key=lambda x: x.name,
-                )
-            )
-            md5_list = list()
-            for member in sorted_file_members:
-                f = tar.extractfile(member)
-                if f is not None:
-                    content = f.read()
-                    md5 = get_md5_of_bytes(content)
-                    md5_list.append(md5)
+    body = bsm.s3_client.get_object(Bucket=s3path.bucket, Key=s3path.key)["Body"]
+    name_and_md5_list = list()
+    try:
+        with tarfile.open(fileobj=body, mode="r|*") as tar:
+            for member in tar:
+                if member.isfile():
+                    f = tar.extractfile(member)
+                    if f is not None:
+                        md5 = hashes.of_file_object(
+                            f,
+                            chunk_size=chunk_size,
+                            algo=HashAlgoEnum.md5,
+                            hexdigest=True,
+                        )
+                        name_and_md5_list.append((member.name, md5))
+    finally:
+        body.close()
+    # sort is stable, members with the same name keep the archive order
+    md5_list = [md5 for _, md5 in sorted(name_and_md5_list, key=lambda x: x[0])]
     md5 = get_md5_of_bytes("-".join(md5_list).encode("utf-8"))
     return md5
 
@@ -130,11 +349,20 @@ def get_doc_md5(
     bsm: "BotoSesManager",
     s3path: "S3Path",
     doc_type: str,
+    algo: T.Union[str, HashAlgoEnum] = HashAlgoEnum.md5,
+    chunk_size: int = DEFAULT_HASH_CHUNK_SIZE,
+    part_size: T.Optional[int] = None,
+    max_workers: int = 1,
 ) -> str:
     """
     Get the md5 of the document based on it's content. In Landing zone, we may use
     the file name as the S3 object key. However, the file name is not unique. The md5
     of the content is a better value for the S3 object key.
+
+    The document is streamed with constant memory, see
+    :func:`get_s3_object_hash` for the ``algo``, ``chunk_size``,
+    ``part_size`` and ``max_workers`` parameters. Note that a different
+    ``algo`` or ``part_size`` gives a different doc_id.
     """
     if doc_type in [
         DocTypeEnum.pdf.value,
@@ -151,6 +379,13 @@ def get_doc_md5(
         DocTypeEnum.csv.value,
         DocTypeEnum.tsv.value,
     ]:
-        return get_md5_of_bytes(s3path.read_bytes(bsm=bsm))
+        return get_s3_object_hash(
+            s3_client=bsm.s3_client,
+            s3path=s3path,
+            algo=algo,
+            chunk_size=chunk_size,
+            part_size=part_size,
+            max_workers=max_workers,
+        )
     else:  # pragma: no cover
         raise TypeError(f"Unsupported doc_type: {doc_type}")
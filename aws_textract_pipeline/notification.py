@@ -0,0 +1,314 @@
+# -*- coding: utf-8 -*-
+
+"""
+Consume the Textract job completion notifications from an SQS queue
+subscribed to the SNS topic that passed to
+:meth:`~aws_textract_pipeline.tracker.BaseTracker.component_to_textract_output`.
+
+See:
+
+- :class:`TextractNotification`
+- :class:`CompletionConsumerStats`
+- :class:`CompletionConsumer`
+"""
+
+import typing as T
+import json
+import dataclasses
+
+import pynamodb_mate as pm
+
+from .vendor.better_dataclasses import DataClass
+from .logger import logger
+from .waiter import JobStatusEnum
+from .tracker import BaseTracker
+
+if T.TYPE_CHECKING:  # pragma: no cover
+    from boto_session_manager import BotoSesManager
+    from .workspace import Workspace
+
+
+@dataclasses.dataclass
+class TextractNotification(DataClass):
+    """
+    The Textract job completion notification.
+
+    :param job_id: the Textract job id.
+    :param status: the job status, SUCCEEDED, FAILED or ERROR.
+    :param api: the Textract API that started the job.
+    :param job_tag: the job tag, it is the doc_id in this library.
+    :param timestamp: the epoch milliseconds when the job finished.
+    """
+
+    job_id: str = dataclasses.field()
+    status: str = dataclasses.field()
+    api: T.Optional[str] = dataclasses.field(default=None)
+    job_tag: T.Optional[str] = dataclasses.field(default=None)
+    timestamp: T.Optional[int] = dataclasses.field(default=None)
+
+    @classmethod
+    def from_sqs_body(cls, body: str) -> "TextractNotification":
+        """
+        Parse the SQS message body. It works with and without the SNS
+        raw message delivery.
+
+        :raises ValueError: if it is not a Textract notification.
+        """
+        dct = json.loads(body)
+        # SNS envelope
+        if dct.get("Type") == "Notification" and "Message" in dct:
+            dct = json.loads(dct["Message"])
+        if ("JobId" not in dct) or ("Status" not in dct):
+            raise ValueError(f"not a Textract notification: {body[:200]!r}")
+        return cls(
+            job_id=dct["JobId"],
+            status=dct["Status"],
+            api=dct.get("API"),
+            job_tag=dct.get("JobTag"),
+            timestamp=dct.get("Timestamp"),
+        )
+
+    @property
+    def is_succeeded(self) -> bool:
+        return self.status == JobStatusEnum.SUCCEEDED.value
+
+
+@dataclasses.dataclass
+class CompletionConsumerStats(DataClass):
+    """
+    The counters of the :class:`CompletionConsumer`.
+
+    :param n_message: number of the received messages.
+    :param n_invalid: number of the messages that are not a Textract
+        notification, or don't belong to a known document.
+    :param n_job_failed: number of the failed Textract jobs.
+    :param n_converted: number of the documents converted to text and json.
+    :param n_convert_failed: number of the documents failed to convert,
+        their messages are left in the queue for a retry.
+    :param n_not_ready: number of the times a document got the notification
+        but it is not ready to convert. If its Textract job ids are not
+        committed yet, or it is being converted by others, its messages are
+        left in the queue for a retry. If some of its jobs are not submitted
+        yet, its messages are deleted, the notifications of the jobs
+        submitted by the retry trigger the conversion.
+    """
+
+    n_message: int = dataclasses.field(default=0)
+    n_invalid: int = dataclasses.field(default=0)
+    n_job_failed: int = dataclasses.field(default=0)
+    n_converted: int = dataclasses.field(default=0)
+    n_convert_failed: int = dataclasses.field(default=0)
+    n_not_ready: int = dataclasses.field(default=0)
+
+
+class CompletionConsumer:
+    """
+    Read the Textract completion notifications from an SQS queue in
+    batches, map the ``JobTag`` back to the tracker, record the succeeded
+    job ids, and run :meth:`BaseTracker.textract_output_to_text_and_json`
+    once all the jobs of a document succeeded. No worker is blocked on
+    waiting the Textract jobs.
+
+    The messages are deleted after they are handled. If the job ids are not
+    committed by :meth:`BaseTracker.component_to_textract_output` yet (a
+    one-page job may finish before that), or the text and json
+    conversion failed, the messages of that document are not deleted, so
+    SQS delivers them again after the visibility timeout, and the
+    conversion is retried (the redrive policy of the queue applies). If some
+    jobs of a document are not submitted (partial submit failure), the
+    succeeded job ids are recorded and the messages are deleted, the
+    notifications of the jobs submitted by the retry trigger the conversion.
+
+    Usage example::
+
+        >>> consumer = CompletionConsumer(
+        ...     tracker_class=Tracker,
+        ...     bsm=bsm,
+        ...     workspace=workspace,
+        ...     queue_url=queue_url,
+        ... )
+        >>> while True:
+        ...     consumer.poll()
+
+    :param tracker_class: the subclass of :class:`BaseTracker`.
+    :param bsm: ``boto_session_manager.BotoSesManager`` object.
+    :param workspace: :class:`aws_textract_pipeline.workspace.Workspace` object.
+    :param queue_url: the SQS queue url.
+    :param batch_size: max number of messages per receive call, up to 10.
+    :param wait_time_seconds: the SQS long polling wait time.
+    :param text_and_json_kwargs: additional keyword arguments for
+        :meth:`BaseTracker.textract_output_to_text_and_json`.
+    """
+
+    def __init__(
+        self,
+        tracker_class: T.Type[BaseTracker],
+        bsm: "BotoSesManager",
+        workspace: "Workspace",
+        queue_url: str,
+        batch_size: int = 10,
+        wait_time_seconds: int = 20,
+        text_and_json_kwargs: T.Optional[T.Dict[str, T.Any]] = None,
+    ):
+        self.tracker_class = tracker_class
+        self.bsm = bsm
+        self.workspace = workspace
+        self.queue_url = queue_url
+        self.batch_size = batch_size
+        self.wait_time_seconds = wait_time_seconds
+        self.text_and_json_kwargs = text_and_json_kwargs or {}
+        self.stats = CompletionConsumerStats()
+
+    def receive(self) -> T.List[dict]:
+        """
+        Receive a batch of messages with long polling.
+        """
+        res = self.bsm.sqs_client.receive_message(
+            QueueUrl=self.queue_url,
+            MaxNumberOfMessages=self.batch_size,
+            WaitTimeSeconds=self.wait_time_seconds,
+        )
+        return res.get("Messages", [])
+
+    def delete(self, messages: T.List[dict]):
+        """
+        Delete the handled messages with the SQS batch API.
+        """
+        for ith in range(0, len(messages), 10):
+            self.bsm.sqs_client.delete_message_batch(
+                QueueUrl=self.queue_url,
+                Entries=[
+                    dict(Id=str(jth), ReceiptHandle=message["ReceiptHandle"])
+                    for jth, message in enumerate(messages[ith : ith + 10])
+                ],
+            )
+
+    def handle_document(
+        self,
+        doc_id: str,
+        notification_list: T.List[TextractNotification],
+    ) -> bool:
+        """
+        Handle the notifications of one document.
+
+        :return: True if the messages can be deleted.
+        """
+        tracker = self.tracker_class.get_one_or_none(task_id=doc_id)
+        if tracker is None:
+            logger.info(f"document {doc_id} not found, skip")
+            self.stats.n_invalid += len(notification_list)
+            return True
+        for notification in notification_list:
+            if notification.is_succeeded is False:
+                logger.info(
+                    f"Textract job {notification.job_id} of document {doc_id} "
+                    f"is {notification.status}"
+                )
+                self.stats.n_job_failed += 1
+        job_id_list = [
+            notification.job_id
+            for notification in notification_list
+            if notification.is_succeeded
+        ]
+        if len(job_id_list) == 0:
+            return True
+        tracker.add_succeeded_job_ids(job_id_list)
+        status_enum = tracker.STATUS_ENUM
+        if tracker.status >= (
+            status_enum.s05060_textract_output_to_text_and_json_succeeded.value
+        ):
+            # already converted by others
+            return True
+        result = tracker.get_component_to_textract_output_result()
+        # the job finished before the submitter committed the job ids, or
+        # others are converting it, keep the messages, check again on the
+        # next delivery
+        if (
+            (result is None)
+            or (
+                tracker.status
+                == status_enum.s03020_component_to_textract_output_in_progress.value
+            )
+            or (
+                tracker.status
+                == status_enum.s05020_textract_output_to_text_and_json_in_progress.value
+            )
+        ):
+            self.stats.n_not_ready += 1
+            return False
+        # some jobs are not submitted yet (partial submit failure), the
+        # succeeded job ids are recorded, the notifications of the jobs
+        # submitted by the retry trigger the conversion
+        if (result.is_all_submitted is False) or (
+            tracker.status
+            not in [
+                status_enum.s03060_component_to_textract_output_succeeded.value,
+                status_enum.s05000_textract_output_to_text_and_json_pending.value,
+                status_enum.s05040_textract_output_to_text_and_json_failed.value,
+            ]
+        ):
+            self.stats.n_not_ready += 1
+            return True
+        if tracker.is_all_textract_job_succeeded() is False:
+            return True
+        try:
+            tracker.textract_output_to_text_and_json(
+                bsm=self.bsm,
+                workspace=self.workspace,
+                **self.text_and_json_kwargs,
+            )
+            self.stats.n_converted += 1
+            return True
+        except (
+            pm.patterns.status_tracker.TaskLockedError,
+            pm.patterns.status_tracker.TaskIgnoredError,
+        ):
+            # locked by others, or given up, check again on the next delivery
+            return False
+        except Exception as e:
+            logger.info(f"failed to convert document {doc_id}: {e!r}")
+            self.stats.n_convert_failed += 1
+            return False
+
+    def handle(self, messages: T.List[dict]):
+        """
+        Handle a batch of messages, group the notifications by document.
+        """
+        self.stats.n_message += len(messages)
+        deletable = list()
+        doc_id_to_messages: T.Dict[
+            str, T.List[T.Tuple[dict, TextractNotification]]
+        ] = dict()
+        for message in messages:
+            try:
+                notification = TextractNotification.from_sqs_body(message["Body"])
+            except ValueError as e:  # json.JSONDecodeError is a ValueError
+                logger.info(f"invalid message {message['MessageId']}: {e!r}")
+                self.stats.n_invalid += 1
+                deletable.append(message)
+                continue
+            if notification.job_tag is None:
+                self.stats.n_invalid += 1
+                deletable.append(message)
+                continue
+            doc_id_to_messages.setdefault(notification.job_tag, []).append(
+                (message, notification)
+            )
+        for doc_id, pairs in doc_id_to_messages.items():
+            if self.handle_document(
+                doc_id, [notification for _, notification in pairs]
+            ):
+                deletable.extend(message for message, _ in pairs)
+        if deletable:
+            self.delete(deletable)
+
+    def poll(self) -> int:
+        """
+        Receive and handle one batch of messages.
+
+        :return: number of the received messages.
+        """
+        messages = self.receive()
+        if messages:
+            self.handle(messages)
+        return len(messages)
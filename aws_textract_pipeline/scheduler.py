@@ -0,0 +1,391 @@
+# -*- coding: utf-8 -*-
+
+"""
+A long-running worker that drains the pending documents through
+:meth:`~aws_textract_pipeline.tracker.BaseTracker.move_to_next_stage`.
+
+See:
+
+- :func:`get_pending_status_list`
+- :class:`SchedulerStats`
+- :class:`Scheduler`
+"""
+
+import typing as T
+import time
+import dataclasses
+from datetime import datetime, timezone
+import concurrent.futures
+
+import pynamodb_mate as pm
+
+from .vendor.better_dataclasses import DataClass
+from .logger import logger
+from .throttle import call_with_backoff
+from .waiter import JobStatusEnum
+from .tracker import StepEnum, BaseTracker
+
+if T.TYPE_CHECKING:  # pragma: no cover
+    from boto_session_manager import BotoSesManager
+    from .workspace import Workspace
+
+
+_step_to_pending_status_name_list_mapper = {
+    StepEnum.landing_to_raw.value: [
+        "s01000_landing_to_raw_pending",
+        "s01040_landing_to_raw_failed",
+    ],
+    StepEnum.raw_to_component.value: [
+        "s01060_landing_to_raw_succeeded",
+        "s02000_raw_to_component_pending",
+        "s02040_raw_to_component_failed",
+        "s02020_raw_to_component_in_progress",
+    ],
+    StepEnum.component_to_textract_output.value: [
+        "s02060_raw_to_component_succeeded",
+        "s03000_component_to_textract_output_pending",
+        "s03040_component_to_textract_output_failed",
+        "s03020_component_to_textract_output_in_progress",
+    ],
+    StepEnum.textract_output_to_text_and_json.value: [
+        "s03060_component_to_textract_output_succeeded",
+        "s05000_textract_output_to_text_and_json_pending",
+        "s05040_textract_output_to_text_and_json_failed",
+        "s05020_textract_output_to_text_and_json_in_progress",
+    ],
+}
+
+
+def get_pending_status_list(
+    tracker_class: T.Type[BaseTracker],
+    step: str,
+) -> T.List[int]:
+    """
+    Get the status codes of the documents that are waiting for the given
+    step. The in progress status is included, because a worker may die and
+    leave the lock expired, :meth:`BaseTracker.get_next_step` decides if it
+    can be picked up again.
+    """
+    return [
+        tracker_class.STATUS_ENUM[name].value
+        for name in _step_to_pending_status_name_list_mapper[step]
+    ]
+
+
+default_step_concurrency = {
+    StepEnum.landing_to_raw.value: 16,
+    StepEnum.raw_to_component.value: 4,
+    StepEnum.component_to_textract_output.value: 2,
+    StepEnum.textract_output_to_text_and_json.value: 8,
+}
+
+
+@dataclasses.dataclass
+class SchedulerStats(DataClass):
+    """
+    The counters of a :meth:`Scheduler.run` call.
+
+    :param n_round: number of the query and dispatch rounds.
+    :param n_succeeded: number of the steps succeeded, by step.
+    :param n_failed: number of the steps failed, by step. The error is
+        recorded in the tracker.
+    :param n_skipped: number of the documents skipped, because they are
+        locked by another worker, ignored, or already moved by others.
+    """
+
+    n_round: int = dataclasses.field(default=0)
+    n_succeeded: T.Dict[str, int] = dataclasses.field(default_factory=dict)
+    n_failed: T.Dict[str, int] = dataclasses.field(default_factory=dict)
+    n_skipped: int = dataclasses.field(default=0)
+
+
+class Scheduler:
+    """
+    Query the ``BaseStatusAndUpdateTimeIndex`` for the pending documents of
+    each step, and run :meth:`BaseTracker.move_to_next_stage` for many
+    documents concurrently in a thread pool, with a concurrency limit per
+    step. For example, low for the Textract submission to stay under the
+    API quota, and high for the S3 copy.
+
+    A document is claimed by the tracker lock in the ``start`` context
+    manager. If another worker already locked it, it is skipped and picked
+    up again in a later round if it is still pending.
+
+    Usage example::
+
+        >>> scheduler = Scheduler(
+        ...     tracker_class=Tracker,
+        ...     bsm=bsm,
+        ...     workspace=workspace,
+        ...     step_concurrency={"component_to_textract_output": 1},
+        ...     move_to_next_stage_kwargs=dict(use_form_feature=True),
+        ... )
+        >>> scheduler.run() # run forever
+
+    :param tracker_class: the subclass of :class:`BaseTracker`.
+    :param bsm: ``boto_session_manager.BotoSesManager`` object.
+    :param workspace: :class:`aws_textract_pipeline.workspace.Workspace` object.
+    :param step_concurrency: the max number of documents running each step
+        at the same time, it is merged with the defaults. Set it to 0 to
+        disable a step in this worker.
+    :param batch_size: the page size of the status index query, the pages
+        are read until enough dispatchable documents are found.
+    :param poll_interval: the seconds to wait for a running step to finish
+        before the next round, or to sleep if nothing is running. A skipped
+        document is not dispatched again within this interval.
+    :param max_poll_interval: a document that is not ready (its Textract
+        jobs are still running) is checked again after ``poll_interval``,
+        then the interval doubles each time, up to this value.
+    :param retry_delay: the minimum seconds before a failed document is
+        dispatched again. It is also checked against the tracker
+        ``update_time``, so it applies to the documents failed in other
+        workers or in a previous run.
+    :param move_to_next_stage_kwargs: additional keyword arguments for
+        :meth:`BaseTracker.move_to_next_stage`. Note that the ``max_tps``
+        and ``textract_max_workers`` are per document.
+    """
+
+    def __init__(
+        self,
+        tracker_class: T.Type[BaseTracker],
+        bsm: "BotoSesManager",
+        workspace: "Workspace",
+        step_concurrency: T.Optional[T.Dict[str, int]] = None,
+        batch_size: int = 10,
+        poll_interval: float = 10,
+        max_poll_interval: float = 300,
+        retry_delay: float = 60,
+        move_to_next_stage_kwargs: T.Optional[T.Dict[str, T.Any]] = None,
+        clock: T.Callable[[], float] = time.monotonic,
+        sleep: T.Callable[[float], None] = time.sleep,
+    ):
+        self.tracker_class = tracker_class
+        self.bsm = bsm
+        self.workspace = workspace
+        self.step_concurrency = dict(default_step_concurrency)
+        if step_concurrency is not None:
+            for step, limit in step_concurrency.items():
+                StepEnum.ensure_is_valid_value(step)
+                self.step_concurrency[step] = limit
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.max_poll_interval = max_poll_interval
+        self.retry_delay = retry_delay
+        self.move_to_next_stage_kwargs = move_to_next_stage_kwargs or {}
+        self._clock = clock
+        self._sleep = sleep
+        # doc_id -> number of consecutive times it is not ready
+        self._n_not_ready: T.Dict[str, int] = dict()
+
+    def query_pending(
+        self,
+        step: str,
+        limit: int,
+        exclude: T.Optional[T.Set[str]] = None,
+    ) -> T.List[BaseTracker]:
+        """
+        Query at most ``limit`` documents waiting for the given step, older
+        documents first. The status index is read page by page, the
+        documents in ``exclude`` (running or deferred in this worker) are
+        skipped, so they don't block the newer documents of the same status.
+
+        :param exclude: the doc_id set to skip.
+        """
+        if exclude is None:
+            exclude = set()
+        tracker_list = list()
+        status_index = self.tracker_class._get_status_index()
+        for status in get_pending_status_list(self.tracker_class, step):
+            for tracker in status_index.query(
+                hash_key=self.tracker_class.make_value(status),
+                scan_index_forward=True,
+                page_size=self.batch_size,
+            ):
+                if tracker.doc_id in exclude:
+                    continue
+                tracker_list.append(tracker)
+                if len(tracker_list) >= limit:
+                    return tracker_list
+        return tracker_list
+
+    def is_ready(self, tracker: BaseTracker, step: str) -> bool:
+        """
+        Check if the document is ready for the step. By default, the
+        text and json step waits for all the Textract jobs to finish.
+        Override this method to add your own rules.
+
+        The jobs already recorded by :meth:`BaseTracker.add_succeeded_job_ids`
+        (for example, by the
+        :class:`~aws_textract_pipeline.notification.CompletionConsumer`) are
+        not polled, and the newly found succeeded jobs are recorded, so
+        each job is polled until it succeeds only.
+        """
+        if step == StepEnum.textract_output_to_text_and_json.value:
+            result = tracker.get_component_to_textract_output_result()
+            if result is None:
+                return True
+            succeeded_job_ids = tracker.succeeded_job_ids or set()
+            new_succeeded_job_ids = list()
+            is_ready = True
+            textract_client = self.bsm.textract_client
+            for job_id in result.all_job_id_list:
+                if job_id in succeeded_job_ids:
+                    continue
+                res = call_with_backoff(
+                    textract_client.get_document_analysis,
+                    JobId=job_id,
+                    MaxResults=1,
+                )
+                if res["JobStatus"] == JobStatusEnum.IN_PROGRESS.value:
+                    is_ready = False
+                    break
+                if res["JobStatus"] == JobStatusEnum.SUCCEEDED.value:
+                    new_succeeded_job_ids.append(job_id)
+            if new_succeeded_job_ids:
+                tracker.add_succeeded_job_ids(new_succeeded_job_ids)
+            return is_ready
+        return True
+
+    def is_retry_delayed(self, tracker: BaseTracker) -> bool:
+        """
+        Check if the document failed less than ``retry_delay`` seconds ago.
+        """
+        if tracker.status not in self._failed_status_set:
+            return False
+        elapsed = datetime.now(timezone.utc) - tracker.update_time
+        return elapsed.total_seconds() < self.retry_delay
+
+    @property
+    def _failed_status_set(self) -> T.Set[int]:
+        return {
+            self.tracker_class.STATUS_ENUM[name].value
+            for name_list in _step_to_pending_status_name_list_mapper.values()
+            for name in name_list
+            if name.endswith("_failed")
+        }
+
+    def get_poll_interval(self, doc_id: str) -> float:
+        """
+        Get the seconds to wait before dispatching a skipped document again,
+        it doubles each time the document is not ready.
+        """
+        n_not_ready = self._n_not_ready.get(doc_id, 0)
+        if n_not_ready <= 1:
+            return self.poll_interval
+        return min(
+            self.poll_interval * 2 ** min(n_not_ready - 1, 30),
+            self.max_poll_interval,
+        )
+
+    def process(self, tracker: BaseTracker, step: str) -> bool:
+        """
+        Run one step for one document in a worker thread.
+
+        :return: True if the step ran, False if the document is skipped.
+        """
+        # the query result may be stale
+        tracker.refresh()
+        if tracker.get_next_step() is not StepEnum.get_by_value(step):
+            return False
+        if self.is_retry_delayed(tracker):
+            return False
+        if self.is_ready(tracker, step) is False:
+            self._n_not_ready[tracker.doc_id] = (
+                self._n_not_ready.get(tracker.doc_id, 0) + 1
+            )
+            return False
+        self._n_not_ready.pop(tracker.doc_id, None)
+        try:
+            tracker.move_to_next_stage(
+                bsm=self.bsm,
+                workspace=self.workspace,
+                **self.move_to_next_stage_kwargs,
+            )
+        except (
+            pm.patterns.status_tracker.TaskLockedError,
+            pm.patterns.status_tracker.TaskIgnoredError,
+        ):
+            return False
+        return True
+
+    def run(
+        self,
+        max_rounds: T.Optional[int] = None,
+        stop_when_idle: bool = False,
+    ) -> SchedulerStats:
+        """
+        Run the worker loop. In each round, for each step, query the pending
+        documents up to the free concurrency slots, and submit them to the
+        thread pool. The later steps are dispatched first, so the documents
+        already in the pipeline finish before the new ones start.
+
+        :param max_rounds: stop after this many rounds, None means forever.
+        :param stop_when_idle: stop when nothing is running and no pending
+            document is found.
+        """
+        stats = SchedulerStats()
+        step_list = [
+            step
+            for step in reversed(list(_step_to_pending_status_name_list_mapper))
+            if self.step_concurrency.get(step, 0) > 0
+        ]
+        futures: T.Dict[concurrent.futures.Future, T.Tuple[str, str]] = dict()
+        # doc_id -> the time it can be dispatched again
+        deferred: T.Dict[str, float] = dict()
+
+        def collect(done: T.Iterable[concurrent.futures.Future]):
+            for future in done:
+                step, doc_id = futures.pop(future)
+                try:
+                    is_processed = future.result()
+                except Exception as e:
+                    logger.info(f"{step} failed for document {doc_id}: {e!r}")
+                    stats.n_failed[step] = stats.n_failed.get(step, 0) + 1
+                    deferred[doc_id] = self._clock() + self.retry_delay
+                    continue
+                if is_processed:
+                    stats.n_succeeded[step] = stats.n_succeeded.get(step, 0) + 1
+                else:
+                    stats.n_skipped += 1
+                    deferred[doc_id] = self._clock() + self.get_poll_interval(doc_id)
+
+        max_workers = sum(self.step_concurrency[step] for step in step_list)
+        with concurrent.futures.ThreadPoolExecutor(
+            max_workers=max(max_workers, 1)
+        ) as executor:
+            while (max_rounds is None) or (stats.n_round < max_rounds):
+                stats.n_round += 1
+                n_submitted = 0
+                now = self._clock()
+                for doc_id, dispatch_time in list(deferred.items()):
+                    if now >= dispatch_time:
+                        deferred.pop(doc_id)
+                for step in step_list:
+                    in_flight_doc_id_set = {doc_id for _, doc_id in futures.values()}
+                    n_in_flight = sum(1 for s, _ in futures.values() if s == step)
+                    n_free = self.step_concurrency[step] - n_in_flight
+                    if n_free <= 0:
+                        continue
+                    tracker_list = self.query_pending(
+                        step,
+                        limit=n_free,
+                        exclude=in_flight_doc_id_set | set(deferred),
+                    )
+                    for tracker in tracker_list:
+                        future = executor.submit(self.process, tracker, step)
+                        futures[future] = (step, tracker.doc_id)
+                        n_submitted += 1
+                if futures:
+                    done, _ = concurrent.futures.wait(
+                        futures,
+                        timeout=self.poll_interval,
+                        return_when=concurrent.futures.FIRST_COMPLETED,
+                    )
+                    collect(done)
+                elif n_submitted == 0:
+                    if stop_when_idle:
+                        break
+                    self._sleep(self.poll_interval)
+            # wait for the running steps before exit
+            collect(list(futures))
+        return stats
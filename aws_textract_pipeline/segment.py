@@ -7,15 +7,42 @@ See:
 
 - :class:`SegmentPdfResult`
 - :func:`segment_pdf`
+- :class:`ImageFormatEnum`
+- :class:`ImageSetting`
+- :class:`SegmentPdfPage`
+- :class:`TextLayerSetting`
+- :func:`extract_page_text_layer`
+- :func:`iter_segment_pdf`
+- :class:`TextSection`
+- :func:`iter_segment_word`
+- :func:`iter_segment_ppt`
+- :func:`iter_segment_text`
+- :class:`TableChunk`
+- :func:`iter_segment_excel`
+- :func:`iter_line_chunks`
+- :class:`DataChunk`
+- :func:`iter_segment_data`
+- :func:`iter_segment_json`
 """
 
 import typing as T
 import io
+import os
+import csv
+import json
+import uuid
+import datetime
+import itertools
 import dataclasses
+import concurrent.futures
 
 import fitz
+import PIL.Image
+from .vendor.better_enum import BetterStrEnum
 from .vendor.better_dataclasses import DataClass
 
+from .doc_type import S3ContentTypeEnum
+
 
 @dataclasses.dataclass
 class SegmentPdfResult(DataClass):
@@ -38,24 +65,57 @@ class SegmentPdfResult(DataClass):
 
         >>> pixmap.width
         >>> pixmap.height
+
+    :param is_repaired: whether the clean and garbage collect rewrite is
+        applied to the document before segmentation.
+    :param page_text_list: the text layer of each page, None if the page has
+        no usable text layer, see :func:`extract_page_text_layer`. It is
+        empty if the text layer detection is disabled.
     """
 
     page_pdf_list: T.List[fitz.Document] = dataclasses.field(default_factory=list)
     page_image_list: T.List[fitz.Pixmap] = dataclasses.field(default_factory=list)
+    is_repaired: bool = dataclasses.field(default=False)
+    page_text_list: T.List[T.Optional["TextSection"]] = dataclasses.field(
+        default_factory=list
+    )
 
 
-def segment_pdf(
+def _is_pdf_broken(pdf: fitz.Document, warnings: str) -> bool:
+    """
+    Check if MuPDF had to repair the document or complained about the xref
+    table when opening it.
+
+    :param pdf: the opened document.
+    :param warnings: the MuPDF warnings emitted when opening the document.
+    """
+    if pdf.is_repaired:
+        return True
+    warnings = warnings.lower()
+    return ("repair" in warnings) or ("xref" in warnings)
+
+
+def _clean_pdf(
     pdf_content: bytes,
-    dpi: int = 200,
-) -> SegmentPdfResult:
+    repair: T.Optional[bool] = True,
+) -> T.Tuple[bytes, bool]:
     """
-    Segment PDF into pages.
+    Load PDF content and rewrite it with ``clean=True, garbage=4``.
 
     :param pdf_content: PDF content in bytes.
-    :param dpi: DPI of the image.
+    :param repair: True, always rewrite; False, never rewrite; None, only
+        rewrite if MuPDF reports repair or xref problems when opening it.
+
+    :return: the (maybe) cleaned PDF content and whether it is rewritten.
     """
     # read original PDF into memory
+    fitz.TOOLS.reset_mupdf_warnings()
     pdf = fitz.Document(stream=pdf_content)
+    if repair is None:
+        repair = _is_pdf_broken(pdf, fitz.TOOLS.mupdf_warnings())
+    if repair is False:
+        pdf.close()
+        return pdf_content, False
 
     # Repair any issues (hopefully) before we hit them
     # See this https://github.com/pymupdf/PyMuPDF/issues/856
@@ -64,11 +124,66 @@ def segment_pdf(
     buffer.write(pdf.write(clean=True, garbage=4))
     new_content = buffer.getvalue()
     buffer.close()
+    pdf.close()
+
+    return new_content, True
+
+
+def _clean_pdf_file(
+    path_in: str,
+    path_out: str,
+    repair: T.Optional[bool] = True,
+) -> bool:
+    """
+    The file based version of :func:`_clean_pdf`. The PDF is never fully
+    loaded into memory.
+
+    :param path_in: the original PDF file path.
+    :param path_out: the cleaned PDF file path, it is only created if
+        the document is rewritten.
+    :param repair: see :func:`_clean_pdf`.
+
+    :return: whether the document is rewritten.
+    """
+    fitz.TOOLS.reset_mupdf_warnings()
+    pdf = fitz.Document(path_in)
+    if repair is None:
+        repair = _is_pdf_broken(pdf, fitz.TOOLS.mupdf_warnings())
+    if repair:
+        pdf.save(path_out, clean=True, garbage=4)
+    pdf.close()
+    return repair
+
 
-    pdf_cleaned = fitz.Document(stream=new_content)
+def segment_pdf(
+    pdf_content: bytes,
+    dpi: int = 200,
+    repair: T.Optional[bool] = True,
+    text_layer_setting: T.Optional["TextLayerSetting"] = None,
+) -> SegmentPdfResult:
+    """
+    Segment PDF into pages.
+
+    .. note::
+
+        This function keeps all pages and images in memory. For large documents,
+        use :func:`iter_segment_pdf` instead.
+
+    :param pdf_content: PDF content in bytes.
+    :param dpi: DPI of the image.
+    :param repair: whether to rewrite the document with ``clean=True, garbage=4``
+        before segmentation. True, always; False, never; None, only if MuPDF
+        reports repair or xref problems when opening the document. The full
+        rewrite doubles the parse time and memory of large documents.
+    :param text_layer_setting: if given, detect the pages that have a usable
+        text layer, see :func:`extract_page_text_layer`.
+    """
+    cleaned, is_repaired = _clean_pdf(pdf_content, repair=repair)
+    pdf_cleaned = fitz.Document(stream=cleaned)
 
     page_pdf_list = list()
     page_image_list = list()
+    page_text_list = list()
 
     for page_num, page in enumerate(pdf_cleaned, start=1):
         # extract page as PDF
@@ -84,25 +199,1231 @@ def segment_pdf(
         pixmap = page.get_pixmap(dpi=dpi)
         page_image_list.append(pixmap)
 
+        if text_layer_setting is not None:
+            page_text_list.append(
+                extract_page_text_layer(page, page_num, text_layer_setting)
+            )
+
     return SegmentPdfResult(
         page_pdf_list=page_pdf_list,
         page_image_list=page_image_list,
+        is_repaired=is_repaired,
+        page_text_list=page_text_list,
     )
 
 
+@dataclasses.dataclass
+class SegmentPdfPage(DataClass):
+    """
+    One page of a PDF document, yielded by :func:`iter_segment_pdf`.
+
+    :param page_num: the 1-based page number.
+    :param pdf_content: the single page PDF in bytes.
+    :param image_content: the image of the page in bytes, PNG by default,
+        see :class:`ImageSetting`.
+    :param is_repaired: whether the document is rewritten before segmentation,
+        it is the same for all pages of a document.
+    :param text_section: the text layer of the page, None if the page has no
+        usable text layer or the detection is disabled, see
+        :func:`extract_page_text_layer`.
+    """
+
+    page_num: int = dataclasses.field()
+    pdf_content: bytes = dataclasses.field()
+    image_content: bytes = dataclasses.field()
+    is_repaired: bool = dataclasses.field(default=False)
+    text_section: T.Optional["TextSection"] = dataclasses.field(default=None)
+
+    @property
+    def is_born_digital(self) -> bool:
+        """
+        Whether the page has a usable text layer, it doesn't need OCR.
+        """
+        return self.text_section is not None
+
+
+class ImageFormatEnum(BetterStrEnum):
+    """
+    Output image format of the page image.
+    """
+
+    png = "png"
+    jpg = "jpg"
+    webp = "webp"
+
+
+image_format_to_content_type_mapper = {
+    ImageFormatEnum.png.value: S3ContentTypeEnum.image_png.value,
+    ImageFormatEnum.jpg.value: S3ContentTypeEnum.image_jpg.value,
+    ImageFormatEnum.webp.value: S3ContentTypeEnum.image_webp.value,
+}
+"""
+Mapping from :class:`ImageFormatEnum` to :class:`~aws_textract_pipeline.doc_type.S3ContentTypeEnum`.
+"""
+
+
+@dataclasses.dataclass
+class ImageSetting(DataClass):
+    """
+    Page image encoding setting.
+
+    :param format: the image format, one of :class:`ImageFormatEnum`.
+    :param quality: the quality of the lossy format (jpg, webp), from 1 to 100.
+        It is ignored for png.
+    :param grayscale: render the page in grayscale instead of RGB.
+    :param max_width: the max width in pixel, if the page image at the given DPI
+        is wider than this, it is rendered at a lower DPI instead.
+    :param max_height: the max height in pixel, similar to ``max_width``.
+    """
+
+    format: str = dataclasses.field(default=ImageFormatEnum.png.value)
+    quality: int = dataclasses.field(default=85)
+    grayscale: bool = dataclasses.field(default=False)
+    max_width: T.Optional[int] = dataclasses.field(default=None)
+    max_height: T.Optional[int] = dataclasses.field(default=None)
+
+    def __post_init__(self):
+        ImageFormatEnum.ensure_is_valid_value(self.format)
+
+    @property
+    def content_type(self) -> str:
+        """
+        The S3 content type of the encoded image.
+        """
+        return image_format_to_content_type_mapper[self.format]
+
+    def get_dpi(self, page: fitz.Page, dpi: int) -> int:
+        """
+        Get the DPI to render the page so that the image fits the max
+        width and height.
+        """
+        if self.max_width is not None:
+            dpi = min(dpi, int(self.max_width * 72 / page.rect.width))
+        if self.max_height is not None:
+            dpi = min(dpi, int(self.max_height * 72 / page.rect.height))
+        return max(dpi, 1)
+
+    def encode(self, pixmap: fitz.Pixmap) -> bytes:
+        """
+        Encode the pixmap in the given format.
+        """
+        if self.format == ImageFormatEnum.png.value:
+            return pixmap.tobytes(output="png")
+        elif self.format == ImageFormatEnum.jpg.value:
+            return pixmap.tobytes(output="jpg", jpg_quality=self.quality)
+        else:
+            mode = "L" if pixmap.n == 1 else "RGB"
+            image = PIL.Image.frombytes(
+                mode, (pixmap.width, pixmap.height), pixmap.samples
+            )
+            buffer = io.BytesIO()
+            image.save(buffer, format="WEBP", quality=self.quality)
+            return buffer.getvalue()
+
+
+@dataclasses.dataclass
+class TextLayerSetting(DataClass):
+    """
+    The rules to decide whether a PDF page has a usable text layer, so that
+    its text can be extracted directly instead of OCR. A page passes if:
+
+    - it has at least ``min_chars`` non-whitespace characters.
+    - the images cover at most ``max_image_coverage`` of the page area. A
+      scanned page is a full page image, even if it has an invisible OCR
+      text layer.
+    - at most ``max_invalid_char_ratio`` of the characters are the
+      replacement character, it is what MuPDF returns for the glyphs
+      without a unicode mapping.
+
+    :param min_chars: see above.
+    :param max_image_coverage: see above, from 0 to 1.
+    :param max_invalid_char_ratio: see above, from 0 to 1.
+    """
+
+    min_chars: int = dataclasses.field(default=20)
+    max_image_coverage: float = dataclasses.field(default=0.5)
+    max_invalid_char_ratio: float = dataclasses.field(default=0.02)
+
+
+def _get_image_coverage(page: fitz.Page) -> float:
+    """
+    Get the ratio of the page area covered by images, the overlapped area
+    is counted more than once, it is capped at 1.
+    """
+    page_rect = page.rect
+    page_area = page_rect.width * page_rect.height
+    if page_area <= 0:  # pragma: no cover
+        return 0.0
+    image_area = 0.0
+    for info in page.get_image_info():
+        rect = fitz.Rect(info["bbox"]) & page_rect
+        if not rect.is_empty:
+            image_area += rect.width * rect.height
+    return min(image_area / page_area, 1.0)
+
+
+def extract_page_text_layer(
+    page: fitz.Page,
+    page_num: int,
+    setting: T.Optional[TextLayerSetting] = None,
+) -> T.Optional["TextSection"]:
+    """
+    Extract the text layer of a PDF page in reading order, one line per
+    text line with its bounding box.
+
+    :param page: the ``fitz.Page`` object.
+    :param page_num: the 1-based page number, it is the section number.
+    :param setting: the rules of a usable text layer, see
+        :class:`TextLayerSetting`.
+
+    :return: None if the page doesn't have a usable text layer.
+    """
+    if setting is None:
+        setting = TextLayerSetting()
+    if _get_image_coverage(page) > setting.max_image_coverage:
+        return None
+    page_rect = page.rect
+    width, height = page_rect.width, page_rect.height
+    lines = list()
+    bboxes = list()
+    n_chars = 0
+    n_invalid = 0
+    for block in page.get_text("dict", sort=True)["blocks"]:
+        if block["type"] != 0:  # not a text block
+            continue
+        for line in block["lines"]:
+            text = "".join(span["text"] for span in line["spans"])
+            n = len(text) - sum(1 for char in text if char.isspace())
+            if n == 0:
+                continue
+            n_chars += n
+            n_invalid += text.count("\ufffd")
+            x0, y0, x1, y1 = line["bbox"]
+            lines.append(text)
+            bboxes.append(
+                [
+                    (x0 - page_rect.x0) / width,
+                    (y0 - page_rect.y0) / height,
+                    (x1 - x0) / width,
+                    (y1 - y0) / height,
+                ]
+            )
+    if n_chars < setting.min_chars:
+        return None
+    if n_invalid > n_chars * setting.max_invalid_char_ratio:
+        return None
+    return TextSection(section_num=page_num, lines=lines, bboxes=bboxes)
+
+
+def _extract_page_pdf(pdf: fitz.Document, page_num: int) -> bytes:
+    """
+    Extract one page (1-based) of the PDF as a single page PDF in bytes.
+    """
+    pdf_page = fitz.Document()
+    pdf_page.insert_pdf(pdf, from_page=page_num - 1, to_page=page_num - 1)
+    content = pdf_page.tobytes()
+    pdf_page.close()
+    return content
+
+
+def _render_page_image(
+    pdf: fitz.Document,
+    page_num: int,
+    dpi: int,
+    image_setting: T.Optional[ImageSetting] = None,
+) -> bytes:
+    """
+    Render one page (1-based) of the PDF as image in bytes.
+    If ``image_setting`` is not given, it is RGB PNG.
+    """
+    if image_setting is None:
+        image_setting = ImageSetting()
+    page = pdf[page_num - 1]
+    pixmap = page.get_pixmap(
+        dpi=image_setting.get_dpi(page, dpi),
+        colorspace=fitz.csGRAY if image_setting.grayscale else fitz.csRGB,
+    )
+    return image_setting.encode(pixmap)
+
+
+# the cleaned PDF document opened in each render worker process,
+# see :func:`_init_render_worker`.
+_worker_pdf: T.Optional[fitz.Document] = None
+
+
+def _init_render_worker(
+    pdf_content_or_path: T.Union[bytes, str],
+):  # pragma: no cover
+    """
+    Process pool initializer, open the cleaned PDF once per worker process.
+    """
+    global _worker_pdf
+    if isinstance(pdf_content_or_path, bytes):
+        _worker_pdf = fitz.Document(stream=pdf_content_or_path)
+    else:
+        _worker_pdf = fitz.Document(pdf_content_or_path)
+
+
+def _render_page_range(
+    from_page_num: int,
+    to_page_num: int,
+    dpi: int,
+    image_setting: T.Optional[ImageSetting] = None,
+) -> T.List[bytes]:  # pragma: no cover
+    """
+    Render pages from ``from_page_num`` to ``to_page_num`` (both 1-based, inclusive)
+    in a worker process.
+    """
+    return [
+        _render_page_image(_worker_pdf, page_num, dpi, image_setting)
+        for page_num in range(from_page_num, to_page_num + 1)
+    ]
+
+
+def _iter_page_image_in_process_pool(
+    pdf_content_or_path: T.Union[bytes, str],
+    page_count: int,
+    dpi: int,
+    max_workers: int,
+    batch_size: int,
+    image_setting: T.Optional[ImageSetting] = None,
+) -> T.Iterable[bytes]:
+    """
+    Render all pages with a process pool, yield PNG images in page order.
+    At most ``max_workers * 2`` batches are in flight to bound the memory.
+    """
+    page_ranges = (
+        (from_page_num, min(from_page_num + batch_size - 1, page_count))
+        for from_page_num in range(1, page_count + 1, batch_size)
+    )
+    with concurrent.futures.ProcessPoolExecutor(
+        max_workers=max_workers,
+        initializer=_init_render_worker,
+        initargs=(pdf_content_or_path,),
+    ) as executor:
+        futures = [
+            executor.submit(
+                _render_page_range, from_page_num, to_page_num, dpi, image_setting
+            )
+            for from_page_num, to_page_num in itertools.islice(
+                page_ranges, max_workers * 2
+            )
+        ]
+        while futures:
+            future = futures.pop(0)
+            for from_page_num, to_page_num in itertools.islice(page_ranges, 1):
+                futures.append(
+                    executor.submit(
+                        _render_page_range,
+                        from_page_num,
+                        to_page_num,
+                        dpi,
+                        image_setting,
+                    )
+                )
+            yield from future.result()
+
+
+def iter_segment_pdf(
+    pdf_content: T.Optional[bytes] = None,
+    dpi: int = 200,
+    max_workers: int = 1,
+    batch_size: int = 4,
+    pdf_path: T.Optional[str] = None,
+    repair: T.Optional[bool] = True,
+    image_setting: T.Optional[ImageSetting] = None,
+    text_layer_setting: T.Optional[TextLayerSetting] = None,
+) -> T.Iterable[SegmentPdfPage]:
+    """
+    Segment PDF into pages, yield one page at a time.
+
+    Unlike :func:`segment_pdf`, only one page's ``fitz.Document`` and
+    ``fitz.Pixmap`` are alive at a time, they are converted into bytes and
+    released before the next page is processed. The peak memory doesn't grow
+    with the number of pages.
+
+    Rasterizing page into image is CPU bound. If ``max_workers`` is greater
+    than 1, the pages are rendered by a process pool. Each worker process opens
+    the cleaned PDF once and renders ``batch_size`` pages per task. The output
+    is byte-identical to the serial mode.
+
+    If the document is too large to fit in memory, use ``pdf_path`` instead of
+    ``pdf_content``. The cleaned PDF is written to ``${pdf_path}.cleaned.pdf``
+    and removed at the end, MuPDF only reads the pages it needs from disk.
+
+    Usage example::
+
+        >>> for page in iter_segment_pdf(pdf_content):
+        ...     print(page.page_num, len(page.pdf_content), len(page.image_content))
+
+    :param pdf_content: PDF content in bytes.
+    :param dpi: DPI of the image.
+    :param max_workers: number of processes to render the page images.
+        1 means render in the current process.
+    :param batch_size: number of pages to render per process pool task.
+    :param pdf_path: PDF file path on local file system, if given, the
+        ``pdf_content`` is ignored.
+    :param repair: see :func:`segment_pdf`.
+    :param image_setting: the page image encoding setting, see :class:`ImageSetting`.
+        If not given, the image is RGB PNG at the given DPI.
+    :param text_layer_setting: if given, detect the pages that have a usable
+        text layer in the current process, see :func:`extract_page_text_layer`
+        and :attr:`SegmentPdfPage.text_section`.
+    """
+    if pdf_path is None:
+        path_cleaned = None
+        cleaned, is_repaired = _clean_pdf(pdf_content, repair=repair)
+        pdf_cleaned = fitz.Document(stream=cleaned)
+    else:
+        path_cleaned = f"{pdf_path}.cleaned.pdf"
+        is_repaired = _clean_pdf_file(str(pdf_path), path_cleaned, repair=repair)
+        if is_repaired is False:
+            path_cleaned = None
+        cleaned = str(pdf_path) if path_cleaned is None else path_cleaned
+        pdf_cleaned = fitz.Document(cleaned)
+    page_count = pdf_cleaned.page_count
+    if max_workers > 1:
+        image_iterator = _iter_page_image_in_process_pool(
+            pdf_content_or_path=cleaned,
+            page_count=page_count,
+            dpi=dpi,
+            max_workers=max_workers,
+            batch_size=batch_size,
+            image_setting=image_setting,
+        )
+    else:
+        image_iterator = (
+            _render_page_image(pdf_cleaned, page_num, dpi, image_setting)
+            for page_num in range(1, page_count + 1)
+        )
+    try:
+        for page_num, image_content in enumerate(image_iterator, start=1):
+            if text_layer_setting is None:
+                text_section = None
+            else:
+                text_section = extract_page_text_layer(
+                    pdf_cleaned[page_num - 1],
+                    page_num,
+                    text_layer_setting,
+                )
+            yield SegmentPdfPage(
+                page_num=page_num,
+                pdf_content=_extract_page_pdf(pdf_cleaned, page_num),
+                image_content=image_content,
+                is_repaired=is_repaired,
+                text_section=text_section,
+            )
+    finally:
+        image_iterator.close()
+        pdf_cleaned.close()
+        if path_cleaned is not None:
+            os.remove(path_cleaned)
+
+
+def _iter_block_id(section_num: int) -> T.Iterator[str]:
+    """
+    Generate the deterministic UUID shaped block ids of a section. Only the
+    prefix is hashed, one ``uuid5`` per block is too slow for large tables.
+    """
+    prefix = str(uuid.uuid5(uuid.NAMESPACE_OID, str(section_num)))[:24]
+    for ith in itertools.count():
+        yield f"{prefix}{ith:012x}"
+
+
+def _to_geometry(left: float, top: float, width: float, height: float) -> dict:
+    """
+    Build the Textract ``Geometry`` from the bounding box in page ratio.
+    """
+    right, bottom = left + width, top + height
+    return {
+        "BoundingBox": {"Width": width, "Height": height, "Left": left, "Top": top},
+        "Polygon": [
+            {"X": left, "Y": top},
+            {"X": right, "Y": top},
+            {"X": right, "Y": bottom},
+            {"X": left, "Y": bottom},
+        ],
+    }
+
+
+def _lines_to_textract_response(
+    section_num: int,
+    lines: T.List[str],
+    bboxes: T.Optional[T.List[T.List[float]]] = None,
+) -> dict:
+    """
+    Build a Textract ``AnalyzeDocument`` like response with one ``PAGE``
+    block and one ``LINE`` block per line.
+
+    :param bboxes: the optional ``[left, top, width, height]`` of each line
+        in page ratio, it becomes the ``Geometry`` of the ``LINE`` block.
+    """
+    block_ids = _iter_block_id(section_num)
+    page_id = next(block_ids)
+    line_blocks = [
+        {
+            "BlockType": "LINE",
+            "Id": next(block_ids),
+            "Text": line,
+            "Confidence": 100.0,
+            "Page": 1,
+        }
+        for line in lines
+    ]
+    if bboxes is not None:
+        for block, bbox in zip(line_blocks, bboxes):
+            block["Geometry"] = _to_geometry(*bbox)
+    page_block = {
+        "BlockType": "PAGE",
+        "Id": page_id,
+        "Page": 1,
+        "Relationships": [
+            {
+                "Type": "CHILD",
+                "Ids": [block["Id"] for block in line_blocks],
+            }
+        ],
+    }
+    return {
+        "DocumentMetadata": {"Pages": 1},
+        "Blocks": [page_block, *line_blocks],
+    }
+
+
+@dataclasses.dataclass
+class TextSection(DataClass):
+    """
+    A section of a born-digital document, for example, a chapter of a Word
+    document or a slide of a PowerPoint deck. Its text is extracted directly,
+    no rendering and OCR is needed.
+
+    :param section_num: the 1-based section number.
+    :param title: the heading or slide title, None if there is no title.
+    :param lines: the text lines, including the title.
+    :param bboxes: the ``[left, top, width, height]`` of each line in page
+        ratio, only available for the PDF page text layer.
+    """
+
+    section_num: int = dataclasses.field()
+    title: T.Optional[str] = dataclasses.field(default=None)
+    lines: T.List[str] = dataclasses.field(default_factory=list)
+    bboxes: T.Optional[T.List[T.List[float]]] = dataclasses.field(default=None)
+
+    @property
+    def text(self) -> str:
+        return "\n".join(self.lines)
+
+    def to_textract_response(self) -> dict:
+        """
+        Convert to a Textract ``AnalyzeDocument`` like response with one
+        ``PAGE`` block and one ``LINE`` block per line, so the consumers of
+        the json view work the same way. There is no geometry, the block ids
+        are deterministic.
+        """
+        return _lines_to_textract_response(
+            self.section_num, self.lines, bboxes=self.bboxes
+        )
+
+
+def _iter_sections(
+    items: T.Iterable[T.Tuple[bool, str]],
+) -> T.Iterable[TextSection]:
+    """
+    Group ``(is_title, line)`` items into sections, a new section starts
+    at each title.
+    """
+    section = None
+    for is_title, line in items:
+        if is_title or (section is None):
+            if section is not None:
+                yield section
+            section_num = 1 if section is None else section.section_num + 1
+            section = TextSection(
+                section_num=section_num,
+                title=line if is_title else None,
+            )
+        section.lines.append(line)
+    if section is not None:
+        yield section
+
+
+def _get_heading_level(style_name: str) -> T.Optional[int]:
+    """
+    Get the heading level from the Word paragraph style name, the
+    ``Title`` style is level 0. Return None if it is not a heading.
+    """
+    if style_name == "Title":
+        return 0
+    if style_name.startswith("Heading "):
+        try:
+            return int(style_name[len("Heading ") :])
+        except ValueError:  # pragma: no cover
+            return None
+    return None
+
+
+def iter_segment_word(
+    word_content: bytes,
+    heading_level: int = 1,
+) -> T.Iterable[TextSection]:
+    """
+    Segment a Word (``.docx``) document into sections by the headings, yield
+    one section at a time. Table rows become tab separated lines, empty
+    paragraphs are skipped.
+
+    :param word_content: the Word document in bytes.
+    :param heading_level: a new section starts at the ``Title`` and the
+        headings with level less than or equal to this value.
+    """
+    import docx
+    from docx.table import Table
+
+    document = docx.Document(io.BytesIO(word_content))
+    # style lookup is slow in python-docx, cache it by style id
+    style_level_cache: T.Dict[T.Optional[str], T.Optional[int]] = dict()
+
+    def iter_items():
+        for block in document.iter_inner_content():
+            if isinstance(block, Table):
+                for row in block.rows:
+                    line = "\t".join(cell.text for cell in row.cells)
+                    if line.strip():
+                        yield False, line
+            else:
+                text = block.text
+                if not text.strip():
+                    continue
+                style_id = block._p.style
+                if style_id not in style_level_cache:
+                    style_level_cache[style_id] = _get_heading_level(block.style.name)
+                level = style_level_cache[style_id]
+                is_title = (level is not None) and (level <= heading_level)
+                yield is_title, text
+
+    yield from _iter_sections(iter_items())
+
+
 def segment_word(
     word_content: bytes,
-):  # pragma: no cover
-    raise NotImplementedError
+    heading_level: int = 1,
+) -> T.List[TextSection]:
+    """
+    The list version of :func:`iter_segment_word`.
+    """
+    return list(iter_segment_word(word_content, heading_level=heading_level))
+
+
+def _cell_to_str(value: T.Any) -> str:
+    """
+    Convert an Excel cell value to string, empty cell is an empty string.
+    """
+    if value is None:
+        return ""
+    if isinstance(value, (datetime.datetime, datetime.date, datetime.time)):
+        return value.isoformat()
+    return str(value)
+
+
+def _row_to_csv_line(row: T.List[str]) -> str:
+    buffer = io.StringIO()
+    csv.writer(buffer, lineterminator="").writerow(row)
+    return buffer.getvalue()
+
+
+def _rows_to_textract_response(section_num: int, rows: T.List[T.List[str]]) -> dict:
+    """
+    Build a Textract ``AnalyzeDocument`` like response with one ``PAGE``
+    block, one ``LINE`` block per row (in CSV), and one ``TABLE`` block with
+    the ``CELL`` and ``WORD`` blocks.
+    """
+    block_ids = _iter_block_id(section_num)
+    page_id = next(block_ids)
+    table_id = next(block_ids)
+    line_blocks = list()
+    cell_blocks = list()
+    word_blocks = list()
+    for row_index, row in enumerate(rows, start=1):
+        word_id_list = list()
+        for column_index, value in enumerate(row, start=1):
+            cell = {
+                "BlockType": "CELL",
+                "Id": next(block_ids),
+                "RowIndex": row_index,
+                "ColumnIndex": column_index,
+                "RowSpan": 1,
+                "ColumnSpan": 1,
+                "Confidence": 100.0,
+                "Page": 1,
+            }
+            if value:
+                word = {
+                    "BlockType": "WORD",
+                    "Id": next(block_ids),
+                    "Text": value,
+                    "Confidence": 100.0,
+                    "Page": 1,
+                }
+                word_blocks.append(word)
+                word_id_list.append(word["Id"])
+                cell["Relationships"] = [{"Type": "CHILD", "Ids": [word["Id"]]}]
+            cell_blocks.append(cell)
+        line = {
+            "BlockType": "LINE",
+            "Id": next(block_ids),
+            "Text": _row_to_csv_line(row),
+            "Confidence": 100.0,
+            "Page": 1,
+        }
+        if word_id_list:
+            line["Relationships"] = [{"Type": "CHILD", "Ids": word_id_list}]
+        line_blocks.append(line)
+    table_block = {
+        "BlockType": "TABLE",
+        "Id": table_id,
+        "Confidence": 100.0,
+        "Page": 1,
+        "Relationships": [
+            {"Type": "CHILD", "Ids": [block["Id"] for block in cell_blocks]}
+        ],
+    }
+    page_block = {
+        "BlockType": "PAGE",
+        "Id": page_id,
+        "Page": 1,
+        "Relationships": [
+            {
+                "Type": "CHILD",
+                "Ids": [block["Id"] for block in line_blocks]
+                + [table_block["Id"]],
+            }
+        ],
+    }
+    return {
+        "DocumentMetadata": {"Pages": 1},
+        "Blocks": [
+            page_block,
+            *line_blocks,
+            table_block,
+            *cell_blocks,
+            *word_blocks,
+        ],
+    }
+
+
+@dataclasses.dataclass
+class TableChunk(DataClass):
+    """
+    A fixed row count chunk of an Excel sheet.
+
+    :param section_num: the 1-based chunk number across all sheets.
+    :param sheet_name: the sheet name.
+    :param start_row: the 1-based row number in the sheet of the first data
+        row in this chunk.
+    :param rows: the cell values in string, the trailing empty cells of each
+        row are removed. If the sheet has a header, the header row is the
+        first row of every chunk.
+    """
+
+    section_num: int = dataclasses.field()
+    sheet_name: str = dataclasses.field()
+    start_row: int = dataclasses.field()
+    rows: T.List[T.List[str]] = dataclasses.field(default_factory=list)
+
+    @property
+    def text(self) -> str:
+        """
+        The chunk in CSV format.
+        """
+        return "\n".join(_row_to_csv_line(row) for row in self.rows)
+
+    def to_textract_response(self) -> dict:
+        """
+        Convert to a Textract ``AnalyzeDocument`` like response with one
+        ``PAGE`` block, one ``LINE`` block per row (in CSV), and one
+        ``TABLE`` block with the ``CELL`` and ``WORD`` blocks. There is no
+        geometry, the block ids are deterministic.
+        """
+        return _rows_to_textract_response(self.section_num, self.rows)
+
+
+def iter_segment_excel(
+    excel_content: T.Optional[bytes] = None,
+    rows_per_chunk: int = 1000,
+    header: bool = False,
+    excel_path: T.Optional[str] = None,
+) -> T.Iterable[TableChunk]:
+    """
+    Segment an Excel (``.xlsx``) workbook into fixed row count chunks per
+    sheet, yield one chunk at a time.
+
+    The workbook is opened in the openpyxl read-only mode, the rows are
+    streamed from the sheet XML instead of building the whole workbook in
+    memory, so only one chunk is in memory at a time. The formula cells
+    are the cached values saved by Excel. The empty rows are skipped.
+
+    If the workbook is too large to fit in memory, use ``excel_path``
+    instead of ``excel_content``.
+
+    Usage example::
+
+        >>> for chunk in iter_segment_excel(excel_content, rows_per_chunk=500):
+        ...     print(chunk.sheet_name, chunk.start_row, len(chunk.rows))
+
+    :param excel_content: the Excel workbook in bytes.
+    :param rows_per_chunk: the max number of data rows per chunk, excluding
+        the header row.
+    :param header: if True, the first non-empty row of each sheet is the
+        header, it is repeated at the beginning of every chunk of the sheet.
+    :param excel_path: Excel file path on local file system, if given, the
+        ``excel_content`` is ignored.
+    """
+    import openpyxl
+
+    if excel_path is None:
+        source = io.BytesIO(excel_content)
+    else:
+        source = excel_path
+    workbook = openpyxl.load_workbook(source, read_only=True, data_only=True)
+    section_num = 0
+    try:
+        for worksheet in workbook.worksheets:
+            header_row = None
+            rows = list()
+            start_row = None
+            for row_num, values in enumerate(
+                worksheet.iter_rows(values_only=True), start=1
+            ):
+                row = [_cell_to_str(value) for value in values]
+                while row and (row[-1] == ""):
+                    row.pop()
+                if not row:
+                    continue
+                if header and (header_row is None):
+                    header_row = row
+                    continue
+                if start_row is None:
+                    start_row = row_num
+                rows.append(row)
+                if len(rows) >= rows_per_chunk:
+                    section_num += 1
+                    yield TableChunk(
+                        section_num=section_num,
+                        sheet_name=worksheet.title,
+                        start_row=start_row,
+                        rows=rows if header_row is None else [header_row, *rows],
+                    )
+                    rows = list()
+                    start_row = None
+            if rows:
+                section_num += 1
+                yield TableChunk(
+                    section_num=section_num,
+                    sheet_name=worksheet.title,
+                    start_row=start_row,
+                    rows=rows if header_row is None else [header_row, *rows],
+                )
+    finally:
+        workbook.close()
 
 
 def segment_excel(
     excel_content: bytes,
-):  # pragma: no cover
-    raise NotImplementedError
+    rows_per_chunk: int = 1000,
+    header: bool = False,
+) -> T.List[TableChunk]:
+    """
+    The list version of :func:`iter_segment_excel`.
+    """
+    return list(
+        iter_segment_excel(
+            excel_content,
+            rows_per_chunk=rows_per_chunk,
+            header=header,
+        )
+    )
+
+
+def _iter_shape_lines(shapes) -> T.Iterable[str]:
+    """
+    Extract text lines from PowerPoint shapes, including the grouped shapes
+    and the tables.
+    """
+    from pptx.enum.shapes import MSO_SHAPE_TYPE
+
+    for shape in shapes:
+        if shape.shape_type == MSO_SHAPE_TYPE.GROUP:
+            yield from _iter_shape_lines(shape.shapes)
+        elif shape.has_text_frame:
+            for paragraph in shape.text_frame.paragraphs:
+                text = "".join(run.text for run in paragraph.runs)
+                if text.strip():
+                    yield text
+        elif getattr(shape, "has_table", False) and shape.has_table:
+            for row in shape.table.rows:
+                line = "\t".join(cell.text for cell in row.cells)
+                if line.strip():
+                    yield line
+
+
+def iter_segment_ppt(
+    ppt_content: bytes,
+    include_notes: bool = False,
+) -> T.Iterable[TextSection]:
+    """
+    Segment a PowerPoint (``.pptx``) deck into one section per slide, yield
+    one slide at a time. The title placeholder is the section title.
+
+    :param ppt_content: the PowerPoint deck in bytes.
+    :param include_notes: also include the speaker notes of the slide.
+    """
+    import pptx
+
+    presentation = pptx.Presentation(io.BytesIO(ppt_content))
+    for section_num, slide in enumerate(presentation.slides, start=1):
+        title_shape = slide.shapes.title
+        title = None
+        if title_shape is not None and title_shape.text.strip():
+            title = title_shape.text
+        lines = list(_iter_shape_lines(slide.shapes))
+        if include_notes and slide.has_notes_slide:
+            notes = slide.notes_slide.notes_text_frame.text
+            lines.extend(line for line in notes.splitlines() if line.strip())
+        yield TextSection(section_num=section_num, title=title, lines=lines)
 
 
 def segment_ppt(
     ppt_content: bytes,
-):  # pragma: no cover
-    raise NotImplementedError
+    include_notes: bool = False,
+) -> T.List[TextSection]:
+    """
+    The list version of :func:`iter_segment_ppt`.
+    """
+    return list(iter_segment_ppt(ppt_content, include_notes=include_notes))
+
+
+def iter_segment_text(
+    text_content: bytes,
+    max_chars: int = 100000,
+    encoding: str = "utf-8",
+) -> T.Iterable[TextSection]:
+    """
+    Segment a plain text document into sections. A form feed (``\\f``)
+    starts a new section, and a section is split at the line boundary when
+    it exceeds ``max_chars``.
+
+    :param text_content: the text document in bytes.
+    :param max_chars: the max number of characters per section, a single
+        line longer than this value is not split.
+    :param encoding: the text encoding, undecodable bytes are replaced.
+    """
+    text = text_content.decode(encoding, errors="replace")
+    section_num = 0
+    for page in text.split("\f"):
+        lines = list()
+        n_chars = 0
+        for line in page.splitlines():
+            if lines and (n_chars + len(line) > max_chars):
+                section_num += 1
+                yield TextSection(section_num=section_num, lines=lines)
+                lines = list()
+                n_chars = 0
+            lines.append(line)
+            n_chars += len(line) + 1
+        if lines:
+            section_num += 1
+            yield TextSection(section_num=section_num, lines=lines)
+
+
+def _find_record_boundary(
+    buffer: bytes,
+    limit: int,
+    quotechar: T.Optional[bytes] = None,
+) -> T.Optional[int]:
+    """
+    Find the end (exclusive) of the last complete record before ``limit``,
+    or if there is none, the first complete record after ``limit``. A
+    newline inside a quoted field is not a record boundary, it is detected
+    by the quote parity, the escaped quote ``""`` doesn't change the parity.
+
+    :return: None if there is no complete record in the buffer.
+    """
+    pos = buffer.rfind(b"\n", 0, limit)
+    if pos != -1:
+        if quotechar is None:
+            return pos + 1
+        n_quote = buffer.count(quotechar, 0, pos)
+        while pos != -1:
+            if n_quote % 2 == 0:
+                return pos + 1
+            prev_pos = buffer.rfind(b"\n", 0, pos)
+            n_quote -= buffer.count(quotechar, prev_pos + 1, pos)
+            pos = prev_pos
+    pos = buffer.find(b"\n", limit)
+    if pos != -1 and quotechar is not None:
+        n_quote = buffer.count(quotechar, 0, pos)
+        while pos != -1 and n_quote % 2 == 1:
+            next_pos = buffer.find(b"\n", pos + 1)
+            n_quote += buffer.count(quotechar, pos, next_pos)
+            pos = next_pos
+    return None if pos == -1 else pos + 1
+
+
+def iter_line_chunks(
+    stream: T.BinaryIO,
+    max_bytes: int = 8 * 1024 * 1024,
+    read_size: int = 1024 * 1024,
+    quotechar: T.Optional[bytes] = None,
+) -> T.Iterable[bytes]:
+    """
+    Split a binary stream into line aligned chunks, each chunk is at most
+    ``max_bytes``, unless a single record is larger than it. It reads
+    ``read_size`` bytes at a time, so at most about ``max_bytes + read_size``
+    bytes are in memory no matter how large the stream is.
+
+    :param stream: a binary file-like object with ``read``, for example,
+        the ``Body`` of the S3 ``get_object`` response or a local file.
+    :param max_bytes: the max size of a chunk.
+    :param read_size: the number of bytes per ``read`` call.
+    :param quotechar: if given, a newline in a quoted field is not a chunk
+        boundary, for example, ``b'"'`` for CSV.
+    """
+    buffer = bytearray()
+    eof = False
+    while True:
+        while (eof is False) and (len(buffer) < max_bytes):
+            data = stream.read(read_size)
+            if data:
+                buffer.extend(data)
+            else:
+                eof = True
+        if len(buffer) == 0:
+            return
+        if eof and (len(buffer) <= max_bytes):
+            yield bytes(buffer)
+            return
+        cut = _find_record_boundary(buffer, max_bytes, quotechar)
+        # a single record is larger than max_bytes, read until it ends
+        while (cut is None) and (eof is False):
+            data = stream.read(read_size)
+            if data:
+                buffer.extend(data)
+                cut = _find_record_boundary(buffer, max_bytes, quotechar)
+            else:
+                eof = True
+        if cut is None:
+            yield bytes(buffer)
+            return
+        yield bytes(buffer[:cut])
+        del buffer[:cut]
+
+
+@dataclasses.dataclass
+class DataChunk(DataClass):
+    """
+    A line aligned chunk of a delimited (CSV, TSV) or JSON Lines document.
+
+    :param section_num: the 1-based chunk number.
+    :param content: the chunk in bytes. If the document has a header, the
+        header line is the first line of every chunk.
+    :param start_line: the 1-based line number in the document of the
+        first data line in this chunk.
+    :param delimiter: the field delimiter, None for JSON Lines and other
+        line based text.
+    :param encoding: the text encoding, undecodable bytes are replaced.
+    """
+
+    section_num: int = dataclasses.field()
+    content: bytes = dataclasses.field()
+    start_line: int = dataclasses.field()
+    delimiter: T.Optional[str] = dataclasses.field(default=None)
+    encoding: str = dataclasses.field(default="utf-8")
+
+    @property
+    def text(self) -> str:
+        return self.content.decode(self.encoding, errors="replace")
+
+    def to_textract_response(self) -> dict:
+        """
+        Convert to a Textract ``AnalyzeDocument`` like response with one
+        ``LINE`` block per line, like :class:`TextSection`. Unlike
+        :class:`TableChunk`, there is no ``TABLE`` block, the cell level
+        blocks are an order of magnitude slower to build and encode than
+        reading the data, and the chunk can be parsed from the text view.
+        """
+        lines = self.text.split("\n")
+        if lines[-1] == "":
+            lines.pop()
+        return _lines_to_textract_response(
+            self.section_num,
+            [line[:-1] if line.endswith("\r") else line for line in lines],
+        )
+
+
+_bom = b"\xef\xbb\xbf"
+
+
+def iter_segment_data(
+    stream: T.BinaryIO,
+    delimiter: T.Optional[str] = None,
+    max_bytes: int = 8 * 1024 * 1024,
+    header: bool = False,
+    encoding: str = "utf-8",
+    read_size: int = 1024 * 1024,
+    quotechar: T.Optional[str] = '"',
+) -> T.Iterable[DataChunk]:
+    """
+    Segment a delimited (CSV, TSV) or JSON Lines document into line aligned,
+    size bounded chunks, yield one chunk at a time. The document is read
+    from the stream, it is never loaded as a whole. See
+    :func:`iter_line_chunks`.
+
+    Usage example::
+
+        >>> body = s3_client.get_object(Bucket=bucket, Key=key)["Body"]
+        >>> for chunk in iter_segment_data(body, delimiter=","):
+        ...     print(chunk.section_num, chunk.start_line, len(chunk.content))
+
+    :param stream: a binary file-like object with ``read``.
+    :param delimiter: the field delimiter, for example, ``","`` for CSV and
+        ``"\\t"`` for TSV. Use None for JSON Lines, it is split at the line
+        boundary.
+    :param max_bytes: the max size of a chunk read from the stream, the
+        repeated header is not counted.
+    :param header: if True, the first record is the header, it is repeated
+        at the beginning of every chunk.
+    :param encoding: the text encoding.
+    :param read_size: the number of bytes per ``read`` call.
+    :param quotechar: the quote character of the delimited document, a
+        quoted field may have newlines. Use None if the fields are not
+        quoted, for example, most TSV documents, so a stray quote doesn't
+        hide the record boundaries. It is ignored for JSON Lines.
+    """
+    if (delimiter is None) or (quotechar is None):
+        quotechar = None
+    else:
+        quotechar = quotechar.encode(encoding)
+    header_content = b""
+    line_num = 1
+    section_num = 0
+    for ith, content in enumerate(
+        iter_line_chunks(
+            stream,
+            max_bytes=max_bytes,
+            read_size=read_size,
+            quotechar=quotechar,
+        )
+    ):
+        start_line = line_num
+        line_num += content.count(b"\n")
+        if ith == 0:
+            if content.startswith(_bom):
+                content = content[len(_bom) :]
+            if header:
+                cut = _find_record_boundary(content, 0, quotechar)
+                if cut is None:
+                    cut = len(content)
+                header_content = content[:cut]
+                content = content[cut:]
+                start_line += header_content.count(b"\n")
+                if not content:
+                    continue
+        section_num += 1
+        yield DataChunk(
+            section_num=section_num,
+            content=header_content + content,
+            start_line=start_line,
+            delimiter=delimiter,
+            encoding=encoding,
+        )
+
+
+class _PrefixedStream:
+    """
+    A binary stream that reads the already consumed ``prefix`` first, then
+    the rest of the ``stream``.
+    """
+
+    def __init__(self, prefix: bytes, stream: T.BinaryIO):
+        self.prefix = prefix
+        self.stream = stream
+
+    def read(self, size: int = -1) -> bytes:
+        if self.prefix:
+            if (size < 0) or (size >= len(self.prefix)):
+                data, self.prefix = self.prefix, b""
+                if size < 0:
+                    return data + self.stream.read()
+                return data
+            data, self.prefix = self.prefix[:size], self.prefix[size:]
+            return data
+        return self.stream.read(size)
+
+
+def _is_json_value(line: bytes, encoding: str) -> bool:
+    """
+    Whether the line is a complete JSON value.
+    """
+    try:
+        json.loads(line.decode(encoding))
+        return True
+    except ValueError:
+        return False
+
+
+def iter_segment_json(
+    stream: T.BinaryIO,
+    max_bytes: int = 8 * 1024 * 1024,
+    encoding: str = "utf-8",
+    read_size: int = 1024 * 1024,
+) -> T.Iterable[DataChunk]:
+    """
+    Segment a ``.json`` document. If the first non-empty line is a complete
+    JSON value, it is JSON Lines, and it is split like
+    :func:`iter_segment_data`. Otherwise, it is a regular (for example,
+    pretty-printed) JSON document, a chunk of it is not valid JSON, so the
+    whole document is yielded as a single chunk.
+
+    :param stream: a binary file-like object with ``read``.
+    :param max_bytes: the max size of a JSON Lines chunk.
+    :param encoding: the text encoding.
+    :param read_size: the number of bytes per ``read`` call.
+    """
+    # read until the end of the first non-empty line
+    prefix = bytearray()
+    start = 0
+    first_line = b""
+    while True:
+        cut = prefix.find(b"\n", start)
+        if cut == -1:
+            data = stream.read(read_size)
+            if data:
+                prefix.extend(data)
+                continue
+            cut = len(prefix)
+        first_line = bytes(prefix[start:cut]).strip()
+        if first_line.startswith(_bom):
+            first_line = first_line[len(_bom) :].strip()
+        if first_line or (cut >= len(prefix)):
+            break
+        start = cut + 1
+
+    stream = _PrefixedStream(bytes(prefix), stream)
+    if first_line and _is_json_value(first_line, encoding):
+        yield from iter_segment_data(
+            stream,
+            delimiter=None,
+            max_bytes=max_bytes,
+            encoding=encoding,
+            read_size=read_size,
+        )
+    else:
+        content = stream.read()
+        if content.startswith(_bom):
+            content = content[len(_bom) :]
+        if content:
+            yield DataChunk(
+                section_num=1,
+                content=content,
+                start_line=1,
+                encoding=encoding,
+            )
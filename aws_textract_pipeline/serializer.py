@@ -0,0 +1,212 @@
+# -*- coding: utf-8 -*-
+
+"""
+Serialize the Textract response for the json view (``070-json``).
+
+See:
+
+- :class:`JsonFormatEnum`
+- :class:`JsonEngineEnum`
+- :class:`CompressionEnum`
+- :class:`JsonSetting`
+"""
+
+import typing as T
+import io
+import json
+import gzip
+import dataclasses
+
+from .vendor.better_enum import BetterStrEnum
+from .vendor.better_dataclasses import DataClass
+
+from .doc_type import S3ContentTypeEnum
+
+
+class JsonFormatEnum(BetterStrEnum):
+    """
+    The object format of the json view.
+
+    - json: the Textract response as one JSON object.
+    - jsonl: JSON Lines, one Textract block per line, for analytics engine
+        like Athena, Spark and pandas. Only the ``Blocks`` are stored.
+    - parquet: one Textract block per row. Only the ``Blocks`` are stored.
+        It requires ``pyarrow``.
+    """
+
+    json = "json"
+    jsonl = "jsonl"
+    parquet = "parquet"
+
+
+json_format_to_content_type_mapper = {
+    JsonFormatEnum.json.value: S3ContentTypeEnum.json.value,
+    JsonFormatEnum.jsonl.value: S3ContentTypeEnum.json_lines.value,
+    JsonFormatEnum.parquet.value: S3ContentTypeEnum.parquet.value,
+}
+
+
+class JsonEngineEnum(BetterStrEnum):
+    """
+    The JSON encoder. ``json`` is the default, ``orjson`` is opt-in.
+
+    - auto: use ``orjson`` if it is installed, otherwise use ``json``.
+    - json: the standard library, the output is byte-stable across
+        environments.
+    - orjson: the `orjson <https://github.com/ijl/orjson>`_ library.
+    """
+
+    auto = "auto"
+    json = "json"
+    orjson = "orjson"
+
+
+class CompressionEnum(BetterStrEnum):
+    """
+    The compression of the json view. For json and jsonl, the object is
+    compressed and the S3 ``Content-Encoding`` is set. For parquet, it is
+    the parquet internal compression codec.
+
+    zstd requires ``zstandard``.
+    """
+
+    gzip = "gzip"
+    zstd = "zstd"
+
+
+def _has_orjson() -> bool:
+    try:
+        import orjson
+
+        return True
+    except ImportError:  # pragma: no cover
+        return False
+
+
+@dataclasses.dataclass
+class JsonSetting(DataClass):
+    """
+    Json view serialization setting.
+
+    :param format: the object format, one of :class:`JsonFormatEnum`.
+    :param engine: the JSON encoder, one of :class:`JsonEngineEnum`,
+        default is the standard library ``json``.
+    :param compression: None, or one of :class:`CompressionEnum`.
+    :param compression_level: the compression level, None means the
+        default level of the compression algorithm.
+    """
+
+    format: str = dataclasses.field(default=JsonFormatEnum.json.value)
+    engine: str = dataclasses.field(default=JsonEngineEnum.json.value)
+    compression: T.Optional[str] = dataclasses.field(default=None)
+    compression_level: T.Optional[int] = dataclasses.field(default=None)
+
+    def __post_init__(self):
+        JsonFormatEnum.ensure_is_valid_value(self.format)
+        JsonEngineEnum.ensure_is_valid_value(self.engine)
+        if self.compression is not None:
+            CompressionEnum.ensure_is_valid_value(self.compression)
+
+    @property
+    def content_type(self) -> str:
+        """
+        The S3 content type of the encoded object.
+        """
+        return json_format_to_content_type_mapper[self.format]
+
+    @property
+    def content_encoding(self) -> T.Optional[str]:
+        """
+        The S3 content encoding of the encoded object, None if not compressed.
+        """
+        if self.format == JsonFormatEnum.parquet.value:
+            return None
+        return self.compression
+
+    @property
+    def is_orjson(self) -> bool:
+        if self.engine == JsonEngineEnum.auto.value:
+            return _has_orjson()
+        return self.engine == JsonEngineEnum.orjson.value
+
+    def _dumps(self, obj) -> bytes:
+        if self.is_orjson:
+            import orjson
+
+            return orjson.dumps(obj)
+        else:
+            return json.dumps(obj).encode("utf-8")
+
+    def _loads(self, b: bytes):
+        if self.is_orjson:
+            import orjson
+
+            return orjson.loads(b)
+        else:
+            return json.loads(b)
+
+    def _compress(self, b: bytes) -> bytes:
+        if self.compression == CompressionEnum.gzip.value:
+            level = 6 if self.compression_level is None else self.compression_level
+            return gzip.compress(b, compresslevel=level, mtime=0)
+        elif self.compression == CompressionEnum.zstd.value:
+            import zstandard
+
+            level = 3 if self.compression_level is None else self.compression_level
+            return zstandard.ZstdCompressor(level=level).compress(b)
+        else:
+            return b
+
+    def _decompress(self, b: bytes) -> bytes:
+        if self.compression == CompressionEnum.gzip.value:
+            return gzip.decompress(b)
+        elif self.compression == CompressionEnum.zstd.value:
+            import zstandard
+
+            return zstandard.ZstdDecompressor().decompress(b)
+        else:
+            return b
+
+    def encode(self, res: dict) -> bytes:
+        """
+        Encode the Textract response.
+        """
+        if self.format == JsonFormatEnum.json.value:
+            return self._compress(self._dumps(res))
+        elif self.format == JsonFormatEnum.jsonl.value:
+            lines = [self._dumps(block) for block in res.get("Blocks", [])]
+            lines.append(b"")
+            return self._compress(b"\n".join(lines))
+        else:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+
+            table = pa.Table.from_pylist(res.get("Blocks", []))
+            buffer = io.BytesIO()
+            pq.write_table(
+                table,
+                buffer,
+                compression=self.compression or "none",
+                compression_level=self.compression_level,
+            )
+            return buffer.getvalue()
+
+    def decode(self, b: bytes) -> dict:
+        """
+        Decode the object created by :meth:`encode`. For jsonl and parquet,
+        it returns ``{"Blocks": [...]}``.
+        """
+        if self.format == JsonFormatEnum.json.value:
+            return self._loads(self._decompress(b))
+        elif self.format == JsonFormatEnum.jsonl.value:
+            return {
+                "Blocks": [
+                    self._loads(line)
+                    for line in self._decompress(b).splitlines()
+                    if line
+                ]
+            }
+        else:
+            import pyarrow.parquet as pq
+
+            return {"Blocks": pq.read_table(io.BytesIO(b)).to_pylist()}
@@ -0,0 +1,125 @@
+# -*- coding: utf-8 -*-
+
+"""
+Client side rate limiting and retry utilities for AWS API calls.
+
+See:
+
+- :class:`TokenBucket`
+- :func:`is_throttling_error`
+- :func:`call_with_backoff`
+"""
+
+import typing as T
+import time
+import random
+import threading
+
+from botocore.exceptions import ClientError
+
+
+class TokenBucket:
+    """
+    A thread-safe token bucket rate limiter. Tokens are refilled at ``rate``
+    per second, up to ``capacity``. Each :meth:`acquire` call takes one token,
+    and blocks until one is available.
+
+    Usage example::
+
+        >>> bucket = TokenBucket(rate=2) # at most 2 calls per second
+        >>> for _ in range(10):
+        ...     bucket.acquire()
+        ...     textract_client.start_document_analysis(...)
+
+    :param rate: number of tokens refilled per second, i.e. the TPS limit.
+    :param capacity: the max number of tokens in the bucket, it controls how
+        many calls can burst at once. Default is ``max(rate, 1)``.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        capacity: T.Optional[float] = None,
+        clock: T.Callable[[], float] = time.monotonic,
+        sleep: T.Callable[[float], None] = time.sleep,
+    ):
+        if rate <= 0:
+            raise ValueError("rate has to be greater than 0")
+        self.rate = rate
+        self.capacity = max(rate, 1) if capacity is None else capacity
+        self._clock = clock
+        self._sleep = sleep
+        self._tokens = self.capacity
+        self._last = clock()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = self._clock()
+        self._tokens = min(
+            self.capacity,
+            self._tokens + (now - self._last) * self.rate,
+        )
+        self._last = now
+
+    def acquire(self, tokens: float = 1):
+        """
+        Take tokens from the bucket, block until they are available.
+        """
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return
+                wait = (tokens - self._tokens) / self.rate
+            self._sleep(wait)
+
+
+THROTTLING_ERROR_CODES = {
+    "ProvisionedThroughputExceededException",
+    "ThrottlingException",
+}
+"""
+The error code of the ``botocore.exceptions.ClientError`` that worth a retry.
+"""
+
+
+def is_throttling_error(e: Exception) -> bool:
+    """
+    Check if the exception is an AWS API throttling error.
+    """
+    return (
+        isinstance(e, ClientError)
+        and e.response.get("Error", {}).get("Code") in THROTTLING_ERROR_CODES
+    )
+
+
+def call_with_backoff(
+    func: T.Callable,
+    *args,
+    max_attempts: int = 5,
+    base_delay: float = 1.0,
+    max_delay: float = 30.0,
+    is_retryable: T.Callable[[Exception], bool] = is_throttling_error,
+    sleep: T.Callable[[float], None] = time.sleep,
+    **kwargs,
+):
+    """
+    Call the function, retry with jittered exponential backoff
+    (the "full jitter" strategy) if it raises a retryable error.
+
+    :param func: the function to call.
+    :param args: positional arguments of the function.
+    :param max_attempts: total number of attempts, including the first call.
+    :param base_delay: the backoff base in seconds.
+    :param max_delay: the max backoff in seconds.
+    :param is_retryable: a function to decide if the error is retryable.
+    :param kwargs: keyword arguments of the function.
+    """
+    for attempt in range(max_attempts):
+        try:
+            return func(*args, **kwargs)
+        except Exception as e:
+            if (attempt + 1) >= max_attempts or (is_retryable(e) is False):
+                raise e
+            sleep(random.uniform(0, min(max_delay, base_delay * (2**attempt))))
@@ -4,16 +4,26 @@
 See:
 
 - :class:`ComponentToTextractOutputResult`
+- :class:`TextAndJsonSummary`
 - :class:`Component`
 - :class:`Data`
 - :class:`Errors`
+- :class:`PartialFailureError`
+- :class:`ComponentUploadError`
+- :class:`TextractSubmitError`
+- :class:`TextAndJsonConvertError`
 - :class:`StatusEnum`
 - :class:`BaseStatusAndUpdateTimeIndex`
+- :class:`ComponentStatusEnum`
+- :class:`BaseComponentTracker`
 - :class:`BaseTracker`
 """
 
 import typing as T
+import gzip
 import dataclasses
+import concurrent.futures
+from datetime import datetime, timezone
 
 from pathlib_mate import Path, T_PATH_ARG
 import pynamodb_mate as pm
@@ -22,12 +32,37 @@ from boto_session_manager import BotoSesManager
 
 import aws_textract.api as aws_textract
 from .vendor.better_enum import BetterStrEnum
-from .vendor.better_dataclasses import DataClass
+from .vendor.better_dataclasses import DataClass, add_slots
 
 from .logger import logger
 from .doc_type import DocTypeEnum, S3ContentTypeEnum
-from .landing import MetadataKeyEnum, LandingDocument, get_doc_md5
-from .segment import segment_pdf
+from .landing import (
+    MB,
+    MetadataKeyEnum,
+    LandingDocument,
+    DEFAULT_MULTIPART_THRESHOLD,
+    DEFAULT_PART_SIZE,
+    copy_s3_object,
+    get_doc_md5,
+)
+from .segment import (
+    ImageSetting,
+    TextLayerSetting,
+    TextSection,
+    TableChunk,
+    DataChunk,
+    iter_segment_pdf,
+    iter_segment_word,
+    iter_segment_excel,
+    iter_segment_ppt,
+    iter_segment_text,
+    iter_segment_data,
+    iter_segment_json,
+)
+from .serializer import JsonFormatEnum, CompressionEnum, JsonSetting
+from .throttle import TokenBucket, call_with_backoff
+from .analyze import SyncAnalyzeSetting, analyze_document
+from .waiter import JobTiming, wait_document_analysis_jobs_to_succeed
 from .workspace import Workspace
 
 
@@ -35,6 +70,51 @@ dir_tmp = Path(Path("/").resolve().anchor) / "tmp"
 
 _root_ = "_root_"
 
+_text_native_doc_types = {
+    DocTypeEnum.text.value,
+    DocTypeEnum.word.value,
+    DocTypeEnum.excel.value,
+    DocTypeEnum.ppt.value,
+    DocTypeEnum.json.value,
+    DocTypeEnum.csv.value,
+    DocTypeEnum.tsv.value,
+}
+"""
+The document types that have the text embedded, they are converted to the
+text and json view in :meth:`BaseTracker.raw_to_component` directly, without
+calling Textract.
+"""
+
+_office_doc_types = {
+    DocTypeEnum.word.value,
+    DocTypeEnum.excel.value,
+    DocTypeEnum.ppt.value,
+}
+"""
+The text native document types that are zip archives, the gzip compressed
+landing files of these types are rejected.
+"""
+
+_data_doc_type_to_delimiter_mapper = {
+    DocTypeEnum.json.value: None,
+    DocTypeEnum.csv.value: ",",
+    DocTypeEnum.tsv.value: "\t",
+}
+"""
+The delimiter of the line based data document types, None for JSON, it
+is split only if it is JSON Lines, see
+:func:`aws_textract_pipeline.segment.iter_segment_json`.
+"""
+
+_data_doc_type_to_quotechar_mapper = {
+    DocTypeEnum.csv.value: '"',
+    DocTypeEnum.tsv.value: None,
+}
+"""
+The quote character of the delimited document types. The TSV fields are
+normally not quoted, a stray quote must not hide the record boundaries.
+"""
+
 
 import json
 
@@ -42,13 +122,70 @@ import json
 # ------------------------------------------------------------------------------
 # DynamoDB ORM Model
 # ------------------------------------------------------------------------------
+class ComponentStatusEnum(BetterStrEnum):
+    """
+    The status of a component in the component table.
+    """
+
+    created = "created"  # component and image are uploaded
+    submitted = "submitted"  # the Textract job is submitted
+    converted = "converted"  # the text and json view are created
+
+
+_component_status_rank = {
+    None: 0,
+    ComponentStatusEnum.created.value: 1,
+    ComponentStatusEnum.submitted.value: 2,
+    ComponentStatusEnum.converted.value: 3,
+}
+
+
+def _is_component_done(component: "Component", status: str) -> bool:
+    """
+    Whether the component already finished the step of the given status.
+    """
+    return _component_status_rank[component.status] >= _component_status_rank[status]
+
+
+@add_slots
 @dataclasses.dataclass
 class Component(DataClass):
     """
     Metadata for each component.
+
+    :param id: the component id.
+    :param status: the last step this component finished, one of
+        :class:`ComponentStatusEnum`, None if it is not created yet.
+    :param error: the error of the last failed attempt on this component.
     """
 
     id: str = dataclasses.field()
+    status: T.Optional[str] = dataclasses.field(default=None)
+    error: T.Optional[str] = dataclasses.field(default=None)
+
+
+@dataclasses.dataclass
+class ComponentProgress(DataClass):
+    """
+    The component level progress of the current step.
+
+    :param step: the current step, one of :class:`StepEnum`.
+    :param n_total: number of known components.
+    :param n_done: number of components finished the current step.
+    :param n_failed: number of components failed in the last attempt.
+    """
+
+    step: str = dataclasses.field()
+    n_total: int = dataclasses.field(default=0)
+    n_done: int = dataclasses.field(default=0)
+    n_failed: int = dataclasses.field(default=0)
+
+    @property
+    def n_pending(self) -> int:
+        """
+        Number of components not done and not failed.
+        """
+        return self.n_total - self.n_done - self.n_failed
 
 
 @dataclasses.dataclass
@@ -64,12 +201,34 @@ class ComponentToTextractOutputResult(DataClass):
         we split and make multiple API calls.
     :param job_id: the textract job id, only available if we only made one API call.
     :param job_id_list: the textract job id for each component, only available if we
-        made multiple API calls.
+        made multiple API calls. The item is None if the job of that component
+        is not submitted yet, or the component is a born-digital PDF page that
+        is converted without Textract.
     """
 
     is_single_textract_api_call: bool = dataclasses.field()
     job_id: T.Optional[str] = dataclasses.field()
-    job_id_list: T.Optional[T.List[str]] = dataclasses.field()
+    job_id_list: T.Optional[T.List[T.Optional[str]]] = dataclasses.field()
+
+    @property
+    def is_all_submitted(self) -> bool:
+        """
+        Whether all Textract jobs are submitted.
+        """
+        if self.is_single_textract_api_call:
+            return self.job_id is not None
+        else:
+            return all(job_id is not None for job_id in self.job_id_list)
+
+    @property
+    def all_job_id_list(self) -> T.List[str]:
+        """
+        All the Textract job ids of this document.
+        """
+        if self.is_single_textract_api_call:
+            return [self.job_id]
+        else:
+            return [job_id for job_id in self.job_id_list if job_id is not None]
 
     def wait_document_analysis_job_to_succeed(
         self,
@@ -77,29 +236,36 @@ class ComponentToTextractOutputResult(DataClass):
         delays: int = 5,
         timeout: int = 60,
         verbose: bool = True,
-    ):  # pragma: no cover
+        max_delays: int = 30,
+        backoff: float = 1.5,
+        max_workers: int = 10,
+    ) -> T.List[JobTiming]:  # pragma: no cover
         """
-        Wait all Textract API call to succeed for this document.
+        Wait all Textract API call to succeed for this document. All jobs
+        are polled together on one shared schedule, so the total waiting time
+        is about the slowest job. It returns as soon as all jobs succeeded,
+        and raises :class:`~aws_textract_pipeline.waiter.TextractJobFailedError`
+        as soon as any job failed.
+
+        :param delays: the initial delay in seconds between two rounds.
+        :param timeout: the total timeout in seconds for all jobs.
+        :param max_delays: the max delay in seconds between two rounds.
+        :param backoff: the delay multiplier after each round.
+        :param max_workers: number of threads to poll the jobs.
+
+        :return: the :class:`~aws_textract_pipeline.waiter.JobTiming` for
+            each job.
         """
-        if self.is_single_textract_api_call:
-            aws_textract.better_boto.wait_document_analysis_job_to_succeed(
-                textract_client=bsm.textract_client,
-                job_id=self.job_id,
-                delays=delays,
-                timeout=timeout,
-                verbose=verbose,
-            )
-        else:
-            for job_id in self.job_id_list:
-                aws_textract.better_boto.wait_document_analysis_job_to_succeed(
-                    textract_client=bsm.textract_client,
-                    job_id=job_id,
-                    delays=delays,
-                    timeout=timeout,
-                    verbose=verbose,
-                )
-                if verbose:
-                    print("")
+        return wait_document_analysis_jobs_to_succeed(
+            textract_client=bsm.textract_client,
+            job_id_list=self.all_job_id_list,
+            delays=delays,
+            max_delays=max_delays,
+            backoff=backoff,
+            timeout=timeout,
+            max_workers=max_workers,
+            verbose=verbose,
+        )
 
 
 @dataclasses.dataclass
@@ -108,6 +274,29 @@ class TextractOutputToTextAndJsonResult(DataClass):
     json_list: T.List[dict] = dataclasses.field(default_factory=list)
 
 
+@dataclasses.dataclass
+class TextAndJsonSummary(DataClass):
+    """
+    The summary of a component that is converted to text and json view.
+    It doesn't hold the text and the Textract blocks.
+
+    :param comp_id: the component id.
+    :param text_uri: the S3 URI of the text view.
+    :param json_uri: the S3 URI of the json view.
+    :param n_pages: number of pages in the Textract output.
+    :param n_blocks: number of blocks in the Textract output.
+    :param n_chars: number of characters in the text view.
+    """
+
+    comp_id: str = dataclasses.field()
+    text_uri: str = dataclasses.field()
+    json_uri: str = dataclasses.field()
+    n_pages: int = dataclasses.field()
+    n_blocks: int = dataclasses.field()
+    n_chars: int = dataclasses.field()
+
+
+@add_slots
 @dataclasses.dataclass
 class Data(DataClass):
     """
@@ -118,8 +307,13 @@ class Data(DataClass):
         reversely. so we have to store this value and attach to s3 objects in
         sub-sequence logics.
     :param doc_type: the document type.
-    :param components:
+    :param components: the components of this document, it is empty if
+        the components are stored in the component table, see
+        :class:`BaseComponentTracker`.
     :param component_to_textract_output_result:
+    :param component_count: number of components, only used when the
+        components are stored in the component table.
+    :param progress: the component level progress of the current step.
     """
 
     # fmt: off
@@ -128,6 +322,8 @@ class Data(DataClass):
     features: T.List[str] = dataclasses.field(default_factory=list)
     components: T.List[Component] = Component.list_of_nested_field(default_factory=list)
     component_to_textract_output_result: T.Optional[ComponentToTextractOutputResult] = ComponentToTextractOutputResult.nested_field(default=None)
+    component_count: T.Optional[int] = dataclasses.field(default=None)
+    progress: T.Optional[ComponentProgress] = ComponentProgress.nested_field(default=None)
     # fmt: on
 
     @property
@@ -135,7 +331,10 @@ class Data(DataClass):
         """
         Number of components.
         """
-        return len(self.components)
+        if self.component_count is None:
+            return len(self.components)
+        else:
+            return self.component_count
 
 
 @dataclasses.dataclass
@@ -151,6 +350,205 @@ class Errors(DataClass):
     traceback: T.Optional[str] = dataclasses.field(default=None)
 
 
+class PartialFailureError(Exception):
+    """
+    Raised when some items of a batch operation failed. All the other items
+    are still processed.
+
+    :param errors: mapping from the failed item to the exception.
+    """
+
+    action = "processed"
+
+    def __init__(self, errors: T.Dict[str, Exception]):
+        self.errors = errors
+        lines = [f"{len(errors)} items failed to be {self.action}:"]
+        for key, e in errors.items():
+            lines.append(f"- {key}: {e!r}")
+        super().__init__("\n".join(lines))
+
+
+class ComponentUploadError(PartialFailureError):
+    """
+    Raised when some component objects failed to upload to S3. The key of
+    the ``errors`` is the S3 URI.
+    """
+
+    action = "uploaded"
+
+
+class TextractSubmitError(PartialFailureError):
+    """
+    Raised when some Textract jobs failed to submit. The key of the ``errors``
+    is the component id.
+    """
+
+    action = "submitted to Textract"
+
+
+class TextAndJsonConvertError(PartialFailureError):
+    """
+    Raised when some components failed to convert to text and json view.
+    The key of the ``errors`` is the component id.
+    """
+
+    action = "converted to text and json"
+
+
+class _IteratorClosedError(Exception):
+    """
+    Raised inside the ``start`` context manager when the streaming iterator
+    is closed early, so the step is marked as failed instead of staying in
+    progress and locked.
+    """
+
+
+def _write_component_to_s3(
+    s3_client,
+    s3path: S3Path,
+    content: T.Union[bytes, Path],
+    metadata: dict,
+    content_type: str,
+    remove_file: bool = False,
+    content_encoding: T.Optional[str] = None,
+):
+    """
+    Write bytes, or upload a local file, to S3.
+
+    :param remove_file: if ``content`` is a local file, remove it after upload.
+    :param content_encoding: the optional S3 content encoding, for example,
+        ``gzip``.
+    """
+    if isinstance(content, Path):
+        extra_args = dict(Metadata=metadata, ContentType=content_type)
+        if content_encoding is not None:
+            extra_args["ContentEncoding"] = content_encoding
+        s3path.upload_file(
+            content,
+            overwrite=True,
+            extra_args=extra_args,
+            bsm=s3_client,
+        )
+        if remove_file:
+            content.unlink()
+    else:
+        kwargs = dict(metadata=metadata, content_type=content_type)
+        if content_encoding is not None:
+            kwargs["content_encoding"] = content_encoding
+        s3path.write_bytes(content, bsm=s3_client, **kwargs)
+
+
+def _write_components_to_s3(
+    s3_client,
+    items: T.Iterable[tuple],
+    max_workers: int = 1,
+    remove_file: bool = False,
+    uploaded: T.Optional[T.Set[str]] = None,
+):
+    """
+    Upload ``(s3path, content, metadata, content_type)`` items, optionally
+    with a fifth ``content_encoding`` element, using a bounded thread pool.
+    At most ``max_workers * 2`` items are in flight, so the memory stays
+    flat when ``items`` is a generator. All items are attempted even if
+    some of them fail.
+
+    :param s3_client: the boto3 S3 client shared by all threads.
+    :param items: the objects to upload. The content could be bytes or a
+        local file.
+    :param max_workers: number of upload threads.
+    :param remove_file: remove the local file after it is uploaded.
+    :param uploaded: if given, the S3 URI of every uploaded object is added to
+        it, even if this function raises.
+
+    :raises ComponentUploadError: if any of the objects failed to upload.
+    """
+    futures: T.Dict[concurrent.futures.Future, str] = dict()
+    pending = set()
+    items_error = None
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+        try:
+            for s3path, content, metadata, content_type, *rest in items:
+                future = executor.submit(
+                    _write_component_to_s3,
+                    s3_client=s3_client,
+                    s3path=s3path,
+                    content=content,
+                    metadata=metadata,
+                    content_type=content_type,
+                    remove_file=remove_file,
+                    content_encoding=rest[0] if rest else None,
+                )
+                futures[future] = s3path.uri
+                pending.add(future)
+                while len(pending) >= max_workers * 2:
+                    _, pending = concurrent.futures.wait(
+                        pending,
+                        return_when=concurrent.futures.FIRST_COMPLETED,
+                    )
+        # the items generator failed, still wait the submitted uploads
+        except Exception as e:
+            items_error = e
+    errors = dict()
+    for future, uri in futures.items():
+        e = future.exception()
+        if e is not None:
+            errors[uri] = e
+        elif uploaded is not None:
+            uploaded.add(uri)
+    if items_error is not None:
+        raise items_error
+    if errors:
+        raise ComponentUploadError(errors)
+
+
+def _read_textract_output_from_s3(
+    s3_client,
+    s3dir_textract_output: S3Path,
+    job_id: str,
+    max_workers: int = 1,
+) -> dict:
+    """
+    Read the document analysis result that Textract async API already wrote
+    to the ``OutputConfig`` S3 prefix, and merge the JSON parts locally.
+    It doesn't call the ``GetDocumentAnalysis`` API, so it doesn't count
+    against the Textract TPS quota, and it still works after the job id
+    expires (7 days).
+
+    The parts are at ``${s3dir_textract_output}/${job_id}/1``, ``2``, ...
+
+    :param s3_client: the boto3 S3 client.
+    :param s3dir_textract_output: the ``OutputConfig`` S3 prefix of the job.
+    :param job_id: the Textract job id.
+    :param max_workers: number of threads to download the parts.
+    """
+    s3dir = aws_textract.res.get_textract_output_s3dir(
+        s3bucket=s3dir_textract_output.bucket,
+        s3prefix=s3dir_textract_output.key,
+        job_id=job_id,
+    )
+    s3path_list = [
+        s3path
+        for s3path in s3dir.iter_objects(bsm=s3_client)
+        if s3path.basename.isdigit()
+    ]
+    if len(s3path_list) == 0:
+        raise FileNotFoundError(f"Textract output not found at: {s3dir.uri}")
+    # sort by 1, 2, 3 ...
+    s3path_list.sort(key=lambda x: int(x.basename))
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+        part_list = list(
+            executor.map(
+                lambda s3path: json.loads(s3path.read_bytes(bsm=s3_client)),
+                s3path_list,
+            )
+        )
+    res = part_list[0]
+    blocks = res.setdefault("Blocks", [])
+    for part in part_list[1:]:
+        blocks.extend(part.get("Blocks", []))
+    return res
+
+
 class StatusEnum(pm.patterns.status_tracker.BaseStatusEnum):
     """
     Textract pipeline status enum.
@@ -214,6 +612,13 @@ class StepEnum(BetterStrEnum):
     textract_output_to_text_and_json = "textract_output_to_text_and_json"
 
 
+_step_to_component_status_mapper = {
+    StepEnum.raw_to_component.value: ComponentStatusEnum.created.value,
+    StepEnum.component_to_textract_output.value: ComponentStatusEnum.submitted.value,
+    StepEnum.textract_output_to_text_and_json.value: ComponentStatusEnum.converted.value,
+}
+
+
 @dataclasses.dataclass
 class MoveToNextStepResult(DataClass):
     # fmt: off
@@ -234,6 +639,95 @@ class BaseStatusAndUpdateTimeIndex(
     pass
 
 
+def _utc_now() -> datetime:
+    return datetime.utcnow().replace(tzinfo=timezone.utc)
+
+
+class BaseComponentTracker(pm.Model):
+    """
+    Component table ORM model, one item per ``(doc_id, comp_id)``. By default,
+    the components and the Textract job ids are stored in the ``data``
+    attribute of the tracker item. For documents with thousands of pages, it
+    makes the tracker item large (the DynamoDB item size limit is 400KB), and
+    every status update rewrites the whole list. Set
+    ``BaseTracker.COMPONENT_TRACKER_CLASS`` to store them in this table instead,
+    the tracker item only keeps the count.
+
+    Usage example:
+
+    .. code-block:: python
+
+        import aws_textract_pipeline.api as aws_textract_pipeline
+
+        class ComponentTracker(aws_textract_pipeline.BaseComponentTracker):
+            class Meta:
+                table_name = "aws_textract_pipeline-component-tracker"
+                region = bsm.aws_region
+                billing_mode = pm.PAY_PER_REQUEST_BILLING_MODE
+
+        class Tracker(aws_textract_pipeline.BaseTracker):
+            ...
+
+            COMPONENT_TRACKER_CLASS = ComponentTracker
+
+    :param doc_id: the document id.
+    :param comp_id: the component id.
+    :param status: the last step this component finished, see
+        :class:`ComponentStatusEnum`.
+    :param error: the error of the last failed attempt on this component.
+    :param job_id: the Textract job id of this component.
+    :param update_time: when the component is updated.
+    """
+
+    doc_id: T.Union[str, pm.UnicodeAttribute] = pm.UnicodeAttribute(hash_key=True)
+    comp_id: T.Union[str, pm.UnicodeAttribute] = pm.UnicodeAttribute(range_key=True)
+    status: T.Union[T.Optional[str], pm.UnicodeAttribute] = pm.UnicodeAttribute(
+        null=True,
+    )
+    error: T.Union[T.Optional[str], pm.UnicodeAttribute] = pm.UnicodeAttribute(
+        null=True,
+    )
+    job_id: T.Union[T.Optional[str], pm.UnicodeAttribute] = pm.UnicodeAttribute(
+        null=True,
+    )
+    update_time: T.Union[datetime, pm.UTCDateTimeAttribute] = pm.UTCDateTimeAttribute(
+        default=_utc_now,
+    )
+
+    @classmethod
+    def batch_put(cls, items: T.Iterable["BaseComponentTracker"]):
+        """
+        Write many component items with the DynamoDB batch write API.
+        """
+        with cls.batch_write() as batch:
+            for item in items:
+                batch.save(item)
+
+    @classmethod
+    def query_by_doc_id(cls, doc_id: str) -> T.List["BaseComponentTracker"]:
+        """
+        Get all component items of a document, in component order.
+        """
+        return list(cls.query(hash_key=doc_id))
+
+    @classmethod
+    def batch_get_by_comp_id(
+        cls,
+        doc_id: str,
+        comp_id_list: T.List[str],
+    ) -> T.List[T.Optional["BaseComponentTracker"]]:
+        """
+        Get component items with the DynamoDB batch get API. The returned
+        list is in the same order as ``comp_id_list``, the item is None if
+        it doesn't exist.
+        """
+        mapper = {
+            item.comp_id: item
+            for item in cls.batch_get([(doc_id, comp_id) for comp_id in comp_id_list])
+        }
+        return [mapper.get(comp_id) for comp_id in comp_id_list]
+
+
 class BaseTracker(
     pm.patterns.status_tracker.BaseStatusTracker,
 ):
@@ -284,6 +778,7 @@ class BaseTracker(
             LOCK_EXPIRE_SECONDS = 900 # lock will expire in 900 seconds
             DEFAULT_STATUS = StatusEnum.s01000_landing_to_raw_pending.value # default status at very beginning of this pipeline
             STATUS_ENUM = StatusEnum # you can extend the status enum if you want to add more status code and more ETL steps
+            COMPONENT_TRACKER_CLASS = ComponentTracker # store the components in a separate table, see BaseComponentTracker
 
     You can find a more detailed example at https://github.com/MacHu-GWU/aws_textract_pipeline-project/blob/main/debug/test_pipeline.py
 
@@ -298,14 +793,227 @@ class BaseTracker(
     LOCK_EXPIRE_SECONDS = 900
     DEFAULT_STATUS = StatusEnum.s01000_landing_to_raw_pending.value
     STATUS_ENUM = StatusEnum
+    COMPONENT_TRACKER_CLASS: T.Optional[T.Type[BaseComponentTracker]] = None
+
+    # the Textract job ids that reported succeeded via the SNS notification
+    succeeded_job_ids: T.Union[
+        T.Optional[T.Set[str]], pm.UnicodeSetAttribute
+    ] = pm.UnicodeSetAttribute(null=True)
 
     @property
     def doc_id(self) -> str:
         return self.task_id
 
+    def add_succeeded_job_ids(self, job_id_list: T.Iterable[str]) -> T.Set[str]:
+        """
+        Record the succeeded Textract job ids with the DynamoDB atomic set
+        ``ADD``, so that many notification consumers can report jobs of the
+        same document at the same time.
+
+        :return: all the succeeded job ids of this document.
+        """
+        self.update(actions=[type(self).succeeded_job_ids.add(set(job_id_list))])
+        return set(self.succeeded_job_ids or set())
+
+    def is_all_textract_job_succeeded(self) -> bool:
+        """
+        Check if all the Textract jobs of the current
+        :class:`ComponentToTextractOutputResult` are recorded as succeeded
+        by :meth:`add_succeeded_job_ids`.
+        """
+        result = self.get_component_to_textract_output_result()
+        if result is None:
+            return False
+        succeeded_job_ids = self.succeeded_job_ids or set()
+        return all(job_id in succeeded_job_ids for job_id in result.all_job_id_list)
+
+    def get_components(self) -> T.List[Component]:
+        """
+        Get the components of this document, from the ``data`` attribute,
+        or from the component table if ``COMPONENT_TRACKER_CLASS`` is set.
+        """
+        if self.COMPONENT_TRACKER_CLASS is None:
+            return self.data_obj.components
+        else:
+            return [
+                Component(id=item.comp_id, status=item.status, error=item.error)
+                for item in self.COMPONENT_TRACKER_CLASS.query_by_doc_id(self.doc_id)
+            ]
+
+    def _set_components(
+        self,
+        data_obj: Data,
+        components: T.List[Component],
+        step: str,
+        job_id_list: T.Optional[T.List[T.Optional[str]]] = None,
+        changed: T.Optional[T.Set[str]] = None,
+    ):
+        """
+        Save the per-component status to the ``data_obj`` or the component
+        table, and update the progress counters of the given step. The
+        ``data_obj`` still needs to be persisted by the caller.
+
+        :param job_id_list: the Textract job id of each component, it is
+            saved to the component table.
+        :param changed: the id of the changed components, only these items
+            are written to the component table. None means all.
+        """
+        if self.COMPONENT_TRACKER_CLASS is None:
+            data_obj.components = components
+        else:
+            if job_id_list is None:
+                job_id_list = [None] * len(components)
+            self.COMPONENT_TRACKER_CLASS.batch_put(
+                self.COMPONENT_TRACKER_CLASS(
+                    doc_id=self.doc_id,
+                    comp_id=component.id,
+                    status=component.status,
+                    error=component.error,
+                    job_id=job_id,
+                )
+                for component, job_id in zip(components, job_id_list)
+                if (changed is None) or (component.id in changed)
+            )
+            data_obj.components = []
+            data_obj.component_count = len(components)
+        status = _step_to_component_status_mapper[step]
+        n_done = sum(1 for comp in components if _is_component_done(comp, status))
+        n_failed = sum(
+            1
+            for comp in components
+            if (comp.error is not None) and (not _is_component_done(comp, status))
+        )
+        data_obj.progress = ComponentProgress(
+            step=step,
+            n_total=len(components),
+            n_done=n_done,
+            n_failed=n_failed,
+        )
+
+    def _save_progress(self, data_obj: Data):
+        """
+        Persist the ``data_obj`` immediately. The ``start`` context manager
+        discards the data update if the step failed, we use this to save the
+        partial progress explicitly, so the retry can resume from here.
+        """
+        self.update(actions=[type(self).data.set(data_obj.to_dict())])
+
+    @property
+    def progress(self) -> T.Optional[ComponentProgress]:
+        """
+        The component level progress (done / failed / pending) of the
+        current step, None if no component is processed yet.
+        """
+        return self.data_obj.progress
+
+    def get_component_to_textract_output_result(
+        self,
+    ) -> T.Optional[ComponentToTextractOutputResult]:
+        """
+        Get the :class:`ComponentToTextractOutputResult` of this document,
+        the ``job_id_list`` is read from the component table if
+        ``COMPONENT_TRACKER_CLASS`` is set.
+        """
+        result = self.data_obj.component_to_textract_output_result
+        if (
+            result is None
+            or result.is_single_textract_api_call
+            or self.COMPONENT_TRACKER_CLASS is None
+        ):
+            return result
+        return ComponentToTextractOutputResult(
+            is_single_textract_api_call=False,
+            job_id=None,
+            job_id_list=[
+                item.job_id
+                for item in self.COMPONENT_TRACKER_CLASS.query_by_doc_id(self.doc_id)
+            ],
+        )
+
+    def _set_component_to_textract_output_result(
+        self,
+        data_obj: Data,
+        result: ComponentToTextractOutputResult,
+        components: T.List[Component],
+        errors: T.Optional[T.Dict[str, Exception]] = None,
+    ):
+        """
+        Save the result to the ``data_obj``, or the job ids to the component
+        table, and mark the submitted components. The ``data_obj`` still
+        needs to be persisted by the caller.
+
+        :param errors: the submission error of each failed component.
+        """
+        errors = errors or {}
+        status = ComponentStatusEnum.submitted.value
+        changed = set()
+        for ith, comp in enumerate(components):
+            if result.is_single_textract_api_call:
+                is_submitted = result.job_id is not None
+            else:
+                is_submitted = result.job_id_list[ith] is not None
+            if is_submitted:
+                if not _is_component_done(comp, status):
+                    comp.status = status
+                    comp.error = None
+                    changed.add(comp.id)
+            elif comp.id in errors:
+                comp.error = repr(errors[comp.id])
+                changed.add(comp.id)
+        if (
+            result.is_single_textract_api_call
+            or self.COMPONENT_TRACKER_CLASS is None
+        ):
+            data_obj.component_to_textract_output_result = result
+            job_id_list = None
+        else:
+            data_obj.component_to_textract_output_result = (
+                ComponentToTextractOutputResult(
+                    is_single_textract_api_call=False,
+                    job_id=None,
+                    job_id_list=[],
+                )
+            )
+            job_id_list = result.job_id_list
+        self._set_components(
+            data_obj,
+            components,
+            step=StepEnum.component_to_textract_output.value,
+            job_id_list=job_id_list,
+            changed=changed,
+        )
+
     @property
     def data_obj(self) -> Data:
-        return Data.from_dict(self.data)
+        """
+        The typed view of the ``data`` attribute. It is parsed only once and
+        cached until the ``data`` attribute is replaced (by :meth:`set_data`,
+        ``update``, ``refresh`` or a rollback).
+
+        The returned object is shared, after modifying it, always persist it
+        with :meth:`set_data_obj`.
+        """
+        cache = getattr(self, "_data_obj_cache", None)
+        if cache is None or cache[0] is not self.data:
+            cache = (self.data, Data.from_dict(self.data))
+            self._data_obj_cache = cache
+        return cache[1]
+
+    def set_data(self, data: T.Optional[dict]) -> "BaseTracker":
+        """
+        Set the ``data`` attribute and invalidate the cached :attr:`data_obj`.
+        """
+        self._data_obj_cache = None
+        return super().set_data(data)
+
+    def set_data_obj(self, data_obj: Data) -> "BaseTracker":
+        """
+        Write the typed view back to the ``data`` attribute, and cache it
+        as the new :attr:`data_obj`.
+        """
+        self.set_data(data_obj.to_dict())
+        self._data_obj_cache = (self.data, data_obj)
+        return self
 
     @property
     def errors_obj(self) -> Errors:
@@ -475,6 +1183,9 @@ class BaseTracker(
         self,
         bsm: "BotoSesManager",
         workspace: "Workspace",
+        multipart_threshold: int = DEFAULT_MULTIPART_THRESHOLD,
+        part_size: int = DEFAULT_PART_SIZE,
+        max_workers: int = 1,
         debug: bool = False,
     ):
         """
@@ -489,27 +1200,54 @@ class BaseTracker(
         with self.start_landing_to_raw(debug=debug):
             s3path_landing = S3Path(self.data_obj.landing_uri)
             s3path_raw = workspace.get_raw_s3path(doc_id=self.doc_id)
-            metadata = s3path_landing.metadata.copy()
+            # one head_object call for the size, content type and metadata
+            landing_doc = LandingDocument.load(bsm=bsm, s3path=s3path_landing)
+            metadata = landing_doc.metadata.copy()
             metadata[MetadataKeyEnum.doc_id.value] = self.doc_id
             logger.info(f"Copy from {s3path_landing.uri} to {s3path_raw.uri}")
-            s3path_landing.copy_to(
-                dst=s3path_raw,
-                overwrite=True,
+            n_part = copy_s3_object(
+                s3_client=bsm.s3_client,
+                s3path_src=s3path_landing,
+                s3path_dst=s3path_raw,
+                size=landing_doc.size,
                 metadata=metadata,
-                bsm=bsm,
+                content_type=landing_doc.content_type,
+                multipart_threshold=multipart_threshold,
+                part_size=part_size,
+                max_workers=max_workers,
             )
+            if n_part:
+                logger.info(f"copied {landing_doc.size} bytes in {n_part} parts")
 
     def landing_to_raw(
         self,
         bsm: "BotoSesManager",
         workspace: "Workspace",
+        multipart_threshold: int = DEFAULT_MULTIPART_THRESHOLD,
+        part_size: int = DEFAULT_PART_SIZE,
+        max_workers: int = 1,
         debug: bool = False,
     ):
         """
         Wrapper of the :meth:`BaseTracker._landing_to_raw` method.
+
+        :param bsm: ``boto_session_manager.BotoSesManager`` object.
+        :param workspace: :class:`aws_textract_pipeline.workspace.Workspace` object.
+        :param multipart_threshold: documents greater than or equal to this
+            size in bytes are copied with the parallel multipart copy,
+            see :func:`aws_textract_pipeline.landing.copy_s3_object`.
+        :param part_size: the multipart copy part size in bytes.
+        :param max_workers: number of threads to copy the parts.
         """
         with logger.disabled(disable=not debug):
-            return self._landing_to_raw(bsm=bsm, workspace=workspace, debug=debug)
+            return self._landing_to_raw(
+                bsm=bsm,
+                workspace=workspace,
+                multipart_threshold=multipart_threshold,
+                part_size=part_size,
+                max_workers=max_workers,
+                debug=debug,
+            )
 
     @logger.start_and_end(msg="Raw to Component")
     def _raw_to_component(
@@ -518,90 +1256,435 @@ class BaseTracker(
         workspace: "Workspace",
         tmp_dir: T_PATH_ARG = dir_tmp,
         clear_tmp_dir: bool = False,
+        max_workers: int = 1,
+        render_max_workers: int = 1,
+        in_memory: bool = True,
+        repair_pdf: T.Optional[bool] = True,
+        image_setting: T.Optional[ImageSetting] = None,
+        text_layer_setting: T.Optional[TextLayerSetting] = None,
+        json_setting: T.Optional[JsonSetting] = None,
+        rows_per_chunk: int = 1000,
+        max_component_size: int = 8 * MB,
+        has_header: bool = False,
         debug: bool = False,
     ) -> T.List[Component]:
         """
         Segment raw document into components.
 
+        The text native documents (plain text, Word, Excel, PowerPoint, CSV,
+        TSV and JSON Lines, see :data:`_text_native_doc_types`) are split into
+        sections (headings, row chunks, slides, line aligned chunks), and the
+        text and json view of each section are written directly, no Textract
+        call is needed. These documents go to the
+        ``textract_output_to_text_and_json_succeeded`` status right away.
+        Only the ``.docx``, ``.xlsx`` and ``.pptx`` formats are supported.
+        The CSV, TSV and JSON documents are streamed from S3, and
+        decompressed on the fly if the landing file name ends with ``.gz``.
+        The plain text document is also decompressed if it ends with ``.gz``.
+        The gzip compressed Word, Excel and PowerPoint documents are rejected
+        with ``ValueError``, they are zip archives already.
+        A regular (not JSON Lines) JSON document is a single component.
+
         :param bsm: ``boto_session_manager.BotoSesManager`` object.
         :param workspace: :class:`aws_textract_pipeline.workspace.Workspace` object.
         :param tmp_dir: temporary directory on local File system to store
-            the intermediate files
+            the intermediate files, only used when ``in_memory`` is False.
         :param clear_tmp_dir: whether to clear the temporary directory after the
             operation.
+        :param max_workers: number of threads to upload the components and images
+            to S3 concurrently. The order of the returned components is always
+            the page order. If any object failed to upload, the other objects
+            are still uploaded and a :class:`ComponentUploadError` is raised.
+        :param render_max_workers: number of processes to render the page images,
+            see :func:`aws_textract_pipeline.segment.iter_segment_pdf`.
+        :param in_memory: if True, the raw document, components and images are
+            processed in memory and uploaded from bytes, nothing is written to
+            ``tmp_dir``. If False, the raw document is downloaded to ``tmp_dir``,
+            segmented from the file, and every component and image is staged
+            on disk and uploaded from the file. Use it for documents that don't
+            fit in memory.
+        :param repair_pdf: whether to rewrite the PDF before segmentation,
+            see :func:`aws_textract_pipeline.segment.segment_pdf`. Use None to
+            only rewrite the documents that MuPDF reports as broken.
+        :param image_setting: the page image encoding setting, if not given,
+            use ``workspace.image_setting``, then the default RGB PNG. The
+            S3 content type of the image matches the format.
+        :param text_layer_setting: if given, the PDF pages that have a usable
+            text layer (see :class:`~aws_textract_pipeline.segment.TextLayerSetting`)
+            get their text and json view written directly, and they are not
+            sent to Textract. If all pages pass, the document skips the
+            Textract steps like the text native documents. If not given, use
+            ``workspace.text_layer_setting``, then all pages go to Textract.
+        :param json_setting: the json view serialization setting of the text
+            native documents and the born-digital PDF pages, if not given,
+            use ``workspace.json_setting``, then the default plain JSON.
+        :param rows_per_chunk: the max number of rows per Excel component,
+            see :func:`aws_textract_pipeline.segment.iter_segment_excel`.
+            The text view is CSV.
+        :param max_component_size: the max size of a CSV, TSV or JSON Lines
+            component in bytes, see
+            :func:`aws_textract_pipeline.segment.iter_segment_data`.
+        :param has_header: whether the Excel sheets and the CSV, TSV documents
+            have a header row. If True, it is repeated in every component.
         :param debug:
         """
-        self.check_status_range(
-            valid_status=[
-                self.STATUS_ENUM.s01060_landing_to_raw_succeeded.value,
-                self.STATUS_ENUM.s02000_raw_to_component_pending.value,
-                self.STATUS_ENUM.s02040_raw_to_component_failed.value,
-            ]
-        )
-
-        tmp_dir = Path(tmp_dir)
-        dir_root = tmp_dir / self.doc_id
-        dir_root.mkdir(parents=True, exist_ok=True)
+        doc_type = self.data_obj.doc_type
+        is_text_native = doc_type in _text_native_doc_types
+        valid_status = [
+            self.STATUS_ENUM.s01060_landing_to_raw_succeeded.value,
+            self.STATUS_ENUM.s02000_raw_to_component_pending.value,
+            self.STATUS_ENUM.s02040_raw_to_component_failed.value,
+        ]
+        if is_text_native:
+            # the status jump to the text and json succeeded was interrupted
+            valid_status.append(self.STATUS_ENUM.s02060_raw_to_component_succeeded.value)
+        self.check_status_range(valid_status=valid_status)
+
+        if in_memory is False:
+            tmp_dir = Path(tmp_dir)
+            dir_root = tmp_dir / self.doc_id
+            dir_root.mkdir(parents=True, exist_ok=True)
         s3path_raw = workspace.get_raw_s3path(doc_id=self.doc_id)
         metadata = s3path_raw.metadata.copy()
-
+        if image_setting is None:
+            image_setting = workspace.image_setting
+        if image_setting is None:
+            image_setting = ImageSetting()
+        if text_layer_setting is None:
+            text_layer_setting = workspace.text_layer_setting
+        if json_setting is None:
+            json_setting = workspace.json_setting
+        if json_setting is None:
+            json_setting = JsonSetting()
+
+        # resume from the previous failed attempt, skip the components
+        # that are already uploaded.
+        previous_components = {comp.id: comp for comp in self.get_components()}
+        created = ComponentStatusEnum.created.value
+        converted = ComponentStatusEnum.converted.value
+        # the text native components and the born-digital PDF pages skip
+        # the Textract steps
+        born_digital_ids = set()
         components = list()
+        uploaded = set()
+
+        def get_target_status(comp_id: str) -> str:
+            if is_text_native or (comp_id in born_digital_ids):
+                return converted
+            else:
+                return created
+
+        def get_uri_list(comp_id: str) -> T.List[str]:
+            uri_list = list()
+            if not is_text_native:
+                uri_list.append(
+                    workspace.get_component_s3path(doc_id=self.doc_id, comp_id=comp_id).uri
+                )
+                uri_list.append(
+                    workspace.get_image_s3path(doc_id=self.doc_id, comp_id=comp_id).uri
+                )
+            if get_target_status(comp_id) == converted:
+                uri_list.append(
+                    workspace.get_text_s3path(doc_id=self.doc_id, comp_id=comp_id).uri
+                )
+                uri_list.append(
+                    workspace.get_json_s3path(doc_id=self.doc_id, comp_id=comp_id).uri
+                )
+            return uri_list
+
+        def set_components(error: T.Optional[Exception] = None):
+            errors = error.errors if isinstance(error, ComponentUploadError) else {}
+            changed = set()
+            for comp in components:
+                target_status = get_target_status(comp.id)
+                if _is_component_done(comp, target_status):
+                    continue
+                uri_list = get_uri_list(comp.id)
+                if all(uri in uploaded for uri in uri_list):
+                    comp.status = target_status
+                    comp.error = None
+                    changed.add(comp.id)
+                else:
+                    for uri in uri_list:
+                        if uri in errors:
+                            comp.error = repr(errors[uri])
+                            changed.add(comp.id)
+                            break
+            self._set_components(
+                data_obj,
+                components,
+                step=StepEnum.raw_to_component.value,
+                changed=changed,
+            )
+
+        def iter_text_and_json_items(
+            component_id: str,
+            section: T.Union[TextSection, TableChunk, DataChunk],
+            section_metadata: dict,
+        ):
+            s3path_text = workspace.get_text_s3path(
+                doc_id=self.doc_id, comp_id=component_id
+            )
+            s3path_json = workspace.get_json_s3path(
+                doc_id=self.doc_id, comp_id=component_id
+            )
+            logger.info(f"Create text view: {s3path_text.uri}")
+            yield (
+                s3path_text,
+                section.text.encode("utf-8"),
+                section_metadata,
+                S3ContentTypeEnum.text_plain.value,
+            )
+
+            logger.info(f"Create JSON view: {s3path_json.uri}")
+            yield (
+                s3path_json,
+                json_setting.encode(section.to_textract_response()),
+                section_metadata,
+                json_setting.content_type,
+                json_setting.content_encoding,
+            )
+
+        data_obj = self.data_obj
         with self.start_raw_to_component(debug=debug):
             # ------------------------------------------------------------------
             # PDF
             # ------------------------------------------------------------------
-            if self.data_obj.doc_type == DocTypeEnum.pdf.value:
-                res = segment_pdf(s3path_raw.read_bytes())
-                for ith, (pdf, pixmap) in enumerate(
-                    zip(res.page_pdf_list, res.page_image_list),
-                    start=1,
-                ):
-                    component_id = f"{ith:06d}"
-                    path_page = dir_root / f"{component_id}.pdf"
-                    path_image = dir_root / f"{component_id}.png"
-                    s3path_component = workspace.get_component_s3path(
-                        doc_id=self.doc_id, comp_id=component_id
+            if doc_type == DocTypeEnum.pdf.value:
+                if in_memory:
+                    page_iterator = iter_segment_pdf(
+                        s3path_raw.read_bytes(bsm=bsm),
+                        max_workers=render_max_workers,
+                        repair=repair_pdf,
+                        image_setting=image_setting,
+                        text_layer_setting=text_layer_setting,
                     )
-                    s3path_image = workspace.get_image_s3path(
-                        doc_id=self.doc_id, comp_id=component_id
+                else:
+                    path_raw = dir_root / "raw.pdf"
+                    logger.info(f"Download raw document to {path_raw}")
+                    bsm.s3_client.download_file(
+                        Bucket=s3path_raw.bucket,
+                        Key=s3path_raw.key,
+                        Filename=path_raw.abspath,
                     )
-                    metadata[MetadataKeyEnum.component_id.value] = component_id
-
-                    logger.info(f"Create component: {s3path_component.uri}")
-                    pdf.save(path_page.abspath)
-                    s3path_component.write_bytes(
-                        path_page.read_bytes(),
-                        metadata=metadata,
-                        content_type=S3ContentTypeEnum.pdf.value,
-                        bsm=bsm,
+                    page_iterator = iter_segment_pdf(
+                        pdf_path=path_raw.abspath,
+                        max_workers=render_max_workers,
+                        repair=repair_pdf,
+                        image_setting=image_setting,
+                        text_layer_setting=text_layer_setting,
                     )
 
-                    logger.info(f"Create image: {s3path_image.uri}")
-                    pixmap.save(path_image.abspath, output="png")
-                    s3path_image.write_bytes(
-                        path_image.read_bytes(),
-                        metadata=metadata,
-                        content_type=S3ContentTypeEnum.image_png.value,
-                        bsm=bsm,
+                def iter_items():
+                    # segment the document page by page, so that only one page
+                    # is in memory at a time, no matter how large the document is.
+                    for page in page_iterator:
+                        if page.page_num == 1:
+                            logger.info(f"PDF is repaired: {page.is_repaired}")
+                        component_id = f"{page.page_num:06d}"
+                        component = previous_components.get(
+                            component_id, Component(id=component_id)
+                        )
+                        components.append(component)
+                        if page.is_born_digital:
+                            born_digital_ids.add(component_id)
+                        if _is_component_done(
+                            component, get_target_status(component_id)
+                        ):
+                            logger.info(f"Skip uploaded component: {component_id}")
+                            continue
+                        s3path_component = workspace.get_component_s3path(
+                            doc_id=self.doc_id, comp_id=component_id
+                        )
+                        s3path_image = workspace.get_image_s3path(
+                            doc_id=self.doc_id, comp_id=component_id
+                        )
+                        page_metadata = dict(metadata)
+                        page_metadata[MetadataKeyEnum.component_id.value] = component_id
+
+                        if in_memory:
+                            component_content = page.pdf_content
+                            image_content = page.image_content
+                        else:
+                            component_content = dir_root / f"{component_id}.pdf"
+                            component_content.write_bytes(page.pdf_content)
+                            image_content = (
+                                dir_root / f"{component_id}.{image_setting.format}"
+                            )
+                            image_content.write_bytes(page.image_content)
+
+                        logger.info(f"Create component: {s3path_component.uri}")
+                        yield (
+                            s3path_component,
+                            component_content,
+                            page_metadata,
+                            S3ContentTypeEnum.pdf.value,
+                        )
+
+                        logger.info(f"Create image: {s3path_image.uri}")
+                        yield (
+                            s3path_image,
+                            image_content,
+                            page_metadata,
+                            image_setting.content_type,
+                        )
+
+                        # the page has a usable text layer, no OCR is needed
+                        if page.is_born_digital:
+                            yield from iter_text_and_json_items(
+                                component_id, page.text_section, page_metadata
+                            )
+
+                try:
+                    _write_components_to_s3(
+                        s3_client=bsm.s3_client,
+                        items=iter_items(),
+                        max_workers=max_workers,
+                        remove_file=clear_tmp_dir,
+                        uploaded=uploaded,
+                    )
+                except Exception as e:
+                    set_components(error=e)
+                    self._save_progress(data_obj)
+                    raise e
+                if (in_memory is False) and clear_tmp_dir:
+                    path_raw.unlink()
+                set_components()
+                self.set_data_obj(data_obj)
+            # ------------------------------------------------------------------
+            # Text, Word, Excel, PowerPoint
+            # ------------------------------------------------------------------
+            elif is_text_native:
+                stream = None
+                is_gzip = self.data_obj.landing_uri.lower().endswith(".gz")
+                if is_gzip and (doc_type in _office_doc_types):
+                    raise ValueError(
+                        f"gzip compressed {doc_type} document is not supported, "
+                        f"it is already a zip archive, "
+                        f"upload it without the '.gz' extension: "
+                        f"{self.data_obj.landing_uri}"
                     )
-                    component = Component(id=component_id)
-                    components.append(component)
-                    if clear_tmp_dir:
-                        path_page.unlink()
-                        path_image.unlink()
-                data_obj = self.data_obj
-                data_obj.components = components
-                self.set_data(data_obj.to_dict())
-                return components
+                if doc_type in _data_doc_type_to_delimiter_mapper:
+                    # stream the document, never load it as a whole
+                    stream = bsm.s3_client.get_object(
+                        Bucket=s3path_raw.bucket,
+                        Key=s3path_raw.key,
+                    )["Body"]
+                    if is_gzip:
+                        stream = gzip.GzipFile(fileobj=stream, mode="rb")
+                    if doc_type == DocTypeEnum.json.value:
+                        section_iterator = iter_segment_json(
+                            stream,
+                            max_bytes=max_component_size,
+                        )
+                    else:
+                        section_iterator = iter_segment_data(
+                            stream,
+                            delimiter=_data_doc_type_to_delimiter_mapper[doc_type],
+                            max_bytes=max_component_size,
+                            header=has_header,
+                            quotechar=_data_doc_type_to_quotechar_mapper[doc_type],
+                        )
+                elif doc_type == DocTypeEnum.excel.value:
+                    if in_memory:
+                        section_iterator = iter_segment_excel(
+                            s3path_raw.read_bytes(bsm=bsm),
+                            rows_per_chunk=rows_per_chunk,
+                            header=has_header,
+                        )
+                    else:
+                        path_raw = dir_root / "raw.xlsx"
+                        logger.info(f"Download raw document to {path_raw}")
+                        bsm.s3_client.download_file(
+                            Bucket=s3path_raw.bucket,
+                            Key=s3path_raw.key,
+                            Filename=path_raw.abspath,
+                        )
+                        section_iterator = iter_segment_excel(
+                            excel_path=path_raw.abspath,
+                            rows_per_chunk=rows_per_chunk,
+                            header=has_header,
+                        )
+                else:
+                    content = s3path_raw.read_bytes(bsm=bsm)
+                    if doc_type == DocTypeEnum.word.value:
+                        section_iterator = iter_segment_word(content)
+                    elif doc_type == DocTypeEnum.ppt.value:
+                        section_iterator = iter_segment_ppt(content)
+                    else:
+                        if is_gzip:
+                            content = gzip.decompress(content)
+                        section_iterator = iter_segment_text(content)
+
+                def iter_items():
+                    for section in section_iterator:
+                        component_id = f"{section.section_num:06d}"
+                        component = previous_components.get(
+                            component_id, Component(id=component_id)
+                        )
+                        components.append(component)
+                        if _is_component_done(component, converted):
+                            logger.info(f"Skip converted component: {component_id}")
+                            continue
+                        section_metadata = dict(metadata)
+                        section_metadata[MetadataKeyEnum.component_id.value] = component_id
+                        yield from iter_text_and_json_items(
+                            component_id, section, section_metadata
+                        )
+
+                try:
+                    _write_components_to_s3(
+                        s3_client=bsm.s3_client,
+                        items=iter_items(),
+                        max_workers=max_workers,
+                        uploaded=uploaded,
+                    )
+                except Exception as e:
+                    set_components(error=e)
+                    self._save_progress(data_obj)
+                    raise e
+                finally:
+                    if stream is not None:
+                        stream.close()
+                if (
+                    (in_memory is False)
+                    and clear_tmp_dir
+                    and (doc_type == DocTypeEnum.excel.value)
+                ):
+                    path_raw.unlink()
+                set_components()
+                self.set_data_obj(data_obj)
             else:
                 raise NotImplementedError
 
+        # no Textract is needed, jump to the text and json view succeeded
+        if is_text_native or (
+            len(components)
+            and all(_is_component_done(comp, converted) for comp in components)
+        ):
+            with self.update_context():
+                self.set_status(
+                    self.STATUS_ENUM.s05060_textract_output_to_text_and_json_succeeded.value
+                )
+                self.set_update_time()
+        return components
+
     def raw_to_component(
         self,
         bsm: "BotoSesManager",
         workspace: "Workspace",
         tmp_dir: T_PATH_ARG = dir_tmp,
         clear_tmp_dir: bool = True,
+        max_workers: int = 1,
+        render_max_workers: int = 1,
+        in_memory: bool = True,
+        repair_pdf: T.Optional[bool] = True,
+        image_setting: T.Optional[ImageSetting] = None,
+        text_layer_setting: T.Optional[TextLayerSetting] = None,
+        json_setting: T.Optional[JsonSetting] = None,
+        rows_per_chunk: int = 1000,
+        max_component_size: int = 8 * MB,
+        has_header: bool = False,
         debug: bool = False,
     ) -> T.List[Component]:
         """
@@ -613,6 +1696,16 @@ class BaseTracker(
                 workspace=workspace,
                 tmp_dir=tmp_dir,
                 clear_tmp_dir=clear_tmp_dir,
+                max_workers=max_workers,
+                render_max_workers=render_max_workers,
+                in_memory=in_memory,
+                repair_pdf=repair_pdf,
+                image_setting=image_setting,
+                text_layer_setting=text_layer_setting,
+                json_setting=json_setting,
+                rows_per_chunk=rows_per_chunk,
+                max_component_size=max_component_size,
+                has_header=has_header,
                 debug=debug,
             )
 
@@ -657,6 +1750,222 @@ class BaseTracker(
         logger.info(f"JobId: {job_id}")
         return job_id
 
+    def _submit_textract_jobs(
+        self,
+        bsm: "BotoSesManager",
+        workspace: "Workspace",
+        result: ComponentToTextractOutputResult,
+        components: T.List[Component],
+        feature_types: T.List[str],
+        sns_topic_arn: T.Optional[str] = None,
+        role_arn: T.Optional[str] = None,
+        max_workers: int = 1,
+        max_tps: T.Optional[float] = None,
+        max_attempts: int = 5,
+    ):  # pragma: no cover
+        """
+        Submit the Textract jobs that don't have a job id yet, and fill the
+        job id into the ``result`` in place. It uses a bounded thread pool,
+        a token bucket for the TPS limit, and retries the throttling errors
+        with jittered exponential backoff.
+
+        :raises TextractSubmitError: if some jobs failed to submit. The
+            succeeded job ids are still filled into the ``result``.
+        """
+        doc_id = self.doc_id
+        s3path_raw = workspace.get_raw_s3path(doc_id=doc_id)
+        bucket = None if max_tps is None else TokenBucket(rate=max_tps)
+
+        def submit(s3path_component: S3Path, comp_id: str) -> str:
+            def start_document_analysis():
+                if bucket is not None:
+                    bucket.acquire()
+                return self._component_to_textract_output_helper(
+                    bsm=bsm,
+                    workspace=workspace,
+                    s3path_component=s3path_component,
+                    doc_id=doc_id,
+                    comp_id=comp_id,
+                    feature_types=feature_types,
+                    sns_topic_arn=sns_topic_arn,
+                    role_arn=role_arn,
+                )
+
+            return call_with_backoff(
+                start_document_analysis,
+                max_attempts=max_attempts,
+            )
+
+        if result.is_single_textract_api_call:
+            if result.job_id is None:
+                try:
+                    result.job_id = submit(s3path_raw, _root_)
+                except Exception as e:
+                    raise TextractSubmitError({_root_: e})
+            return
+
+        # get the boto client in the main thread before using it in threads
+        _ = bsm.textract_client
+        errors = dict()
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = dict()
+            for ith, comp in enumerate(components):
+                # the born-digital page is converted without Textract
+                if (result.job_id_list[ith] is None) and (
+                    not _is_component_done(comp, ComponentStatusEnum.converted.value)
+                ):
+                    s3path_component = workspace.get_component_s3path(
+                        doc_id=doc_id,
+                        comp_id=comp.id,
+                    )
+                    future = executor.submit(submit, s3path_component, comp.id)
+                    futures[future] = ith
+            for future in concurrent.futures.as_completed(futures):
+                ith = futures[future]
+                try:
+                    result.job_id_list[ith] = future.result()
+                except Exception as e:
+                    errors[components[ith].id] = e
+        if errors:
+            raise TextractSubmitError(errors)
+
+    def _is_sync_analyze_eligible(
+        self,
+        bsm: "BotoSesManager",
+        workspace: "Workspace",
+        components: T.List[Component],
+        setting: SyncAnalyzeSetting,
+    ) -> bool:  # pragma: no cover
+        """
+        Whether the document fits the :class:`~aws_textract_pipeline.analyze.SyncAnalyzeSetting`
+        limits, and no async Textract job is submitted yet.
+        """
+        if len(components) == 0 or len(components) > setting.max_pages:
+            return False
+        submitted = ComponentStatusEnum.submitted.value
+        converted = ComponentStatusEnum.converted.value
+        for comp in components:
+            if _is_component_done(comp, converted):
+                continue
+            # resume the async jobs of the previous attempt
+            if _is_component_done(comp, submitted):
+                return False
+            s3path_component = workspace.get_component_s3path(
+                doc_id=self.doc_id,
+                comp_id=comp.id,
+            )
+            res = bsm.s3_client.head_object(
+                Bucket=s3path_component.bucket,
+                Key=s3path_component.key,
+            )
+            if res["ContentLength"] > setting.max_page_size:
+                return False
+        return True
+
+    def _analyze_components_sync(
+        self,
+        bsm: "BotoSesManager",
+        workspace: "Workspace",
+        data_obj: Data,
+        components: T.List[Component],
+        feature_types: T.List[str],
+        max_workers: int = 1,
+        max_tps: T.Optional[float] = None,
+        max_attempts: int = 5,
+        json_setting: T.Optional[JsonSetting] = None,
+    ) -> ComponentToTextractOutputResult:  # pragma: no cover
+        """
+        Analyze the components with the synchronous ``AnalyzeDocument`` API
+        in a bounded thread pool, and write the text and json view directly.
+        The converted components of a previous attempt are skipped. The
+        ``data_obj`` still needs to be persisted by the caller.
+
+        :raises TextractSubmitError: if some components failed. The other
+            components are still converted and checkpointed.
+        """
+        doc_id = self.doc_id
+        metadata = workspace.get_raw_s3path(doc_id=doc_id).metadata.copy()
+        bucket = None if max_tps is None else TokenBucket(rate=max_tps)
+        converted = ComponentStatusEnum.converted.value
+
+        def convert(comp_id: str):
+            s3path_component = workspace.get_component_s3path(
+                doc_id=doc_id,
+                comp_id=comp_id,
+            )
+            content = s3path_component.read_bytes(bsm=bsm.s3_client)
+
+            def analyze():
+                if bucket is not None:
+                    bucket.acquire()
+                logger.info(f"analyze {feature_types} for: {s3path_component.uri}")
+                return analyze_document(
+                    textract_client=bsm.textract_client,
+                    content=content,
+                    feature_types=feature_types,
+                )
+
+            res = call_with_backoff(analyze, max_attempts=max_attempts)
+            self._write_text_and_json_view(
+                bsm=bsm,
+                workspace=workspace,
+                comp_id=comp_id,
+                res=res,
+                base_metadata=metadata,
+                json_setting=json_setting,
+            )
+
+        # get the boto client in the main thread before using it in threads
+        _ = bsm.s3_client
+        _ = bsm.textract_client
+        errors = dict()
+        changed = set()
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {
+                executor.submit(convert, comp.id): comp
+                for comp in components
+                if not _is_component_done(comp, converted)
+            }
+            for future in concurrent.futures.as_completed(futures):
+                comp = futures[future]
+                try:
+                    future.result()
+                    comp.status = converted
+                    comp.error = None
+                except Exception as e:
+                    errors[comp.id] = e
+                    comp.error = repr(e)
+                changed.add(comp.id)
+
+        # there is no Textract job, the job id list is all None
+        result = ComponentToTextractOutputResult(
+            is_single_textract_api_call=False,
+            job_id=None,
+            job_id_list=[None] * len(components),
+        )
+        if self.COMPONENT_TRACKER_CLASS is None:
+            data_obj.component_to_textract_output_result = result
+        else:
+            data_obj.component_to_textract_output_result = (
+                ComponentToTextractOutputResult(
+                    is_single_textract_api_call=False,
+                    job_id=None,
+                    job_id_list=[],
+                )
+            )
+        self._set_components(
+            data_obj,
+            components,
+            step=StepEnum.component_to_textract_output.value,
+            changed=changed,
+        )
+        if errors:
+            # report the errors in component order
+            raise TextractSubmitError(
+                {comp.id: errors[comp.id] for comp in components if comp.id in errors}
+            )
+        return result
+
     @logger.start_and_end(msg="Component to Textract Output")
     def _component_to_textract_output(
         self,
@@ -670,6 +1979,11 @@ class BaseTracker(
         use_layout_feature: bool = False,
         sns_topic_arn: T.Optional[str] = None,
         role_arn: T.Optional[str] = None,
+        max_workers: int = 1,
+        max_tps: T.Optional[float] = None,
+        max_attempts: int = 5,
+        sync_analyze_setting: T.Optional[SyncAnalyzeSetting] = None,
+        json_setting: T.Optional[JsonSetting] = None,
         debug: bool = False,
     ) -> ComponentToTextractOutputResult:  # pragma: no cover
         """
@@ -685,6 +1999,13 @@ class BaseTracker(
 
         doc_id = self.doc_id
         data_obj = self.data_obj
+        if sync_analyze_setting is None:
+            sync_analyze_setting = workspace.sync_analyze_setting
+        if json_setting is None:
+            json_setting = workspace.json_setting
+        if json_setting is None:
+            json_setting = JsonSetting()
+        is_sync = False
 
         # prepare textract API arguments
         # for feature types, if user manually specified the feature types
@@ -714,68 +2035,127 @@ class BaseTracker(
             # PDF
             # ------------------------------------------------------------------
             if data_obj.doc_type == DocTypeEnum.pdf.value:
-                if single_api_call is None:
-                    # check if the document fit Amazon Textract Async API quota
-                    # if fit, then only make one API call for the whole document.
-                    if s3path_raw.size <= 300_000_000 and data_obj.n_components <= 3000:
-                        is_single_textract_api_call = True
-                    else:
-                        is_single_textract_api_call = False
-                else:
-                    is_single_textract_api_call = single_api_call
-
-                if is_single_textract_api_call:
-                    comp_id = _root_
-                    job_id = self._component_to_textract_output_helper(
+                components = self.get_components()
+                # small document, use the synchronous API, no job to wait
+                if (
+                    (sync_analyze_setting is not None)
+                    and (single_api_call is not True)
+                    and self._is_sync_analyze_eligible(
                         bsm=bsm,
                         workspace=workspace,
-                        s3path_component=s3path_raw,
-                        doc_id=doc_id,
-                        comp_id=comp_id,
-                        feature_types=feature_types,
-                        sns_topic_arn=sns_topic_arn,
-                        role_arn=role_arn,
+                        components=components,
+                        setting=sync_analyze_setting,
                     )
-                    component_to_textract_output_result = (
-                        ComponentToTextractOutputResult(
-                            is_single_textract_api_call=True,
-                            job_id=job_id,
-                            job_id_list=None,
+                ):
+                    try:
+                        component_to_textract_output_result = (
+                            self._analyze_components_sync(
+                                bsm=bsm,
+                                workspace=workspace,
+                                data_obj=data_obj,
+                                components=components,
+                                feature_types=feature_types,
+                                max_workers=max_workers,
+                                max_tps=max_tps,
+                                max_attempts=max_attempts,
+                                json_setting=json_setting,
+                            )
                         )
-                    )
-                # if doesn't fit, then make multiple API calls for each component.
+                    except Exception as e:
+                        self._save_progress(data_obj)
+                        raise e
+                    self.set_data_obj(data_obj)
+                    is_sync = True
                 else:
-                    component_to_textract_output_result = (
-                        ComponentToTextractOutputResult(
-                            is_single_textract_api_call=False,
-                            job_id=None,
-                            job_id_list=[],
+                    if single_api_call is None:
+                        # check if the document fit Amazon Textract Async API quota
+                        # if fit, then only make one API call for the whole document.
+                        # if some pages are born-digital, only submit the others.
+                        if any(
+                            _is_component_done(comp, ComponentStatusEnum.converted.value)
+                            for comp in components
+                        ):
+                            is_single_textract_api_call = False
+                        elif s3path_raw.size <= 300_000_000 and data_obj.n_components <= 3000:
+                            is_single_textract_api_call = True
+                        else:
+                            is_single_textract_api_call = False
+                    else:
+                        is_single_textract_api_call = single_api_call
+
+                    # resume from the previous failed attempt, only submit the
+                    # components that don't have a job id yet.
+                    previous_result = self.get_component_to_textract_output_result()
+                    if (
+                        previous_result is not None
+                        and previous_result.is_single_textract_api_call
+                        == is_single_textract_api_call
+                        and (
+                            is_single_textract_api_call
+                            or len(previous_result.job_id_list) == data_obj.n_components
                         )
-                    )
-                    for comp in data_obj.components:
-                        comp_id = comp.id
-                        job_id = self._component_to_textract_output_helper(
+                    ):
+                        component_to_textract_output_result = previous_result
+                    elif is_single_textract_api_call:
+                        component_to_textract_output_result = (
+                            ComponentToTextractOutputResult(
+                                is_single_textract_api_call=True,
+                                job_id=None,
+                                job_id_list=[],
+                            )
+                        )
+                    # if doesn't fit, then make multiple API calls for each component.
+                    else:
+                        component_to_textract_output_result = (
+                            ComponentToTextractOutputResult(
+                                is_single_textract_api_call=False,
+                                job_id=None,
+                                job_id_list=[None] * data_obj.n_components,
+                            )
+                        )
+
+                    try:
+                        self._submit_textract_jobs(
                             bsm=bsm,
                             workspace=workspace,
-                            s3path_component=workspace.get_component_s3path(
-                                doc_id=doc_id,
-                                comp_id=comp_id,
-                            ),
-                            doc_id=doc_id,
-                            comp_id=comp_id,
+                            result=component_to_textract_output_result,
+                            components=components,
                             feature_types=feature_types,
                             sns_topic_arn=sns_topic_arn,
                             role_arn=role_arn,
+                            max_workers=max_workers,
+                            max_tps=max_tps,
+                            max_attempts=max_attempts,
                         )
-                        component_to_textract_output_result.job_id_list.append(job_id)
-                data_obj.component_to_textract_output_result = (
-                    component_to_textract_output_result
-                )
-                self.set_data(data_obj.to_dict())
-                return component_to_textract_output_result
+                    except Exception as e:
+                        # the ``start`` context manager discards the data update
+                        # if the step failed, we have to save the partial progress
+                        # explicitly, so the retry can resume from here.
+                        self._set_component_to_textract_output_result(
+                            data_obj,
+                            component_to_textract_output_result,
+                            components,
+                            errors=e.errors if isinstance(e, TextractSubmitError) else None,
+                        )
+                        self._save_progress(data_obj)
+                        raise e
+
+                    self._set_component_to_textract_output_result(
+                        data_obj, component_to_textract_output_result, components
+                    )
+                    self.set_data_obj(data_obj)
             else:
                 raise NotImplementedError
 
+        # the text and json view are written, skip the wait and conversion
+        if is_sync:
+            with self.update_context():
+                self.set_status(
+                    self.STATUS_ENUM.s05060_textract_output_to_text_and_json_succeeded.value
+                )
+                self.set_update_time()
+        return component_to_textract_output_result
+
     def component_to_textract_output(
         self,
         bsm: "BotoSesManager",
@@ -788,6 +2168,11 @@ class BaseTracker(
         use_layout_feature: bool = False,
         sns_topic_arn: T.Optional[str] = None,
         role_arn: T.Optional[str] = None,
+        max_workers: int = 1,
+        max_tps: T.Optional[float] = None,
+        max_attempts: int = 5,
+        sync_analyze_setting: T.Optional[SyncAnalyzeSetting] = None,
+        json_setting: T.Optional[JsonSetting] = None,
         debug: bool = False,
     ) -> ComponentToTextractOutputResult:  # pragma: no cover
         """
@@ -811,6 +2196,27 @@ class BaseTracker(
             when the job is done.
         :param role_arn: the role arn that allows Amazon Textract to publish to the
             SNS topic.
+        :param max_workers: number of threads to submit the Textract jobs
+            concurrently, only used when making multiple API calls.
+        :param max_tps: the client side limit of ``start_document_analysis``
+            calls per second, None means no limit.
+        :param max_attempts: max number of attempts for each job submission,
+            the throttling errors are retried with jittered exponential backoff.
+            If some jobs still failed, the submitted job ids are saved, and
+            the retry of this step only submits the rest.
+        :param sync_analyze_setting: if given, and the document fits its
+            limits (see :class:`~aws_textract_pipeline.analyze.SyncAnalyzeSetting`),
+            the components are analyzed with the synchronous ``AnalyzeDocument``
+            API in parallel (``max_workers`` threads, ``max_tps`` and
+            ``max_attempts`` also apply), the text and json view are written
+            directly, and the document goes to the
+            ``textract_output_to_text_and_json_succeeded`` status right away,
+            there is no job to wait. If not given, use
+            ``workspace.sync_analyze_setting``, then always use the async
+            jobs. It is ignored if ``single_api_call`` is True.
+        :param json_setting: the json view serialization setting of the
+            synchronous API mode, if not given, use ``workspace.json_setting``,
+            then the default plain JSON.
         :param debug:
         """
         with logger.disabled(disable=not debug):
@@ -825,33 +2231,46 @@ class BaseTracker(
                 use_layout_feature=use_layout_feature,
                 sns_topic_arn=sns_topic_arn,
                 role_arn=role_arn,
+                max_workers=max_workers,
+                max_tps=max_tps,
+                max_attempts=max_attempts,
+                sync_analyze_setting=sync_analyze_setting,
+                json_setting=json_setting,
                 debug=debug,
             )
 
-    def _textract_output_to_text_and_json_helper(
+    def _write_text_and_json_view(
         self,
         bsm: "BotoSesManager",
         workspace: "Workspace",
-        job_id: str,
         comp_id: str,
+        res: dict,
         base_metadata: dict,
-    ) -> T.Tuple[str, dict]:  # pragma: no cover
+        text_executor: T.Optional[concurrent.futures.ProcessPoolExecutor] = None,
+        json_setting: T.Optional[JsonSetting] = None,
+    ) -> str:  # pragma: no cover
         """
-        This is a utility function to simplify the code.
-        """
-        base_metadata[MetadataKeyEnum.component_id.value] = comp_id
+        Write the text and json view of a component from the Textract
+        response, return the text.
 
-        # Get merged data
-        res = aws_textract.better_boto.get_document_analysis(
-            textract_client=bsm.textract_client,
-            job_id=job_id,
-            all_pages=True,
-        )
-        if "ResponseMetadata" in res:
-            del res["ResponseMetadata"]
+        :param text_executor: if given, run ``blocks_to_text`` in this
+            process pool instead of the current thread.
+        :param json_setting: the json view serialization setting.
+        """
+        if json_setting is None:
+            json_setting = JsonSetting()
+        # the base metadata is shared by all threads, don't modify it in place
+        metadata = dict(base_metadata)
+        metadata[MetadataKeyEnum.component_id.value] = comp_id
 
         # Text
-        text = aws_textract.res.blocks_to_text(res.get("Blocks", []))
+        if text_executor is None:
+            text = aws_textract.res.blocks_to_text(res.get("Blocks", []))
+        else:
+            text = text_executor.submit(
+                aws_textract.res.blocks_to_text,
+                res.get("Blocks", []),
+            ).result()
         s3path_text = workspace.get_text_s3path(
             doc_id=self.doc_id,
             comp_id=comp_id,
@@ -861,8 +2280,8 @@ class BaseTracker(
         )
         s3path_text.write_text(
             text,
-            bsm=bsm,
-            metadata=base_metadata,
+            bsm=bsm.s3_client,
+            metadata=metadata,
             content_type=S3ContentTypeEnum.text_plain.value,
         )
 
@@ -874,73 +2293,387 @@ class BaseTracker(
         logger.info(
             f"create JSON view for doc_id = {self.doc_id}, comp_id = {comp_id} at: {s3path_json.uri}"
         )
-        s3path_json.write_text(
-            json.dumps(res),
-            bsm=bsm,
-            metadata=base_metadata,
-            content_type=S3ContentTypeEnum.json.value,
+        kwargs = dict(
+            bsm=bsm.s3_client,
+            metadata=metadata,
+            content_type=json_setting.content_type,
         )
-        return text, res
+        if json_setting.content_encoding is not None:
+            kwargs["content_encoding"] = json_setting.content_encoding
+        s3path_json.write_bytes(json_setting.encode(res), **kwargs)
+        return text
 
-    @logger.start_and_end(msg="Textract Output to Text and Json")
-    def _textract_output_to_text_and_json(
+    def _textract_output_to_text_and_json_helper(
         self,
         bsm: "BotoSesManager",
         workspace: "Workspace",
-        debug: bool = False,
-    ) -> TextractOutputToTextAndJsonResult:  # pragma: no cover
+        job_id: str,
+        comp_id: str,
+        base_metadata: dict,
+        from_s3_output: bool = False,
+        text_executor: T.Optional[concurrent.futures.ProcessPoolExecutor] = None,
+        json_setting: T.Optional[JsonSetting] = None,
+    ) -> T.Tuple[str, dict]:  # pragma: no cover
         """
-        See :meth:`BaseTracker.textract_output_to_text_and_json` for details.
+        This is a utility function to simplify the code.
+
+        :param text_executor: if given, run ``blocks_to_text`` in this
+            process pool instead of the current thread.
+        :param json_setting: the json view serialization setting.
         """
-        self.check_status_range(
-            valid_status=[
-                self.STATUS_ENUM.s03060_component_to_textract_output_succeeded.value,
-                self.STATUS_ENUM.s05000_textract_output_to_text_and_json_pending.value,
-                self.STATUS_ENUM.s05040_textract_output_to_text_and_json_failed.value,
-            ]
+        # Get merged data
+        if from_s3_output:
+            res = _read_textract_output_from_s3(
+                s3_client=bsm.s3_client,
+                s3dir_textract_output=workspace.get_textract_output_s3dir(
+                    doc_id=self.doc_id,
+                    comp_id=comp_id,
+                ),
+                job_id=job_id,
+            )
+        else:
+            res = aws_textract.better_boto.get_document_analysis(
+                textract_client=bsm.textract_client,
+                job_id=job_id,
+                all_pages=True,
+            )
+        if "ResponseMetadata" in res:
+            del res["ResponseMetadata"]
+
+        text = self._write_text_and_json_view(
+            bsm=bsm,
+            workspace=workspace,
+            comp_id=comp_id,
+            res=res,
+            base_metadata=base_metadata,
+            text_executor=text_executor,
+            json_setting=json_setting,
         )
+        return text, res
 
-        data_obj = self.data_obj
+    def _iter_text_and_json(
+        self,
+        bsm: "BotoSesManager",
+        workspace: "Workspace",
+        from_s3_output: bool = False,
+        max_workers: int = 1,
+        text_max_workers: int = 1,
+        json_setting: T.Optional[JsonSetting] = None,
+        keep_payload: bool = True,
+    ) -> T.Iterable[
+        T.Tuple[int, TextAndJsonSummary, T.Optional[str], T.Optional[dict]]
+    ]:  # pragma: no cover
+        """
+        Convert all components to text and json view with a bounded thread
+        pool, yield ``(index, summary, text, textract_response)`` in the
+        order the components finish. At most ``max_workers * 2`` components
+        are in flight.
+
+        Components already converted in a previous attempt are not converted
+        again, their text and json view are read back from S3 if
+        ``keep_payload`` is True, otherwise they are not yielded.
+
+        :param keep_payload: if False, the text and Textract response are
+            dropped in the worker thread as soon as they are written to S3,
+            and None is yielded instead.
+
+        :raises TextAndJsonConvertError: after all the other components
+            finished, if any component failed.
+        """
+        if json_setting is None:
+            json_setting = workspace.json_setting
+        if json_setting is None:
+            json_setting = JsonSetting()
         component_to_textract_output_result = (
-            data_obj.component_to_textract_output_result
+            self.get_component_to_textract_output_result()
         )
         s3path_raw = workspace.get_raw_s3path(doc_id=self.doc_id)
         metadata = s3path_raw.metadata.copy()
-        textract_output_to_text_and_json_result = TextractOutputToTextAndJsonResult()
-        with self.start_textract_output_to_text_and_json(debug=debug):
-            if component_to_textract_output_result.is_single_textract_api_call:
-                comp_id = _root_
-                job_id = component_to_textract_output_result.job_id
+        components = self.get_components()
+        converted = ComponentStatusEnum.converted.value
+        if component_to_textract_output_result.is_single_textract_api_call:
+            task_list = [(_root_, component_to_textract_output_result.job_id)]
+            is_single = True
+            # the root output covers all components
+            done_set = (
+                {_root_}
+                if (
+                    len(components)
+                    and all(_is_component_done(comp, converted) for comp in components)
+                )
+                else set()
+            )
+        else:
+            task_list = [
+                (comp.id, job_id)
+                for comp, job_id in zip(
+                    components,
+                    component_to_textract_output_result.job_id_list,
+                )
+            ]
+            is_single = False
+            done_set = {
+                comp.id for comp in components if _is_component_done(comp, converted)
+            }
+
+        def load(comp_id: str):
+            """
+            Read the text and json view of a converted component back from S3.
+            """
+            s3path_text = workspace.get_text_s3path(doc_id=self.doc_id, comp_id=comp_id)
+            s3path_json = workspace.get_json_s3path(doc_id=self.doc_id, comp_id=comp_id)
+            text = s3path_text.read_text(bsm=bsm.s3_client)
+            response = bsm.s3_client.get_object(
+                Bucket=s3path_json.bucket, Key=s3path_json.key
+            )
+            setting = json_setting
+            # the previous attempt may use a different compression
+            if json_setting.format != JsonFormatEnum.parquet.value:
+                compression = None
+                for encoding in response.get("ContentEncoding", "").split(","):
+                    if CompressionEnum.is_valid_value(encoding.strip()):
+                        compression = encoding.strip()
+                setting = dataclasses.replace(json_setting, compression=compression)
+            res = setting.decode(response["Body"].read())
+            return text, res
+
+        def convert(comp_id: str, job_id: str):
+            if comp_id in done_set:
+                if keep_payload is False:
+                    return None
+                text, res = load(comp_id)
+            else:
                 text, res = self._textract_output_to_text_and_json_helper(
                     bsm=bsm,
                     workspace=workspace,
                     job_id=job_id,
                     comp_id=comp_id,
                     base_metadata=metadata,
+                    from_s3_output=from_s3_output,
+                    text_executor=text_executor,
+                    json_setting=json_setting,
                 )
-                textract_output_to_text_and_json_result.text_list.append(text)
-                textract_output_to_text_and_json_result.json_list.append(res)
+            blocks = res.get("Blocks", [])
+            summary = TextAndJsonSummary(
+                comp_id=comp_id,
+                text_uri=workspace.get_text_s3path(
+                    doc_id=self.doc_id, comp_id=comp_id
+                ).uri,
+                json_uri=workspace.get_json_s3path(
+                    doc_id=self.doc_id, comp_id=comp_id
+                ).uri,
+                n_pages=sum(1 for block in blocks if block["BlockType"] == "PAGE"),
+                n_blocks=len(blocks),
+                n_chars=len(text),
+            )
+            if keep_payload:
+                return summary, text, res
             else:
-                for comp, job_id in zip(
-                    data_obj.components,
-                    component_to_textract_output_result.job_id_list,
-                ):
-                    comp_id = comp.id
-                    text, res = self._textract_output_to_text_and_json_helper(
-                        bsm=bsm,
-                        workspace=workspace,
-                        job_id=job_id,
-                        comp_id=comp_id,
-                        base_metadata=metadata,
+                return summary, None, None
+
+        # get the boto client in the main thread before using it in threads
+        _ = bsm.s3_client
+        _ = bsm.textract_client
+        if text_max_workers > 1:
+            text_executor = concurrent.futures.ProcessPoolExecutor(
+                max_workers=text_max_workers
+            )
+        else:
+            text_executor = None
+        errors = dict()
+        succeeded = set()
+        is_closed = False
+        try:
+            with concurrent.futures.ThreadPoolExecutor(
+                max_workers=max_workers
+            ) as executor:
+                futures: T.Dict[concurrent.futures.Future, int] = dict()
+
+                def collect(future: concurrent.futures.Future):
+                    ith = futures.pop(future)
+                    try:
+                        output = future.result()
+                    except Exception as e:
+                        errors[task_list[ith][0]] = e
+                        return None
+                    succeeded.add(task_list[ith][0])
+                    # skipped converted component in streaming mode
+                    if output is not None:
+                        return (ith, *output)
+
+                def drain(return_when: str):
+                    done, _ = concurrent.futures.wait(
+                        futures, return_when=return_when
+                    )
+                    for future in done:
+                        output = collect(future)
+                        if output is not None:
+                            yield output
+
+                try:
+                    for ith, (comp_id, job_id) in enumerate(task_list):
+                        future = executor.submit(convert, comp_id, job_id)
+                        futures[future] = ith
+                        if len(futures) >= max_workers * 2:
+                            yield from drain(concurrent.futures.FIRST_COMPLETED)
+                    while futures:
+                        yield from drain(concurrent.futures.FIRST_COMPLETED)
+                except GeneratorExit:
+                    # the consumer stopped early, don't start the queued
+                    # components, and checkpoint the finished ones
+                    is_closed = True
+                    for future in list(futures):
+                        if future.cancel():
+                            futures.pop(future)
+                    concurrent.futures.wait(futures)
+                    for future in list(futures):
+                        collect(future)
+        finally:
+            if text_executor is not None:
+                text_executor.shutdown()
+
+        # checkpoint the converted components
+        changed = set()
+        for comp in components:
+            key = _root_ if is_single else comp.id
+            if key in succeeded:
+                if not _is_component_done(comp, converted):
+                    comp.status = converted
+                    comp.error = None
+                    changed.add(comp.id)
+            elif key in errors:
+                comp.error = repr(errors[key])
+                changed.add(comp.id)
+        data_obj = self.data_obj
+        self._set_components(
+            data_obj,
+            components,
+            step=StepEnum.textract_output_to_text_and_json.value,
+            job_id_list=(
+                None if is_single else component_to_textract_output_result.job_id_list
+            ),
+            changed=changed,
+        )
+        if is_closed:
+            # the caller marks the step as failed, keep the progress
+            self._save_progress(data_obj)
+            return
+        if errors:
+            self._save_progress(data_obj)
+            # report the errors in component order
+            raise TextAndJsonConvertError(
+                {
+                    comp_id: errors[comp_id]
+                    for comp_id, _ in task_list
+                    if comp_id in errors
+                }
+            )
+        self.set_data_obj(data_obj)
+
+    def _check_textract_output_to_text_and_json_status(self):
+        self.check_status_range(
+            valid_status=[
+                self.STATUS_ENUM.s03060_component_to_textract_output_succeeded.value,
+                self.STATUS_ENUM.s05000_textract_output_to_text_and_json_pending.value,
+                self.STATUS_ENUM.s05040_textract_output_to_text_and_json_failed.value,
+            ]
+        )
+
+    @logger.start_and_end(msg="Textract Output to Text and Json")
+    def _textract_output_to_text_and_json(
+        self,
+        bsm: "BotoSesManager",
+        workspace: "Workspace",
+        from_s3_output: bool = False,
+        max_workers: int = 1,
+        text_max_workers: int = 1,
+        json_setting: T.Optional[JsonSetting] = None,
+        debug: bool = False,
+    ) -> TextractOutputToTextAndJsonResult:  # pragma: no cover
+        """
+        See :meth:`BaseTracker.textract_output_to_text_and_json` for details.
+        """
+        self._check_textract_output_to_text_and_json_status()
+        with self.start_textract_output_to_text_and_json(debug=debug):
+            pairs = dict()
+            for ith, _, text, res in self._iter_text_and_json(
+                bsm=bsm,
+                workspace=workspace,
+                from_s3_output=from_s3_output,
+                max_workers=max_workers,
+                text_max_workers=text_max_workers,
+                json_setting=json_setting,
+                keep_payload=True,
+            ):
+                pairs[ith] = (text, res)
+        # collect the results in component order
+        return TextractOutputToTextAndJsonResult(
+            text_list=[pairs[ith][0] for ith in sorted(pairs)],
+            json_list=[pairs[ith][1] for ith in sorted(pairs)],
+        )
+
+    def iter_textract_output_to_text_and_json(
+        self,
+        bsm: "BotoSesManager",
+        workspace: "Workspace",
+        from_s3_output: bool = False,
+        max_workers: int = 1,
+        text_max_workers: int = 1,
+        json_setting: T.Optional[JsonSetting] = None,
+        debug: bool = False,
+    ) -> T.Iterable[TextAndJsonSummary]:  # pragma: no cover
+        """
+        The streaming version of :meth:`textract_output_to_text_and_json`.
+        It yields a :class:`TextAndJsonSummary` as soon as each component
+        finishes, and doesn't keep the text and Textract blocks in memory.
+
+        The status is set to succeeded when the iterator is exhausted. If
+        the iterator is closed early (``break`` out of the loop, or garbage
+        collected), the finished components are checkpointed, and the status
+        is set to failed, so the retry resumes from there.
+
+        See :meth:`textract_output_to_text_and_json` for the parameters.
+        """
+        self._check_textract_output_to_text_and_json_status()
+        iterator = self._iter_text_and_json(
+            bsm=bsm,
+            workspace=workspace,
+            from_s3_output=from_s3_output,
+            max_workers=max_workers,
+            text_max_workers=text_max_workers,
+            json_setting=json_setting,
+            keep_payload=False,
+        )
+        try:
+            with self.start_textract_output_to_text_and_json(debug=debug):
+                try:
+                    while True:
+                        # don't mute the caller's log while it holds the summary
+                        with logger.disabled(disable=not debug):
+                            output = next(iterator, None)
+                            if output is None:
+                                break
+                            summary = output[1]
+                            logger.info(f"component {summary.comp_id} is done")
+                        yield summary
+                except GeneratorExit:
+                    with logger.disabled(disable=not debug):
+                        iterator.close()
+                    # let the ``start`` context manager mark the step failed
+                    raise _IteratorClosedError(
+                        "the iterator is closed before all components are converted"
                     )
-                    textract_output_to_text_and_json_result.text_list.append(text)
-                    textract_output_to_text_and_json_result.json_list.append(res)
-        return textract_output_to_text_and_json_result
+        except _IteratorClosedError:
+            pass
 
     def textract_output_to_text_and_json(
         self,
         bsm: "BotoSesManager",
         workspace: "Workspace",
+        from_s3_output: bool = False,
+        max_workers: int = 1,
+        text_max_workers: int = 1,
+        json_setting: T.Optional[JsonSetting] = None,
         debug: bool = False,
     ) -> TextractOutputToTextAndJsonResult:  # pragma: no cover
         """
@@ -950,12 +2683,30 @@ class BaseTracker(
 
         :param bsm: ``boto_session_manager.BotoSesManager`` object.
         :param workspace: :class:`aws_textract_pipeline.workspace.Workspace` object.
+        :param from_s3_output: if True, read the JSON parts that Textract
+            already wrote to the output S3 prefix, and merge them locally,
+            instead of paging through the ``GetDocumentAnalysis`` API.
+            It doesn't consume the Textract API quota, and it still works
+            after the job result expires (7 days).
+        :param max_workers: number of threads to convert the components
+            concurrently. The results are always in component order. If any
+            component failed, the other components are still converted and
+            a :class:`TextAndJsonConvertError` is raised.
+        :param text_max_workers: number of processes to run ``blocks_to_text``,
+            1 means run it in the conversion threads.
+        :param json_setting: the json view serialization setting (format,
+            encoder and compression), if not given, use
+            ``workspace.json_setting``, then the default plain JSON.
         :param debug:
         """
         with logger.disabled(disable=not debug):
             return self._textract_output_to_text_and_json(
                 bsm=bsm,
                 workspace=workspace,
+                from_s3_output=from_s3_output,
+                max_workers=max_workers,
+                text_max_workers=text_max_workers,
+                json_setting=json_setting,
                 debug=debug,
             )
 
@@ -965,7 +2716,7 @@ class BaseTracker(
         """
         if self.status in [
             self.STATUS_ENUM.s01000_landing_to_raw_pending.value,
-            self.STATUS_ENUM.s01020_landing_to_raw_in_progress.value,
+            self.STATUS_ENUM.s01040_landing_to_raw_failed.value,
         ]:
             return StepEnum.landing_to_raw
         elif self.status == self.STATUS_ENUM.s01020_landing_to_raw_in_progress.value:
@@ -980,6 +2731,12 @@ class BaseTracker(
         elif self.status == self.STATUS_ENUM.s02020_raw_to_component_in_progress.value:
             if self.is_locked() is False:
                 return StepEnum.raw_to_component
+        elif (
+            self.status == self.STATUS_ENUM.s02060_raw_to_component_succeeded.value
+            and self.data_obj.doc_type in _text_native_doc_types
+        ):
+            # the status jump after raw to component was interrupted
+            return StepEnum.raw_to_component
         elif self.status in [
             self.STATUS_ENUM.s02060_raw_to_component_succeeded.value,
             self.STATUS_ENUM.s03000_component_to_textract_output_pending.value,
@@ -1013,6 +2770,14 @@ class BaseTracker(
         workspace: "Workspace",
         tmp_dir: T_PATH_ARG = dir_tmp,
         clear_tmp_dir: bool = True,
+        max_workers: int = 1,
+        multipart_threshold: int = DEFAULT_MULTIPART_THRESHOLD,
+        part_size: int = DEFAULT_PART_SIZE,
+        render_max_workers: int = 1,
+        in_memory: bool = True,
+        repair_pdf: T.Optional[bool] = True,
+        image_setting: T.Optional[ImageSetting] = None,
+        text_layer_setting: T.Optional[TextLayerSetting] = None,
         single_api_call: T.Optional[bool] = None,
         use_table_feature: bool = False,
         use_form_feature: bool = False,
@@ -1021,6 +2786,16 @@ class BaseTracker(
         use_layout_feature: bool = False,
         sns_topic_arn: T.Optional[str] = None,
         role_arn: T.Optional[str] = None,
+        textract_max_workers: int = 1,
+        max_tps: T.Optional[float] = None,
+        max_attempts: int = 5,
+        sync_analyze_setting: T.Optional[SyncAnalyzeSetting] = None,
+        from_s3_output: bool = False,
+        text_max_workers: int = 1,
+        json_setting: T.Optional[JsonSetting] = None,
+        rows_per_chunk: int = 1000,
+        max_component_size: int = 8 * MB,
+        has_header: bool = False,
         debug: bool = False,
     ):  # pragma: no cover
         """
@@ -1031,10 +2806,26 @@ class BaseTracker(
         - :meth:`raw_to_component`
         - :meth:`component_to_textract_output`
         - :meth:`textract_output_to_text_and_json`
+
+        The parameters are passed to the step method of the same name, except:
+
+        :param max_workers: number of threads for the S3 I/O, it is the
+            ``max_workers`` of :meth:`landing_to_raw`, :meth:`raw_to_component`
+            and :meth:`textract_output_to_text_and_json`.
+        :param textract_max_workers: number of threads to call Textract, it
+            is the ``max_workers`` of :meth:`component_to_textract_output`.
+            Keep it low with ``max_tps``, no matter how many S3 threads.
         """
         next_step = self.get_next_step()
         if next_step is StepEnum.landing_to_raw:
-            self.landing_to_raw(bsm=bsm, workspace=workspace, debug=debug)
+            self.landing_to_raw(
+                bsm=bsm,
+                workspace=workspace,
+                multipart_threshold=multipart_threshold,
+                part_size=part_size,
+                max_workers=max_workers,
+                debug=debug,
+            )
             return MoveToNextStepResult(
                 step=StepEnum.landing_to_raw.value,
             )
@@ -1044,6 +2835,16 @@ class BaseTracker(
                 workspace=workspace,
                 tmp_dir=tmp_dir,
                 clear_tmp_dir=clear_tmp_dir,
+                max_workers=max_workers,
+                render_max_workers=render_max_workers,
+                in_memory=in_memory,
+                repair_pdf=repair_pdf,
+                image_setting=image_setting,
+                text_layer_setting=text_layer_setting,
+                json_setting=json_setting,
+                rows_per_chunk=rows_per_chunk,
+                max_component_size=max_component_size,
+                has_header=has_header,
                 debug=debug,
             )
             return MoveToNextStepResult(
@@ -1062,6 +2863,11 @@ class BaseTracker(
                 use_layout_feature=use_layout_feature,
                 sns_topic_arn=sns_topic_arn,
                 role_arn=role_arn,
+                max_workers=textract_max_workers,
+                max_tps=max_tps,
+                max_attempts=max_attempts,
+                sync_analyze_setting=sync_analyze_setting,
+                json_setting=json_setting,
                 debug=debug,
             )
             return MoveToNextStepResult(
@@ -1071,7 +2877,13 @@ class BaseTracker(
         elif next_step is StepEnum.textract_output_to_text_and_json:
             textract_output_to_text_and_json_result = (
                 self.textract_output_to_text_and_json(
-                    bsm=bsm, workspace=workspace, debug=debug
+                    bsm=bsm,
+                    workspace=workspace,
+                    from_s3_output=from_s3_output,
+                    max_workers=max_workers,
+                    text_max_workers=text_max_workers,
+                    json_setting=json_setting,
+                    debug=debug,
                 )
             )
             return MoveToNextStepResult(
@@ -0,0 +1,189 @@
+# -*- coding: utf-8 -*-
+
+"""
+Wait many Textract async jobs together.
+
+See:
+
+- :class:`JobStatusEnum`
+- :class:`JobTiming`
+- :class:`TextractJobFailedError`
+- :func:`wait_jobs_to_succeed`
+- :func:`wait_document_analysis_jobs_to_succeed`
+"""
+
+import typing as T
+import time
+import dataclasses
+import concurrent.futures
+
+from .vendor.better_enum import BetterStrEnum
+from .vendor.better_dataclasses import DataClass
+from .throttle import call_with_backoff
+
+
+class JobStatusEnum(BetterStrEnum):
+    """
+    Textract async job status.
+    """
+
+    IN_PROGRESS = "IN_PROGRESS"
+    SUCCEEDED = "SUCCEEDED"
+    FAILED = "FAILED"
+    PARTIAL_SUCCESS = "PARTIAL_SUCCESS"
+
+
+@dataclasses.dataclass
+class JobTiming(DataClass):
+    """
+    The waiting summary of a Textract async job.
+
+    :param job_id: the Textract job id.
+    :param status: the last seen job status.
+    :param elapsed: seconds from the start of waiting to the poll that
+        saw the final status.
+    :param n_poll: number of the get job API calls.
+    """
+
+    job_id: str = dataclasses.field()
+    status: str = dataclasses.field()
+    elapsed: float = dataclasses.field()
+    n_poll: int = dataclasses.field()
+
+
+class TextractJobFailedError(Exception):
+    """
+    Raised when any of the waited Textract jobs failed.
+
+    :param job_timing: the :class:`JobTiming` of the failed job.
+    :param job_timing_list: the :class:`JobTiming` of all jobs at the time
+        of failure.
+    """
+
+    def __init__(
+        self,
+        job_timing: JobTiming,
+        job_timing_list: T.List[JobTiming],
+    ):
+        self.job_timing = job_timing
+        self.job_timing_list = job_timing_list
+        super().__init__(
+            f"Textract job {job_timing.job_id!r} failed "
+            f"with status {job_timing.status!r}"
+        )
+
+
+def wait_jobs_to_succeed(
+    get_job_status: T.Callable[[str], str],
+    job_id_list: T.List[str],
+    delays: float = 5,
+    max_delays: float = 30,
+    backoff: float = 1.5,
+    timeout: float = 600,
+    max_workers: int = 10,
+    verbose: bool = False,
+    clock: T.Callable[[], float] = time.monotonic,
+    sleep: T.Callable[[float], None] = time.sleep,
+) -> T.List[JobTiming]:
+    """
+    Poll all outstanding jobs together on one shared schedule. In each round,
+    all the unfinished jobs are polled concurrently with a thread pool, then
+    wait for ``delays`` seconds, the delay grows by ``backoff`` after each
+    round up to ``max_delays``. The total waiting time is about the slowest
+    job instead of the sum of all jobs.
+
+    It returns as soon as all jobs succeeded, and raises as soon as any job
+    failed. ``PARTIAL_SUCCESS`` is treated as failed because some pages
+    don't have output.
+
+    :param get_job_status: a function that takes a job id and returns the
+        job status.
+    :param job_id_list: list of job id to wait.
+    :param delays: the initial delay in seconds between two rounds.
+    :param max_delays: the max delay in seconds between two rounds.
+    :param backoff: the delay multiplier after each round.
+    :param timeout: the total timeout in seconds.
+    :param max_workers: number of threads to poll the jobs.
+    :param verbose: print the progress.
+
+    :return: the :class:`JobTiming` for each job, in the same order as
+        ``job_id_list``.
+
+    :raises TextractJobFailedError: if any job failed.
+    :raises TimeoutError: if not all jobs succeeded before timeout.
+    """
+    start = clock()
+    timing_list = [
+        JobTiming(job_id=job_id, status=JobStatusEnum.IN_PROGRESS.value, elapsed=0, n_poll=0)
+        for job_id in job_id_list
+    ]
+    pending = list(range(len(timing_list)))
+
+    def poll(timing: JobTiming):
+        status = call_with_backoff(get_job_status, timing.job_id, sleep=sleep)
+        timing.n_poll += 1
+        timing.status = status
+        timing.elapsed = clock() - start
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+        while True:
+            list(executor.map(poll, [timing_list[ith] for ith in pending]))
+            for ith in pending:
+                timing = timing_list[ith]
+                if timing.status in [
+                    JobStatusEnum.FAILED.value,
+                    JobStatusEnum.PARTIAL_SUCCESS.value,
+                ]:
+                    raise TextractJobFailedError(timing, timing_list)
+            pending = [
+                ith
+                for ith in pending
+                if timing_list[ith].status != JobStatusEnum.SUCCEEDED.value
+            ]
+            if verbose:  # pragma: no cover
+                n_done = len(timing_list) - len(pending)
+                elapsed = clock() - start
+                print(
+                    f"{n_done}/{len(timing_list)} jobs succeeded, "
+                    f"elapsed {elapsed:.1f} sec"
+                )
+            if len(pending) == 0:
+                return timing_list
+            if (clock() - start + delays) > timeout:
+                raise TimeoutError(
+                    f"{len(pending)} jobs are still in progress after {timeout} sec"
+                )
+            sleep(delays)
+            delays = min(max_delays, delays * backoff)
+
+
+def wait_document_analysis_jobs_to_succeed(
+    textract_client,
+    job_id_list: T.List[str],
+    delays: float = 5,
+    max_delays: float = 30,
+    backoff: float = 1.5,
+    timeout: float = 600,
+    max_workers: int = 10,
+    verbose: bool = False,
+) -> T.List[JobTiming]:
+    """
+    Wait many document analysis jobs to succeed. See
+    :func:`wait_jobs_to_succeed` for the parameters.
+    """
+
+    def get_job_status(job_id: str) -> str:
+        # only the status is needed, don't pull the blocks
+        res = textract_client.get_document_analysis(JobId=job_id, MaxResults=1)
+        return res["JobStatus"]
+
+    return wait_jobs_to_succeed(
+        get_job_status=get_job_status,
+        job_id_list=job_id_list,
+        delays=delays,
+        max_delays=max_delays,
+        backoff=backoff,
+        timeout=timeout,
+        max_workers=max_workers,
+        verbose=verbose,
+    )
@@ -4,10 +4,15 @@
 todo: add docstring
 """
 
+import typing as T
 import dataclasses
 
 from s3pathlib import S3Path
 
+from .segment import ImageSetting, TextLayerSetting
+from .serializer import JsonSetting
+from .analyze import SyncAnalyzeSetting
+
 
 @dataclasses.dataclass
 class Workspace:
@@ -16,9 +21,25 @@ class Workspace:
     S3 paths for different stages of the pipeline.
 
     :param s3dir_uri: the root S3 directory URI. All the S3 paths are relative to this directory.
+    :param image_setting: the default page image encoding setting of this workspace,
+        see :class:`~aws_textract_pipeline.segment.ImageSetting`.
+    :param json_setting: the default json view serialization setting of this
+        workspace, see :class:`~aws_textract_pipeline.serializer.JsonSetting`.
+    :param text_layer_setting: the default born-digital PDF page detection
+        setting of this workspace, see
+        :class:`~aws_textract_pipeline.segment.TextLayerSetting`. None means
+        all PDF pages go to Textract.
+    :param sync_analyze_setting: the default limits of this workspace to use
+        the synchronous ``AnalyzeDocument`` API for small documents, see
+        :class:`~aws_textract_pipeline.analyze.SyncAnalyzeSetting`. None
+        means always use the async Textract jobs.
     """
 
     s3dir_uri: str
+    image_setting: T.Optional[ImageSetting] = None
+    json_setting: T.Optional[JsonSetting] = None
+    text_layer_setting: T.Optional[TextLayerSetting] = None
+    sync_analyze_setting: T.Optional[SyncAnalyzeSetting] = None
 
     # fmt: off
     @property
@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark the born-digital page detection of
+:func:`aws_textract_pipeline.segment.extract_page_text_layer`, the per page
+classification and extraction cost, versus the per page image rendering
+cost that every page pays anyway, on a document that mixes the text pages
+of ``tests/data/f1040.pdf`` with the scanned (image only) pages.
+
+It also prints how many pages would be sent to Textract with and without
+the detection.
+
+Usage::
+
+    python debug/bench_born_digital.py
+"""
+
+import time
+from pathlib import Path
+
+import fitz
+
+from aws_textract_pipeline.segment import extract_page_text_layer
+
+dir_here = Path(__file__).absolute().parent
+path_f1040 = dir_here.parent / "tests" / "data" / "f1040.pdf"
+n_copy = 20
+dpi = 200
+
+
+def make_mixed_pdf() -> fitz.Document:
+    """
+    ``n_copy`` copies of f1040, every other page is replaced by a page
+    that only has the scanned image of the original page.
+    """
+    f1040 = fitz.Document(path_f1040)
+    pdf = fitz.Document()
+    for _ in range(n_copy):
+        for page in f1040:
+            pixmap = page.get_pixmap(dpi=72)
+            if page.number % 2:
+                new_page = pdf.new_page(width=page.rect.width, height=page.rect.height)
+                new_page.insert_image(new_page.rect, pixmap=pixmap)
+            else:
+                pdf.insert_pdf(f1040, from_page=page.number, to_page=page.number)
+    return pdf
+
+
+def main():
+    pdf = make_mixed_pdf()
+    n_page = pdf.page_count
+
+    st = time.perf_counter()
+    n_born_digital = 0
+    for page in pdf:
+        if extract_page_text_layer(page, page.number + 1) is not None:
+            n_born_digital += 1
+    elapsed_detect = time.perf_counter() - st
+
+    st = time.perf_counter()
+    for page in pdf:
+        page.get_pixmap(dpi=dpi).tobytes("png")
+    elapsed_render = time.perf_counter() - st
+
+    print(f"pages: {n_page}, born-digital: {n_born_digital}")
+    print(
+        f"detect + extract: {elapsed_detect / n_page * 1000:>7.2f} ms/page, "
+        f"render {dpi} dpi png: {elapsed_render / n_page * 1000:>7.2f} ms/page"
+    )
+    print(
+        f"Textract pages: {n_page} without detection, "
+        f"{n_page - n_born_digital} with detection"
+    )
+
+
+if __name__ == "__main__":
+    main()
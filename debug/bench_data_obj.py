@@ -0,0 +1,73 @@
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark the :attr:`aws_textract_pipeline.tracker.BaseTracker.data_obj`
+access and the memory of the :class:`aws_textract_pipeline.tracker.Data`
+of a 3,000-component document.
+
+Usage::
+
+    python debug/bench_data_obj.py
+"""
+
+import time
+import tracemalloc
+
+import pynamodb_mate as pm
+
+from aws_textract_pipeline.tracker import (
+    BaseTracker,
+    Data,
+    Component,
+    ComponentToTextractOutputResult,
+)
+
+
+class Tracker(BaseTracker):
+    class Meta:
+        table_name = "bench-table"
+        region = "us-east-1"
+        billing_mode = pm.PAY_PER_REQUEST_BILLING_MODE
+
+
+n_components = 3000
+n_access = 100
+
+
+def main():
+    data = Data(
+        landing_uri="s3://bucket/landing/doc.pdf",
+        doc_type="pdf",
+        features=["FORMS"],
+        components=[Component(id=str(i).zfill(6)) for i in range(1, 1 + n_components)],
+        component_to_textract_output_result=ComponentToTextractOutputResult(
+            is_single_textract_api_call=False,
+            job_id=None,
+            job_id_list=[f"job-{i}" for i in range(n_components)],
+        ),
+    ).to_dict()
+    tracker = Tracker.make(task_id="doc", status=0, data=data)
+
+    st = time.perf_counter()
+    for _ in range(n_access):
+        Data.from_dict(tracker.data)
+    parse_time = (time.perf_counter() - st) / n_access
+
+    st = time.perf_counter()
+    for _ in range(n_access):
+        _ = tracker.data_obj.n_components
+    cached_time = (time.perf_counter() - st) / n_access
+
+    tracemalloc.start()
+    data_obj = Data.from_dict(tracker.data)
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(f"{n_components} components, {n_access} data_obj reads")
+    print(f"parse every read: {parse_time * 1000:.3f} ms / read")
+    print(f"cached data_obj : {cached_time * 1000:.3f} ms / read")
+    print(f"Data object     : {size / 1000:.1f} KB ({data_obj.n_components} components)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark the CSV / JSON Lines splitting throughput of
+:func:`aws_textract_pipeline.segment.iter_segment_data`, the line aligned
+chunking alone, plus the text view, plus the json view encoding.
+
+The document is read from a local file with the same ``read`` calls as the
+S3 ``StreamingBody``, so it measures the client side CPU cost, compare it
+with the S3 download bandwidth of the worker.
+
+Usage::
+
+    python debug/bench_data_split.py
+"""
+
+import os
+import time
+import tempfile
+
+from aws_textract_pipeline.segment import iter_segment_data
+from aws_textract_pipeline.serializer import JsonSetting
+
+MB = 1024 * 1024
+n_row = 1000000
+max_bytes = 8 * MB
+
+
+def make_csv(path: str):
+    with open(path, "w") as f:
+        f.write("id,name,city,amount,note\n")
+        for ith in range(n_row):
+            f.write(f'{ith},name {ith},Seattle,{ith * 0.25},"a, b"\n')
+
+
+def make_jsonl(path: str):
+    with open(path, "w") as f:
+        for ith in range(n_row):
+            f.write(f'{{"id": {ith}, "name": "name {ith}", "city": "Seattle"}}\n')
+
+
+def run(name: str, path: str, delimiter, mode: str):
+    json_setting = JsonSetting()
+    size = os.path.getsize(path)
+    st = time.perf_counter()
+    n_chunk = 0
+    with open(path, "rb") as f:
+        for chunk in iter_segment_data(
+            f, delimiter=delimiter, max_bytes=max_bytes, header=delimiter is not None
+        ):
+            n_chunk += 1
+            if mode in ("text", "text + json"):
+                chunk.text.encode("utf-8")
+            if mode == "text + json":
+                json_setting.encode(chunk.to_textract_response())
+    elapsed = time.perf_counter() - st
+    print(
+        f"{name:>6} {size / MB:>6.1f} MB, {mode:>11}: {n_chunk:>3} chunks, "
+        f"{elapsed:>6.2f} s, {size / MB / elapsed:>8.1f} MB/s"
+    )
+
+
+def main():
+    with tempfile.TemporaryDirectory() as dir_tmp:
+        path_csv = os.path.join(dir_tmp, "data.csv")
+        path_jsonl = os.path.join(dir_tmp, "data.jsonl")
+        make_csv(path_csv)
+        make_jsonl(path_jsonl)
+        for name, path, delimiter in [
+            ("csv", path_csv, ","),
+            ("jsonl", path_jsonl, None),
+        ]:
+            for mode in ["chunk", "text", "text + json"]:
+                run(name, path, delimiter, mode)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark the document hashing throughput and peak memory, read the whole
+object then hash (the old ``get_doc_md5``) versus the streaming hash and the
+parallel tree hash of :func:`aws_textract_pipeline.landing.get_s3_object_hash`.
+
+It uses a tiny file backed S3 stand-in (``get_object`` with ``Range``), so
+that the peak memory only counts the hashing side. The peak memory is
+measured with ``tracemalloc``.
+
+Usage::
+
+    python debug/bench_doc_hash.py
+"""
+
+import os
+import time
+import tempfile
+import tracemalloc
+
+from s3pathlib import S3Path
+
+from aws_textract_pipeline.landing import (
+    MB,
+    get_md5_of_bytes,
+    get_s3_object_hash,
+)
+
+size_list = [16 * MB, 128 * MB]
+
+
+class LocalS3Client:
+    """
+    A file backed stand-in of the boto3 S3 client ``get_object`` and
+    ``head_object`` API.
+    """
+
+    def __init__(self, dir_root: str):
+        self.dir_root = dir_root
+
+    def _path(self, Bucket: str, Key: str) -> str:
+        return os.path.join(self.dir_root, Bucket, Key)
+
+    def put_object(self, Bucket: str, Key: str, size: int):
+        path = self._path(Bucket, Key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "wb") as f:
+            for _ in range(size // MB):
+                f.write(os.urandom(MB))
+
+    def head_object(self, Bucket: str, Key: str) -> dict:
+        return {"ContentLength": os.path.getsize(self._path(Bucket, Key))}
+
+    def get_object(self, Bucket: str, Key: str, Range: str = None) -> dict:
+        f = open(self._path(Bucket, Key), "rb")
+        if Range is None:
+            return {"Body": f}
+        start, end = [int(i) for i in Range[len("bytes=") :].split("-")]
+        f.seek(start)
+        return {"Body": _RangeReader(f, end - start + 1)}
+
+
+class _RangeReader:
+    def __init__(self, f, n: int):
+        self.f = f
+        self.remaining = n
+
+    def read(self, size: int = -1) -> bytes:
+        if size < 0 or size > self.remaining:
+            size = self.remaining
+        data = self.f.read(size)
+        self.remaining -= len(data)
+        return data
+
+    def close(self):
+        self.f.close()
+
+
+def read_all_then_hash(s3_client, s3path: S3Path) -> str:
+    body = s3_client.get_object(Bucket=s3path.bucket, Key=s3path.key)["Body"]
+    with body:
+        return get_md5_of_bytes(body.read())
+
+
+def measure(func) -> tuple:
+    tracemalloc.start()
+    st = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - st
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def main():
+    with tempfile.TemporaryDirectory() as dir_root:
+        s3_client = LocalS3Client(dir_root)
+        for size in size_list:
+            s3path = S3Path("bucket", f"doc-{size}.pdf")
+            s3_client.put_object(s3path.bucket, s3path.key, size)
+            case_list = [
+                ("read all", lambda: read_all_then_hash(s3_client, s3path)),
+                (
+                    "stream 64KB",
+                    lambda: get_s3_object_hash(
+                        s3_client, s3path, chunk_size=64 * 1024
+                    ),
+                ),
+                ("stream 1MB", lambda: get_s3_object_hash(s3_client, s3path)),
+                (
+                    "tree 16MB x4",
+                    lambda: get_s3_object_hash(
+                        s3_client, s3path, part_size=16 * MB, max_workers=4
+                    ),
+                ),
+            ]
+            for name, func in case_list:
+                elapsed, peak = measure(func)
+                print(
+                    f"{size // MB:>4} MB, {name:>12}: "
+                    f"{size / MB / elapsed:>8.1f} MB/s, "
+                    f"peak {peak / MB:>7.2f} MB"
+                )
+
+
+if __name__ == "__main__":
+    main()
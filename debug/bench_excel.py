@@ -0,0 +1,102 @@
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark the Excel segmentation rows/sec and peak RSS, the openpyxl default
+mode (load the whole workbook) versus the read-only streaming mode of
+:func:`aws_textract_pipeline.segment.iter_segment_excel`, including the
+json view encoding of every chunk.
+
+Each case runs in a fresh process, so that the peak RSS (``ru_maxrss``) only
+counts that case. Linux only.
+
+Usage::
+
+    python debug/bench_excel.py
+"""
+
+import os
+import time
+import resource
+import tempfile
+import multiprocessing
+
+import openpyxl
+
+from aws_textract_pipeline.segment import TableChunk, iter_segment_excel
+from aws_textract_pipeline.serializer import JsonSetting
+
+n_row_list = [50000, 200000]
+n_col = 10
+rows_per_chunk = 1000
+
+
+def make_workbook(path: str, n_row: int):
+    workbook = openpyxl.Workbook(write_only=True)
+    worksheet = workbook.create_sheet("data")
+    worksheet.append([f"col{ith}" for ith in range(n_col)])
+    for row_num in range(n_row):
+        worksheet.append(
+            [row_num, row_num * 0.5, f"name {row_num}"]
+            + [f"value {row_num} {ith}" for ith in range(n_col - 3)]
+        )
+    workbook.save(path)
+
+
+def iter_full_load(path: str):
+    """
+    The default mode, build the whole workbook in memory, then chunk it.
+    """
+    workbook = openpyxl.load_workbook(path, data_only=True)
+    section_num = 0
+    for worksheet in workbook.worksheets:
+        rows = list()
+        for row in worksheet.iter_rows(values_only=True):
+            rows.append(["" if value is None else str(value) for value in row])
+            if len(rows) >= rows_per_chunk:
+                section_num += 1
+                yield TableChunk(section_num, worksheet.title, 0, rows)
+                rows = list()
+        if rows:
+            section_num += 1
+            yield TableChunk(section_num, worksheet.title, 0, rows)
+
+
+def run_case(name: str, path: str, queue):
+    json_setting = JsonSetting()
+    if name == "full load":
+        iterator = iter_full_load(path)
+    else:
+        iterator = iter_segment_excel(excel_path=path, rows_per_chunk=rows_per_chunk)
+    st = time.perf_counter()
+    n_row = 0
+    for chunk in iterator:
+        n_row += len(chunk.rows)
+        _ = chunk.text
+        json_setting.encode(chunk.to_textract_response())
+    elapsed = time.perf_counter() - st
+    # ru_maxrss is in KB on Linux
+    queue.put((n_row, elapsed, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss))
+
+
+def main():
+    ctx = multiprocessing.get_context("spawn")
+    with tempfile.TemporaryDirectory() as dir_tmp:
+        for n_row in n_row_list:
+            path = os.path.join(dir_tmp, f"book-{n_row}.xlsx")
+            make_workbook(path, n_row)
+            size = os.path.getsize(path)
+            for name in ["full load", "read-only stream"]:
+                queue = ctx.Queue()
+                process = ctx.Process(target=run_case, args=(name, path, queue))
+                process.start()
+                n_row_read, elapsed, max_rss = queue.get()
+                process.join()
+                print(
+                    f"{n_row:>7} rows ({size / 1024 / 1024:>5.1f} MB), "
+                    f"{name:>16}: {n_row_read / elapsed:>8.0f} rows/s, "
+                    f"peak RSS {max_rss / 1024:>7.1f} MB"
+                )
+
+
+if __name__ == "__main__":
+    main()
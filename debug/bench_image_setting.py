@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark the page image size and encode time of different
+:class:`aws_textract_pipeline.segment.ImageSetting`.
+
+Usage::
+
+    python debug/bench_image_setting.py
+"""
+
+import time
+
+import fitz
+from pathlib_mate import Path
+
+from aws_textract_pipeline.segment import ImageSetting
+
+dir_here = Path.dir_here(__file__)
+path_pdf_list = [
+    dir_here / "f1040.pdf",
+    dir_here / "fw2.pdf",
+]
+
+dpi = 200
+
+image_setting_list = [
+    ImageSetting(format="png"),
+    ImageSetting(format="png", grayscale=True),
+    ImageSetting(format="jpg", quality=95),
+    ImageSetting(format="jpg", quality=75),
+    ImageSetting(format="jpg", quality=75, grayscale=True),
+    ImageSetting(format="webp", quality=75),
+    ImageSetting(format="webp", quality=50),
+    ImageSetting(format="png", max_width=1200, max_height=1200),
+    ImageSetting(format="jpg", quality=75, max_width=1200, max_height=1200),
+]
+
+
+def main():
+    pdf_list = [fitz.Document(path.abspath) for path in path_pdf_list]
+    n_pages = sum(pdf.page_count for pdf in pdf_list)
+    print(f"{n_pages} pages, dpi = {dpi}")
+    for image_setting in image_setting_list:
+        total_size = 0
+        render_time = 0
+        encode_time = 0
+        for pdf in pdf_list:
+            for page in pdf:
+                st = time.perf_counter()
+                pixmap = page.get_pixmap(
+                    dpi=image_setting.get_dpi(page, dpi),
+                    colorspace=fitz.csGRAY if image_setting.grayscale else fitz.csRGB,
+                )
+                render_time += time.perf_counter() - st
+                st = time.perf_counter()
+                total_size += len(image_setting.encode(pixmap))
+                encode_time += time.perf_counter() - st
+        print(
+            f"{image_setting.format:>4} "
+            f"quality={image_setting.quality:>3} "
+            f"grayscale={image_setting.grayscale!s:>5} "
+            f"max={image_setting.max_width}x{image_setting.max_height}: "
+            f"{total_size / n_pages / 1000:>8.1f} KB/page, "
+            f"render {render_time / n_pages * 1000:>6.1f} ms/page, "
+            f"encode {encode_time / n_pages * 1000:>6.1f} ms/page"
+        )
+
+
+if __name__ == "__main__":
+    main()
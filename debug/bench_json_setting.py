@@ -0,0 +1,60 @@
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark the json view encode time and object size of different
+:class:`aws_textract_pipeline.serializer.JsonSetting`, on a real multi-page
+Textract response.
+
+Usage::
+
+    python debug/bench_json_setting.py
+"""
+
+import json
+import time
+
+from pathlib_mate import Path
+
+from aws_textract_pipeline.serializer import JsonSetting
+
+dir_here = Path.dir_here(__file__)
+path_res = dir_here / "data.json"
+
+n_repeat = 20
+
+json_setting_list = [
+    JsonSetting(engine="json"),
+    JsonSetting(engine="orjson"),
+    JsonSetting(engine="orjson", compression="gzip", compression_level=1),
+    JsonSetting(engine="orjson", compression="gzip"),
+    JsonSetting(engine="orjson", compression="zstd"),
+    JsonSetting(format="jsonl", engine="orjson"),
+    JsonSetting(format="jsonl", engine="orjson", compression="gzip"),
+    JsonSetting(format="parquet", compression="zstd"),
+]
+
+
+def main():
+    res = json.loads(path_res.read_text())
+    print(
+        f"{res['DocumentMetadata']['Pages']} pages, "
+        f"{len(res['Blocks'])} blocks, n_repeat = {n_repeat}"
+    )
+    for json_setting in json_setting_list:
+        name = (
+            f"{json_setting.format:>7} {json_setting.engine:>6} "
+            f"{str(json_setting.compression):>4}"
+        )
+        try:
+            st = time.perf_counter()
+            for _ in range(n_repeat):
+                b = json_setting.encode(res)
+            elapsed = (time.perf_counter() - st) / n_repeat
+        except ImportError as e:
+            print(f"{name}: skipped, {e}")
+            continue
+        print(f"{name}: {len(b) / 1000:>8.1f} KB, encode {elapsed * 1000:>7.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark the landing to raw copy time versus object size, single request
+``CopyObject`` versus parallel multipart ``UploadPartCopy``, with
+:func:`aws_textract_pipeline.landing.copy_s3_object`.
+
+It runs against the moto in-process S3 stand-in by default, it measures the
+client side overhead (request count, threading) instead of the real S3
+server side copy throughput. Set ``BENCH_S3_BUCKET`` to run against a real
+bucket with the default AWS credential.
+
+Usage::
+
+    python debug/bench_landing_copy.py
+"""
+
+import os
+import time
+
+import boto3
+import moto
+from s3pathlib import S3Path
+
+from aws_textract_pipeline.landing import MB, copy_s3_object
+
+size_list = [8 * MB, 32 * MB, 128 * MB]
+part_size = 8 * MB
+setting_list = [
+    # (name, multipart_threshold, max_workers)
+    ("single copy", 5 * 1024 * MB, 1),
+    ("multipart x1", 0, 1),
+    ("multipart x4", 0, 4),
+    ("multipart x8", 0, 8),
+]
+
+
+def run(s3_client, bucket: str):
+    for size in size_list:
+        s3path_src = S3Path(bucket, f"bench/src-{size}.bin")
+        s3_client.put_object(
+            Bucket=s3path_src.bucket,
+            Key=s3path_src.key,
+            Body=os.urandom(size),
+        )
+        for name, multipart_threshold, max_workers in setting_list:
+            s3path_dst = S3Path(bucket, f"bench/dst-{size}.bin")
+            st = time.perf_counter()
+            n_part = copy_s3_object(
+                s3_client=s3_client,
+                s3path_src=s3path_src,
+                s3path_dst=s3path_dst,
+                size=size,
+                metadata={"doc_id": "bench"},
+                multipart_threshold=multipart_threshold,
+                part_size=part_size,
+                max_workers=max_workers,
+            )
+            elapsed = time.perf_counter() - st
+            print(
+                f"{size // MB:>4} MB, {name:>13}, {n_part:>3} parts: "
+                f"{elapsed * 1000:>8.1f} ms"
+            )
+
+
+def main():
+    bucket = os.environ.get("BENCH_S3_BUCKET")
+    if bucket:  # pragma: no cover
+        run(boto3.client("s3"), bucket)
+    else:
+        with moto.mock_s3():
+            s3_client = boto3.client("s3", region_name="us-east-1")
+            bucket = "bench-bucket"
+            s3_client.create_bucket(Bucket=bucket)
+            run(s3_client, bucket)
+
+
+if __name__ == "__main__":
+    main()
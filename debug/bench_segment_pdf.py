@@ -0,0 +1,60 @@
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark the page rasterization throughput of
+:func:`aws_textract_pipeline.segment.iter_segment_pdf` with different number
+of worker processes.
+
+Usage::
+
+    python debug/bench_segment_pdf.py
+"""
+
+import os
+import time
+
+import fitz
+from pathlib_mate import Path
+
+from aws_textract_pipeline.segment import iter_segment_pdf
+
+dir_here = Path.dir_here(__file__)
+path_pdf = dir_here / "f1040.pdf"
+
+n_copy = 20  # the sample document has 2 pages, make it 40 pages
+dpi = 200
+
+
+def make_large_pdf() -> bytes:
+    src = fitz.Document(stream=path_pdf.read_bytes())
+    dst = fitz.Document()
+    for _ in range(n_copy):
+        dst.insert_pdf(src)
+    return dst.tobytes()
+
+
+def main():
+    pdf_content = make_large_pdf()
+    n_cpu = os.cpu_count() or 1
+    worker_list = sorted({1, 2, 4, 8, 16, n_cpu})
+    print(f"cpu count = {n_cpu}, dpi = {dpi}")
+    baseline = None
+    for max_workers in worker_list:
+        st = time.perf_counter()
+        images = [
+            page.image_content
+            for page in iter_segment_pdf(pdf_content, dpi=dpi, max_workers=max_workers)
+        ]
+        elapsed = time.perf_counter() - st
+        if baseline is None:
+            baseline = images
+        assert images == baseline
+        print(
+            f"max_workers = {max_workers:>2}: "
+            f"{len(images)} pages in {elapsed:.2f} sec, "
+            f"{len(images) / elapsed:.2f} pages/sec"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark the wall time of
+:meth:`aws_textract_pipeline.tracker.BaseTracker.component_to_textract_output`
+in the synchronous ``AnalyzeDocument`` mode, versus the number of pages and
+the fan-out threads.
+
+It runs against the moto in-process S3 and DynamoDB stand-in, and a fake
+Textract client that sleeps ``sync_latency`` seconds per ``AnalyzeDocument``
+call, so it measures the fan-out overhead. Compare it with the async mode,
+the job queueing plus the polling of ``GetDocumentAnalysis``, which is
+``async_latency`` seconds or more even for a one-page document.
+
+Usage::
+
+    python debug/bench_sync_analyze.py
+"""
+
+import time
+
+import fitz
+import moto
+import pynamodb_mate as pm
+from s3pathlib import S3Path, context
+from boto_session_manager import BotoSesManager
+
+from aws_textract_pipeline.paths import dir_unit_test
+from aws_textract_pipeline.doc_type import DocTypeEnum
+from aws_textract_pipeline.analyze import SyncAnalyzeSetting
+from aws_textract_pipeline.workspace import Workspace
+from aws_textract_pipeline.landing import LandingDocument
+from aws_textract_pipeline.tracker import BaseTracker, BaseStatusAndUpdateTimeIndex
+
+n_page_list = [1, 3, 5]
+max_workers_list = [1, 5]
+sync_latency = 1.5
+async_latency = 20
+
+
+class FakeTextractClient:
+    def analyze_document(self, Document: dict, FeatureTypes: list) -> dict:
+        time.sleep(sync_latency)
+        return {
+            "DocumentMetadata": {"Pages": 1},
+            "Blocks": [{"BlockType": "LINE", "Id": "1", "Text": "hello"}],
+        }
+
+
+class StatusAndUpdateTimeIndex(BaseStatusAndUpdateTimeIndex):
+    pass
+
+
+class Tracker(BaseTracker):
+    class Meta:
+        table_name = "bench-table"
+        region = "us-east-1"
+        billing_mode = pm.PAY_PER_REQUEST_BILLING_MODE
+
+    status_and_update_time_index = StatusAndUpdateTimeIndex()
+
+
+def make_pdf(n_page: int, tag: str) -> bytes:
+    f1040 = fitz.Document(dir_unit_test / "data" / "f1040.pdf")
+    pdf = fitz.Document()
+    for ith in range(n_page):
+        pdf.insert_pdf(f1040, from_page=ith % 2, to_page=ith % 2)
+    pdf.set_metadata({"title": tag})
+    return pdf.tobytes()
+
+
+def run(bsm: BotoSesManager, ws: Workspace, n_page: int, max_workers: int):
+    landing_doc = LandingDocument(
+        s3uri=ws.s3dir_landing.joinpath(f"{n_page}-{max_workers}.pdf").uri,
+        doc_type=DocTypeEnum.pdf.value,
+        features=["FORMS"],
+    )
+    landing_doc.dump(bsm=bsm, body=make_pdf(n_page, f"{n_page}-{max_workers}"))
+    tracker = Tracker.new_from_landing_doc(bsm=bsm, landing_doc=landing_doc)
+    tracker.landing_to_raw(bsm=bsm, workspace=ws)
+    tracker.raw_to_component(bsm=bsm, workspace=ws)
+    st = time.perf_counter()
+    tracker.component_to_textract_output(
+        bsm=bsm,
+        workspace=ws,
+        max_workers=max_workers,
+    )
+    elapsed = time.perf_counter() - st
+    print(
+        f"{n_page:>2} pages, {max_workers} threads: {elapsed:>6.2f} s "
+        f"(async mode >= {async_latency} s)"
+    )
+
+
+def main():
+    with moto.mock_sts(), moto.mock_s3(), moto.mock_dynamodb():
+        bsm = BotoSesManager(region_name="us-east-1")
+        # the tracker only uses the analyze_document API of this client
+        bsm._client_cache["textract"] = FakeTextractClient()
+        context.attach_boto_session(bsm.boto_ses)
+        bucket = "bench-bucket"
+        bsm.s3_client.create_bucket(Bucket=bucket)
+        pm.Connection()
+        Tracker.create_table(wait=True)
+        ws = Workspace(
+            s3dir_uri=S3Path(bucket, "root").to_dir().uri,
+            sync_analyze_setting=SyncAnalyzeSetting(max_pages=max(n_page_list)),
+        )
+        for n_page in n_page_list:
+            for max_workers in max_workers_list:
+                run(bsm, ws, n_page, max_workers)
+
+
+if __name__ == "__main__":
+    main()
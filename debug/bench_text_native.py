@@ -0,0 +1,98 @@
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark the text native segmentation throughput, on generated large
+PowerPoint decks and Word manuals, with
+:func:`aws_textract_pipeline.segment.iter_segment_ppt` and
+:func:`aws_textract_pipeline.segment.iter_segment_word`, including the
+json view encoding of every section.
+
+Usage::
+
+    python debug/bench_text_native.py
+"""
+
+import io
+import time
+
+import docx
+import pptx
+from pptx.util import Inches
+
+from aws_textract_pipeline.segment import (
+    iter_segment_word,
+    iter_segment_ppt,
+    iter_segment_text,
+)
+from aws_textract_pipeline.serializer import JsonSetting
+
+n_slide_list = [100, 500]
+n_chapter_list = [50, 200]
+paragraphs_per_chapter = 40
+sentence = "The quick brown fox jumps over the lazy dog. " * 4
+
+
+def make_deck(n_slide: int) -> bytes:
+    presentation = pptx.Presentation()
+    for ith in range(1, 1 + n_slide):
+        slide = presentation.slides.add_slide(presentation.slide_layouts[1])
+        slide.shapes.title.text = f"Slide {ith}"
+        text_frame = slide.placeholders[1].text_frame
+        text_frame.text = sentence
+        for _ in range(5):
+            text_frame.add_paragraph().text = sentence
+        table = slide.shapes.add_table(
+            4, 3, Inches(1), Inches(5), Inches(6), Inches(1)
+        ).table
+        for cell in table.iter_cells():
+            cell.text = "cell"
+    buffer = io.BytesIO()
+    presentation.save(buffer)
+    return buffer.getvalue()
+
+
+def make_manual(n_chapter: int) -> bytes:
+    document = docx.Document()
+    for ith in range(1, 1 + n_chapter):
+        document.add_heading(f"Chapter {ith}", level=1)
+        for _ in range(paragraphs_per_chapter):
+            document.add_paragraph(sentence)
+    buffer = io.BytesIO()
+    document.save(buffer)
+    return buffer.getvalue()
+
+
+def run(name: str, content: bytes, iter_segment, unit: str):
+    json_setting = JsonSetting()
+    st = time.perf_counter()
+    n_section = 0
+    n_chars = 0
+    for section in iter_segment(content):
+        n_section += 1
+        n_chars += len(section.text)
+        json_setting.encode(section.to_textract_response())
+    elapsed = time.perf_counter() - st
+    print(
+        f"{name:>18}: {len(content) / 1024 / 1024:>6.2f} MB, "
+        f"{n_section:>5} {unit}, {elapsed:>6.2f} s, "
+        f"{n_section / elapsed:>8.1f} {unit}/s, "
+        f"{n_chars / elapsed / 1000000:>6.2f} M chars/s"
+    )
+
+
+def main():
+    for n_slide in n_slide_list:
+        run(f"deck {n_slide} slides", make_deck(n_slide), iter_segment_ppt, "slides")
+    for n_chapter in n_chapter_list:
+        run(
+            f"manual {n_chapter} ch",
+            make_manual(n_chapter),
+            iter_segment_word,
+            "chapters",
+        )
+    content = (sentence + "\n").encode("utf-8") * 500000
+    run("text 86 MB", content, iter_segment_text, "sections")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+# -*- coding: utf-8 -*-
+
+import boto3
+import pytest
+from botocore.stub import Stubber
+
+from aws_textract_pipeline.landing import MB
+from aws_textract_pipeline.analyze import SyncAnalyzeSetting, analyze_document
+
+
+def test_sync_analyze_setting():
+    setting = SyncAnalyzeSetting()
+    assert setting.max_pages == 3
+    assert setting.max_page_size == 5 * MB
+    with pytest.raises(ValueError):
+        SyncAnalyzeSetting(max_pages=0)
+    with pytest.raises(ValueError):
+        SyncAnalyzeSetting(max_page_size=11 * MB)
+
+
+def test_analyze_document():
+    textract_client = boto3.client("textract", region_name="us-east-1")
+    with Stubber(textract_client) as stubber:
+        stubber.add_response(
+            "analyze_document",
+            {
+                "DocumentMetadata": {"Pages": 1},
+                "Blocks": [{"BlockType": "LINE", "Id": "1", "Text": "hello"}],
+                "ResponseMetadata": {"HTTPStatusCode": 200},
+            },
+            expected_params={
+                "Document": {"Bytes": b"%PDF"},
+                "FeatureTypes": ["FORMS"],
+            },
+        )
+        res = analyze_document(textract_client, b"%PDF", ["FORMS"])
+    assert res["Blocks"][0]["Text"] == "hello"
+    assert "ResponseMetadata" not in res
+
+
+if __name__ == "__main__":
+    from aws_textract_pipeline.tests import run_cov_test
+
+    run_cov_test(__file__, "aws_textract_pipeline.analyze", preview=False)
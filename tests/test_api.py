@@ -12,8 +12,55 @@ def test():
     _ = api.LandingDocument
     _ = api.get_md5_of_bytes
     _ = api.get_tar_file_md5
+    _ = api.copy_s3_object
+    _ = api.get_s3_object_hash
+    _ = api.ImageFormatEnum
+    _ = api.ImageSetting
+    _ = api.SegmentPdfPage
+    _ = api.iter_segment_pdf
+    _ = api.TextSection
+    _ = api.iter_segment_word
+    _ = api.segment_word
+    _ = api.TableChunk
+    _ = api.iter_segment_excel
+    _ = api.segment_excel
+    _ = api.iter_segment_ppt
+    _ = api.segment_ppt
+    _ = api.iter_segment_text
+    _ = api.iter_line_chunks
+    _ = api.DataChunk
+    _ = api.iter_segment_data
+    _ = api.iter_segment_json
+    _ = api.TextLayerSetting
+    _ = api.extract_page_text_layer
+    _ = api.JsonFormatEnum
+    _ = api.JsonEngineEnum
+    _ = api.CompressionEnum
+    _ = api.JsonSetting
+    _ = api.TokenBucket
+    _ = api.is_throttling_error
+    _ = api.call_with_backoff
+    _ = api.JobTiming
+    _ = api.TextractJobFailedError
+    _ = api.wait_document_analysis_jobs_to_succeed
+    _ = api.SyncAnalyzeSetting
+    _ = api.analyze_document
+    _ = api.PartialFailureError
+    _ = api.ComponentUploadError
+    _ = api.TextractSubmitError
+    _ = api.TextAndJsonConvertError
+    _ = api.TextAndJsonSummary
     _ = api.BaseStatusAndUpdateTimeIndex
+    _ = api.ComponentStatusEnum
+    _ = api.ComponentProgress
+    _ = api.BaseComponentTracker
     _ = api.BaseTracker
+    _ = api.TextractNotification
+    _ = api.CompletionConsumerStats
+    _ = api.CompletionConsumer
+    _ = api.get_pending_status_list
+    _ = api.SchedulerStats
+    _ = api.Scheduler
 
 
 if __name__ == "__main__":
@@ -1,11 +1,19 @@
 # -*- coding: utf-8 -*-
 
+import io
+import tarfile
+import hashlib
+
 from s3pathlib import S3Path
 
 from aws_textract_pipeline.landing import (
     LandingDocument,
     MetadataKeyEnum,
     DocTypeEnum,
+    MB,
+    copy_s3_object,
+    get_md5_of_bytes,
+    get_s3_object_hash,
     get_tar_file_md5,
     get_doc_md5,
 )
@@ -32,15 +40,120 @@ class TestLandingDocument(BaseTest):
         doc = LandingDocument.load(bsm=self.bsm, s3path=s3path)
         assert doc.s3uri == s3path.uri
         assert doc.doc_type == DocTypeEnum.pdf.value
+        assert doc.size == 4
+        assert doc.content_type == "application/pdf"
+        assert doc.metadata[MetadataKeyEnum.features.value] == "FORMS"
 
         md5 = get_doc_md5(bsm=self.bsm, s3path=s3path, doc_type=DocTypeEnum.pdf.value)
+        assert md5 == get_md5_of_bytes(b"test")
+
+    def test_get_s3_object_hash(self):
+        s3path = S3Path(self.bucket, "hash/doc.pdf")
+        body = bytes(range(256)) * 100
+        s3path.write_bytes(body, bsm=self.bsm)
+        s3_client = self.bsm.s3_client
+
+        md5 = get_md5_of_bytes(body)
+        assert get_s3_object_hash(s3_client, s3path, chunk_size=1000) == md5
+        assert (
+            get_s3_object_hash(s3_client, s3path, algo="sha256")
+            == hashlib.sha256(body).hexdigest()
+        )
+        # a single part tree hash is the plain hash
+        assert get_s3_object_hash(s3_client, s3path, part_size=len(body)) == md5
+        # tree hash
+        tree_hash = get_s3_object_hash(
+            s3_client,
+            s3path,
+            chunk_size=1000,
+            part_size=10000,
+            max_workers=2,
+        )
+        expected = get_md5_of_bytes(
+            "-".join(
+                get_md5_of_bytes(body[i : i + 10000])
+                for i in range(0, len(body), 10000)
+            ).encode("utf-8")
+        )
+        assert tree_hash == expected
+
+    def test_copy_s3_object(self):
+        s3path_src = S3Path(self.bucket, "copy/src.pdf")
+        body = bytes(range(256)) * (11 * MB // 256 + 1)
+        s3path_src.write_bytes(body, bsm=self.bsm)
+        metadata = {"doc_id": "a1b2"}
+
+        # single request copy
+        s3path_dst = S3Path(self.bucket, "copy/dst-1.pdf")
+        n_part = copy_s3_object(
+            s3_client=self.bsm.s3_client,
+            s3path_src=s3path_src,
+            s3path_dst=s3path_dst,
+            size=len(body),
+            metadata=metadata,
+            content_type="application/pdf",
+        )
+        assert n_part == 0
+        s3path_dst.head_object(bsm=self.bsm)
+        assert s3path_dst.metadata == metadata
+        assert s3path_dst.response["ContentType"] == "application/pdf"
+
+        # multipart copy
+        s3path_dst = S3Path(self.bucket, "copy/dst-2.pdf")
+        n_part = copy_s3_object(
+            s3_client=self.bsm.s3_client,
+            s3path_src=s3path_src,
+            s3path_dst=s3path_dst,
+            size=len(body),
+            metadata=metadata,
+            content_type="application/pdf",
+            multipart_threshold=8 * MB,
+            part_size=1 * MB,  # adjusted to the 5 MB minimum
+            max_workers=3,
+        )
+        assert n_part == 3
+        # compare with the stored source, moto may alter large upload body
+        assert s3path_dst.read_bytes(bsm=self.bsm) == s3path_src.read_bytes(
+            bsm=self.bsm
+        )
+        s3path_dst.head_object(bsm=self.bsm)
+        assert s3path_dst.metadata == metadata
+        assert s3path_dst.response["ContentType"] == "application/pdf"
 
     def test_get_tar_file_md5(self):
         path = dir_unit_test / "data" / "src.tar.gz"
         s3path = S3Path(self.bucket, "src.tar.gz")
         s3path.upload_file(path)
         md5 = get_tar_file_md5(bsm=self.bsm, s3path=s3path)
-        assert len(md5) == 32
+        # the same id as the previous non-streaming implementation
+        assert md5 == "4ac08e50fbd858c53b89cedcdd18701b"
+        assert get_tar_file_md5(bsm=self.bsm, s3path=s3path, chunk_size=7) == md5
+
+        # uncompressed tar, the member order doesn't matter
+        def make_tar(names: list) -> bytes:
+            buffer = io.BytesIO()
+            with tarfile.open(fileobj=buffer, mode="w") as tar:
+                for name in names:
+                    content = name.encode("utf-8") * 1000
+                    info = tarfile.TarInfo(name=name)
+                    info.size = len(content)
+                    tar.addfile(info, io.BytesIO(content))
+            return buffer.getvalue()
+
+        s3path_1 = S3Path(self.bucket, "tar/1.tar")
+        s3path_2 = S3Path(self.bucket, "tar/2.tar")
+        s3path_1.write_bytes(make_tar(["b.txt", "a.txt"]), bsm=self.bsm)
+        s3path_2.write_bytes(make_tar(["a.txt", "b.txt"]), bsm=self.bsm)
+        md5 = get_tar_file_md5(bsm=self.bsm, s3path=s3path_1)
+        assert md5 == get_tar_file_md5(bsm=self.bsm, s3path=s3path_2)
+        assert md5 == get_md5_of_bytes(
+            "-".join(
+                [
+                    get_md5_of_bytes(b"a.txt" * 1000),
+                    get_md5_of_bytes(b"b.txt" * 1000),
+                ]
+            ).encode("utf-8")
+        )
 
 
 if __name__ == "__main__":
@@ -0,0 +1,334 @@
+# -*- coding: utf-8 -*-
+
+import json
+
+import fitz
+import moto
+import pytest
+import pynamodb_mate as pm
+from s3pathlib import S3Path
+
+from aws_textract_pipeline.doc_type import DocTypeEnum
+from aws_textract_pipeline.workspace import Workspace
+from aws_textract_pipeline.landing import LandingDocument
+from aws_textract_pipeline.tracker import (
+    StatusEnum,
+    BaseStatusAndUpdateTimeIndex,
+    BaseTracker,
+    ComponentToTextractOutputResult,
+)
+from aws_textract_pipeline.notification import (
+    TextractNotification,
+    CompletionConsumer,
+)
+from aws_textract_pipeline.paths import dir_unit_test
+from aws_textract_pipeline.tests.mock_test import BaseTest
+
+
+class StatusAndUpdateTimeIndex(BaseStatusAndUpdateTimeIndex):
+    # pynamodb binds the index to the model via ``Meta``, don't share the
+    # ``Meta`` with the trackers in other test modules
+    class Meta:
+        index_name = "status_and_update_time-index"
+        projection = pm.IncludeProjection(["create_time"])
+
+
+class Tracker(BaseTracker):
+    class Meta:
+        table_name = "test-notification-table"
+        region = "us-east-1"
+        billing_mode = pm.PAY_PER_REQUEST_BILLING_MODE
+
+    status_and_update_time_index = StatusAndUpdateTimeIndex()
+
+
+def make_message(job_id: str, doc_id: str, status: str = "SUCCEEDED") -> str:
+    return json.dumps(
+        {
+            "JobId": job_id,
+            "Status": status,
+            "API": "StartDocumentAnalysis",
+            "JobTag": doc_id,
+            "Timestamp": 1700000000000,
+            "DocumentLocation": {"S3ObjectName": "key", "S3Bucket": "bucket"},
+        }
+    )
+
+
+def test_textract_notification():
+    body = make_message("job-1", "doc-1")
+    notification = TextractNotification.from_sqs_body(body)
+    assert notification.job_id == "job-1"
+    assert notification.job_tag == "doc-1"
+    assert notification.is_succeeded
+
+    # SNS envelope
+    envelope = json.dumps({"Type": "Notification", "Message": body})
+    assert TextractNotification.from_sqs_body(envelope) == notification
+
+    with pytest.raises(ValueError):
+        TextractNotification.from_sqs_body(json.dumps({"hello": "world"}))
+
+
+class TestCompletionConsumer(BaseTest):
+    mock_list = BaseTest.mock_list + [
+        moto.mock_sns,
+        moto.mock_sqs,
+    ]
+
+    @classmethod
+    def setup_class_post_hook(cls):
+        cls.setup_s3_and_dynamodb()
+        Tracker.create_table(wait=True)
+
+    def test(self):
+        s3dir_root = S3Path(self.bucket, "root-notification").to_dir()
+        ws = Workspace(s3dir_uri=s3dir_root.uri)
+
+        # SNS topic -> SQS queue
+        topic_arn = self.bsm.sns_client.create_topic(Name="textract")["TopicArn"]
+        queue_url = self.bsm.sqs_client.create_queue(QueueName="textract")["QueueUrl"]
+        queue_arn = self.bsm.sqs_client.get_queue_attributes(
+            QueueUrl=queue_url, AttributeNames=["QueueArn"]
+        )["Attributes"]["QueueArn"]
+        self.bsm.sns_client.subscribe(
+            TopicArn=topic_arn, Protocol="sqs", Endpoint=queue_arn
+        )
+
+        pdf = fitz.Document(stream=(dir_unit_test / "data" / "f1040.pdf").read_bytes())
+        landing_doc = LandingDocument(
+            s3uri=ws.s3dir_landing.joinpath("f1040.pdf").uri,
+            doc_type=DocTypeEnum.pdf.value,
+            features=["FORMS"],
+        )
+        landing_doc.dump(bsm=self.bsm, body=pdf.tobytes())
+        tracker = Tracker.new_from_landing_doc(bsm=self.bsm, landing_doc=landing_doc)
+        tracker.landing_to_raw(bsm=self.bsm, workspace=ws, debug=False)
+        tracker.raw_to_component(bsm=self.bsm, workspace=ws, debug=False)
+        comp_id_list = [comp.id for comp in tracker.get_components()]
+        doc_id = tracker.doc_id
+
+        # pretend the Textract jobs are submitted, and wrote the output to S3
+        data_obj = tracker.data_obj
+        data_obj.component_to_textract_output_result = (
+            ComponentToTextractOutputResult(
+                is_single_textract_api_call=False,
+                job_id=None,
+                job_id_list=[f"job-{comp_id}" for comp_id in comp_id_list],
+            )
+        )
+        with tracker.start_component_to_textract_output(debug=False):
+            tracker.set_data(data_obj.to_dict())
+        for comp_id in comp_id_list:
+            s3dir = ws.get_textract_output_s3dir(doc_id=doc_id, comp_id=comp_id)
+            s3dir.joinpath(f"job-{comp_id}", "1").write_text(
+                json.dumps({"JobStatus": "SUCCEEDED", "Blocks": []}),
+                bsm=self.bsm,
+            )
+
+        consumer = CompletionConsumer(
+            tracker_class=Tracker,
+            bsm=self.bsm,
+            workspace=ws,
+            queue_url=queue_url,
+            wait_time_seconds=0,
+            text_and_json_kwargs=dict(from_s3_output=True),
+        )
+
+        def publish(message: str):
+            self.bsm.sns_client.publish(TopicArn=topic_arn, Message=message)
+
+        # the first job succeeded, the document is not ready yet
+        publish(make_message(f"job-{comp_id_list[0]}", doc_id))
+        publish("not a textract notification")
+        publish(make_message("job-x", "unknown-doc"))
+        assert consumer.poll() == 3
+        assert consumer.stats.n_invalid == 2
+        assert consumer.stats.n_converted == 0
+        tracker.refresh()
+        assert tracker.succeeded_job_ids == {f"job-{comp_id_list[0]}"}
+        assert (
+            tracker.status
+            == StatusEnum.s03060_component_to_textract_output_succeeded.value
+        )
+
+        # the last job succeeded, trigger the text and json conversion
+        for comp_id in comp_id_list[1:]:
+            publish(make_message(f"job-{comp_id}", doc_id))
+        assert consumer.poll() == len(comp_id_list) - 1
+        assert consumer.stats.n_converted == 1
+        tracker.refresh()
+        assert (
+            tracker.status
+            == StatusEnum.s05060_textract_output_to_text_and_json_succeeded.value
+        )
+        assert consumer.poll() == 0
+
+        # duplicated delivery is ignored
+        publish(make_message(f"job-{comp_id_list[0]}", doc_id))
+        assert consumer.poll() == 1
+        assert consumer.stats.n_converted == 1
+        assert consumer.poll() == 0
+
+        publish(make_message(f"job-{comp_id_list[0]}", doc_id, status="FAILED"))
+        assert consumer.poll() == 1
+        assert consumer.stats.n_job_failed == 1
+
+    def test_job_done_before_job_id_committed(self):
+        s3dir_root = S3Path(self.bucket, "root-notification-race").to_dir()
+        ws = Workspace(s3dir_uri=s3dir_root.uri)
+        # redeliver the kept messages right away
+        queue_url = self.bsm.sqs_client.create_queue(
+            QueueName="textract-race",
+            Attributes={"VisibilityTimeout": "0"},
+        )["QueueUrl"]
+
+        # use a different content, so that it has a different doc_id
+        pdf = fitz.Document(stream=(dir_unit_test / "data" / "f1040.pdf").read_bytes())
+        pdf.delete_page(1)
+        landing_doc = LandingDocument(
+            s3uri=ws.s3dir_landing.joinpath("f1040-page1.pdf").uri,
+            doc_type=DocTypeEnum.pdf.value,
+            features=["FORMS"],
+        )
+        landing_doc.dump(bsm=self.bsm, body=pdf.tobytes())
+        tracker = Tracker.new_from_landing_doc(bsm=self.bsm, landing_doc=landing_doc)
+        tracker.landing_to_raw(bsm=self.bsm, workspace=ws, debug=False)
+        tracker.raw_to_component(bsm=self.bsm, workspace=ws, debug=False)
+        doc_id = tracker.doc_id
+        s3dir = ws.get_textract_output_s3dir(doc_id=doc_id, comp_id="_root_")
+        s3dir.joinpath("job-1", "1").write_text(
+            json.dumps({"JobStatus": "SUCCEEDED", "Blocks": []}),
+            bsm=self.bsm,
+        )
+        consumer = CompletionConsumer(
+            tracker_class=Tracker,
+            bsm=self.bsm,
+            workspace=ws,
+            queue_url=queue_url,
+            wait_time_seconds=0,
+            text_and_json_kwargs=dict(from_s3_output=True),
+        )
+        self.bsm.sqs_client.send_message(
+            QueueUrl=queue_url,
+            MessageBody=make_message("job-1", doc_id),
+        )
+
+        # the job finished while the job id is being committed
+        data_obj = tracker.data_obj
+        data_obj.component_to_textract_output_result = (
+            ComponentToTextractOutputResult(
+                is_single_textract_api_call=True,
+                job_id="job-1",
+                job_id_list=[],
+            )
+        )
+        with tracker.start_component_to_textract_output(debug=False):
+            assert consumer.poll() == 1
+            assert consumer.stats.n_not_ready == 1
+            tracker.set_data(data_obj.to_dict())
+
+        # the message is kept, the redelivery triggers the conversion
+        assert consumer.poll() == 1
+        assert consumer.stats.n_converted == 1
+        tracker.refresh()
+        assert (
+            tracker.status
+            == StatusEnum.s05060_textract_output_to_text_and_json_succeeded.value
+        )
+        assert consumer.poll() == 0
+
+    def test_partially_submitted(self):
+        s3dir_root = S3Path(self.bucket, "root-notification-partial").to_dir()
+        ws = Workspace(s3dir_uri=s3dir_root.uri)
+        # redeliver the kept messages right away
+        queue_url = self.bsm.sqs_client.create_queue(
+            QueueName="textract-partial",
+            Attributes={"VisibilityTimeout": "0"},
+        )["QueueUrl"]
+
+        # use a different content, so that it has a different doc_id
+        pdf = fitz.Document(stream=(dir_unit_test / "data" / "f1040.pdf").read_bytes())
+        pdf.set_metadata({"title": "partial"})
+        landing_doc = LandingDocument(
+            s3uri=ws.s3dir_landing.joinpath("f1040-partial.pdf").uri,
+            doc_type=DocTypeEnum.pdf.value,
+            features=["FORMS"],
+        )
+        landing_doc.dump(bsm=self.bsm, body=pdf.tobytes())
+        tracker = Tracker.new_from_landing_doc(bsm=self.bsm, landing_doc=landing_doc)
+        tracker.landing_to_raw(bsm=self.bsm, workspace=ws, debug=False)
+        tracker.raw_to_component(bsm=self.bsm, workspace=ws, debug=False)
+        comp_id_list = [comp.id for comp in tracker.get_components()]
+        assert len(comp_id_list) == 2
+        doc_id = tracker.doc_id
+
+        # the second job failed to submit
+        data_obj = tracker.data_obj
+        data_obj.component_to_textract_output_result = (
+            ComponentToTextractOutputResult(
+                is_single_textract_api_call=False,
+                job_id=None,
+                job_id_list=["job-1", None],
+            )
+        )
+        with tracker.start_component_to_textract_output(debug=False):
+            tracker.set_data(data_obj.to_dict())
+        with tracker.update_context():
+            tracker.set_status(
+                StatusEnum.s03040_component_to_textract_output_failed.value
+            )
+        for comp_id, job_id in zip(comp_id_list, ["job-1", "job-2"]):
+            s3dir = ws.get_textract_output_s3dir(doc_id=doc_id, comp_id=comp_id)
+            s3dir.joinpath(job_id, "1").write_text(
+                json.dumps({"JobStatus": "SUCCEEDED", "Blocks": []}),
+                bsm=self.bsm,
+            )
+
+        consumer = CompletionConsumer(
+            tracker_class=Tracker,
+            bsm=self.bsm,
+            workspace=ws,
+            queue_url=queue_url,
+            wait_time_seconds=0,
+            text_and_json_kwargs=dict(from_s3_output=True),
+        )
+
+        # the conversion is not attempted, the message is deleted
+        self.bsm.sqs_client.send_message(
+            QueueUrl=queue_url,
+            MessageBody=make_message("job-1", doc_id),
+        )
+        assert consumer.poll() == 1
+        assert consumer.stats.n_not_ready == 1
+        assert consumer.stats.n_convert_failed == 0
+        assert consumer.poll() == 0
+        tracker.refresh()
+        assert tracker.succeeded_job_ids == {"job-1"}
+        assert (
+            tracker.status
+            == StatusEnum.s03040_component_to_textract_output_failed.value
+        )
+
+        # the retry submitted the rest, its notification triggers the conversion
+        data_obj = tracker.data_obj
+        data_obj.component_to_textract_output_result.job_id_list = ["job-1", "job-2"]
+        with tracker.start_component_to_textract_output(debug=False):
+            tracker.set_data(data_obj.to_dict())
+        self.bsm.sqs_client.send_message(
+            QueueUrl=queue_url,
+            MessageBody=make_message("job-2", doc_id),
+        )
+        assert consumer.poll() == 1
+        assert consumer.stats.n_converted == 1
+        tracker.refresh()
+        assert (
+            tracker.status
+            == StatusEnum.s05060_textract_output_to_text_and_json_succeeded.value
+        )
+
+
+if __name__ == "__main__":
+    from aws_textract_pipeline.tests import run_cov_test
+
+    run_cov_test(__file__, "aws_textract_pipeline.notification", preview=False)
@@ -0,0 +1,281 @@
+# -*- coding: utf-8 -*-
+
+import fitz
+import pynamodb_mate as pm
+from botocore.stub import Stubber
+from s3pathlib import S3Path
+
+from aws_textract_pipeline.doc_type import DocTypeEnum
+from aws_textract_pipeline.workspace import Workspace
+from aws_textract_pipeline.landing import LandingDocument
+from aws_textract_pipeline.tracker import (
+    StatusEnum,
+    StepEnum,
+    BaseStatusAndUpdateTimeIndex,
+    BaseTracker,
+    ComponentToTextractOutputResult,
+)
+from aws_textract_pipeline.scheduler import (
+    get_pending_status_list,
+    Scheduler,
+)
+from aws_textract_pipeline.paths import dir_unit_test
+from aws_textract_pipeline.tests.mock_test import BaseTest
+
+
+class StatusAndUpdateTimeIndex(BaseStatusAndUpdateTimeIndex):
+    # pynamodb binds the index to the model via ``Meta``, don't share the
+    # ``Meta`` with the trackers in other test modules
+    class Meta:
+        index_name = "status_and_update_time-index"
+        projection = pm.IncludeProjection(["create_time"])
+
+
+class Tracker(BaseTracker):
+    class Meta:
+        table_name = "test-scheduler-table"
+        region = "us-east-1"
+        billing_mode = pm.PAY_PER_REQUEST_BILLING_MODE
+
+    status_and_update_time_index = StatusAndUpdateTimeIndex()
+
+
+def test_get_pending_status_list():
+    assert get_pending_status_list(Tracker, StepEnum.landing_to_raw.value) == [
+        StatusEnum.s01000_landing_to_raw_pending.value,
+        StatusEnum.s01040_landing_to_raw_failed.value,
+    ]
+
+
+class TestScheduler(BaseTest):
+    @classmethod
+    def setup_class_post_hook(cls):
+        cls.setup_s3_and_dynamodb()
+        Tracker.create_table(wait=True)
+
+    def test_run(self):
+        s3dir_root = S3Path(self.bucket, "root-scheduler").to_dir()
+        ws = Workspace(s3dir_uri=s3dir_root.uri)
+        doc_id_list = list()
+        for n_page in [1, 2, 3]:
+            # use different content, so that they have different doc_id
+            pdf = fitz.Document(
+                stream=(dir_unit_test / "data" / "f1040.pdf").read_bytes()
+            )
+            for _ in range(n_page):
+                pdf.new_page()
+            landing_doc = LandingDocument(
+                s3uri=ws.s3dir_landing.joinpath(f"doc-{n_page}.pdf").uri,
+                doc_type=DocTypeEnum.pdf.value,
+                features=["FORMS"],
+            )
+            landing_doc.dump(bsm=self.bsm, body=pdf.tobytes())
+            tracker = Tracker.new_from_landing_doc(
+                bsm=self.bsm, landing_doc=landing_doc
+            )
+            doc_id_list.append(tracker.doc_id)
+
+        # a document locked by another worker is skipped
+        locked_tracker = Tracker.get_one_or_none(task_id=doc_id_list[2])
+        with locked_tracker.update_context():
+            locked_tracker.set_locked()
+
+        slept = list()
+        scheduler = Scheduler(
+            tracker_class=Tracker,
+            bsm=self.bsm,
+            workspace=ws,
+            step_concurrency={
+                StepEnum.landing_to_raw.value: 2,
+                StepEnum.raw_to_component.value: 1,
+                StepEnum.component_to_textract_output.value: 0,
+                StepEnum.textract_output_to_text_and_json.value: 0,
+            },
+            poll_interval=1,
+            sleep=slept.append,
+        )
+        stats = scheduler.run(stop_when_idle=True)
+        assert stats.n_succeeded == {
+            StepEnum.landing_to_raw.value: 2,
+            StepEnum.raw_to_component.value: 2,
+        }
+        assert stats.n_failed == {}
+        assert stats.n_skipped >= 1
+        for doc_id, n_component in zip(doc_id_list[:2], [3, 4]):
+            tracker = Tracker.get_one_or_none(task_id=doc_id)
+            assert tracker.status == StatusEnum.s02060_raw_to_component_succeeded.value
+            assert tracker.data_obj.n_components == n_component
+        tracker = Tracker.get_one_or_none(task_id=doc_id_list[2])
+        assert tracker.status == StatusEnum.s01000_landing_to_raw_pending.value
+
+        # the lock is released, the next run picks it up
+        with tracker.update_context():
+            tracker.set_unlock()
+        stats = scheduler.run(max_rounds=5)
+        assert stats.n_succeeded == {
+            StepEnum.landing_to_raw.value: 1,
+            StepEnum.raw_to_component.value: 1,
+        }
+        assert len(slept) >= 1
+        tracker = Tracker.get_one_or_none(task_id=doc_id_list[2])
+        assert tracker.status == StatusEnum.s02060_raw_to_component_succeeded.value
+
+    def test_run_many_deferred(self):
+        s3dir_root = S3Path(self.bucket, "root-scheduler-deferred").to_dir()
+        ws = Workspace(s3dir_uri=s3dir_root.uri)
+        tracker_list = list()
+        for ith in range(4):
+            landing_doc = LandingDocument(
+                s3uri=ws.s3dir_landing.joinpath(f"deferred-{ith}.txt").uri,
+                doc_type=DocTypeEnum.text.value,
+                features=[],
+            )
+            landing_doc.dump(bsm=self.bsm, body=f"deferred {ith}".encode("utf-8"))
+            tracker_list.append(
+                Tracker.new_from_landing_doc(bsm=self.bsm, landing_doc=landing_doc)
+            )
+        # more older documents than the batch size are locked by another worker
+        for tracker in tracker_list[:3]:
+            with tracker.update_context():
+                tracker.set_locked()
+
+        scheduler = Scheduler(
+            tracker_class=Tracker,
+            bsm=self.bsm,
+            workspace=ws,
+            step_concurrency={
+                StepEnum.landing_to_raw.value: 1,
+                StepEnum.raw_to_component.value: 0,
+                StepEnum.component_to_textract_output.value: 0,
+                StepEnum.textract_output_to_text_and_json.value: 0,
+            },
+            batch_size=2,
+            poll_interval=60,
+            sleep=lambda _: None,
+        )
+        stats = scheduler.run(max_rounds=5)
+        # the newer document is not starved by the deferred ones
+        assert stats.n_succeeded == {StepEnum.landing_to_raw.value: 1}
+        assert stats.n_skipped == 3
+        tracker = Tracker.get_one_or_none(task_id=tracker_list[3].doc_id)
+        assert tracker.status == StatusEnum.s01060_landing_to_raw_succeeded.value
+        for tracker in tracker_list[:3]:
+            tracker.refresh()
+            assert tracker.status == StatusEnum.s01000_landing_to_raw_pending.value
+        # don't leave pending documents for the other tests
+        for tracker in tracker_list:
+            tracker.delete()
+
+    def test_is_ready(self):
+        s3dir_root = S3Path(self.bucket, "root-scheduler-is-ready").to_dir()
+        ws = Workspace(s3dir_uri=s3dir_root.uri)
+        # use a different content, so that it has a different doc_id
+        pdf = fitz.Document(stream=(dir_unit_test / "data" / "f1040.pdf").read_bytes())
+        pdf.set_metadata({"title": "is-ready"})
+        landing_doc = LandingDocument(
+            s3uri=ws.s3dir_landing.joinpath("is-ready.pdf").uri,
+            doc_type=DocTypeEnum.pdf.value,
+            features=["FORMS"],
+        )
+        landing_doc.dump(bsm=self.bsm, body=pdf.tobytes())
+        tracker = Tracker.new_from_landing_doc(bsm=self.bsm, landing_doc=landing_doc)
+        tracker.landing_to_raw(bsm=self.bsm, workspace=ws, debug=False)
+        tracker.raw_to_component(bsm=self.bsm, workspace=ws, debug=False)
+        data_obj = tracker.data_obj
+        data_obj.component_to_textract_output_result = (
+            ComponentToTextractOutputResult(
+                is_single_textract_api_call=False,
+                job_id=None,
+                job_id_list=["job-1", "job-2"],
+            )
+        )
+        with tracker.start_component_to_textract_output(debug=False):
+            tracker.set_data(data_obj.to_dict())
+        # reported by the notification consumer
+        tracker.add_succeeded_job_ids(["job-1"])
+
+        scheduler = Scheduler(
+            tracker_class=Tracker,
+            bsm=self.bsm,
+            workspace=ws,
+            poll_interval=10,
+            max_poll_interval=30,
+        )
+        step = StepEnum.textract_output_to_text_and_json.value
+        with Stubber(self.bsm.textract_client) as stubber:
+            # only the job not reported yet is polled
+            for _ in range(3):
+                stubber.add_response(
+                    "get_document_analysis",
+                    {"JobStatus": "IN_PROGRESS"},
+                    {"JobId": "job-2", "MaxResults": 1},
+                )
+            # the document is checked less often each time it is not ready
+            poll_interval_list = list()
+            for _ in range(3):
+                assert scheduler.process(tracker, step) is False
+                poll_interval_list.append(scheduler.get_poll_interval(tracker.doc_id))
+            assert poll_interval_list == [10, 20, 30]
+
+            stubber.add_response(
+                "get_document_analysis",
+                {"JobStatus": "SUCCEEDED"},
+                {"JobId": "job-2", "MaxResults": 1},
+            )
+            assert scheduler.is_ready(tracker, step) is True
+            assert tracker.succeeded_job_ids == {"job-1", "job-2"}
+            # the succeeded jobs are not polled again
+            assert scheduler.is_ready(tracker, step) is True
+            stubber.assert_no_pending_responses()
+
+    def test_retry_delay(self):
+        s3dir_root = S3Path(self.bucket, "root-scheduler-retry").to_dir()
+        ws = Workspace(s3dir_uri=s3dir_root.uri)
+        # use a different content, so that it has a different doc_id
+        pdf = fitz.Document(stream=(dir_unit_test / "data" / "f1040.pdf").read_bytes())
+        pdf.set_metadata({"title": "retry-delay"})
+        landing_doc = LandingDocument(
+            s3uri=ws.s3dir_landing.joinpath("retry-delay.pdf").uri,
+            doc_type=DocTypeEnum.pdf.value,
+            features=["FORMS"],
+        )
+        landing_doc.dump(bsm=self.bsm, body=pdf.tobytes())
+        tracker = Tracker.new_from_landing_doc(bsm=self.bsm, landing_doc=landing_doc)
+        # landing to raw fails
+        S3Path(landing_doc.s3uri).delete(bsm=self.bsm)
+
+        def new_scheduler(retry_delay: float) -> Scheduler:
+            return Scheduler(
+                tracker_class=Tracker,
+                bsm=self.bsm,
+                workspace=ws,
+                step_concurrency={
+                    StepEnum.landing_to_raw.value: 1,
+                    StepEnum.raw_to_component.value: 0,
+                    StepEnum.component_to_textract_output.value: 0,
+                    StepEnum.textract_output_to_text_and_json.value: 0,
+                },
+                poll_interval=60,
+                retry_delay=retry_delay,
+                sleep=lambda _: None,
+            )
+
+        # the failed document is not dispatched again right away
+        stats = new_scheduler(retry_delay=3600).run(max_rounds=3)
+        assert stats.n_failed == {StepEnum.landing_to_raw.value: 1}
+        tracker.refresh()
+        assert tracker.status == StatusEnum.s01040_landing_to_raw_failed.value
+
+        # the delay is based on the update time, it works across workers
+        stats = new_scheduler(retry_delay=3600).run(max_rounds=3)
+        assert stats.n_failed == {}
+        assert stats.n_skipped == 1
+
+        stats = new_scheduler(retry_delay=0).run(max_rounds=1)
+        assert stats.n_failed == {StepEnum.landing_to_raw.value: 1}
+
+
+if __name__ == "__main__":
+    from aws_textract_pipeline.tests import run_cov_test
+
+    run_cov_test(__file__, "aws_textract_pipeline.scheduler", preview=False)
@@ -1,12 +1,376 @@
 # -*- coding: utf-8 -*-
 
-from aws_textract_pipeline.segment import segment_pdf
+import io
+import json
+import os
+import shutil
+import datetime
+import tempfile
+
+import fitz
+import PIL.Image
+
+from aws_textract_pipeline.segment import (
+    ImageFormatEnum,
+    ImageSetting,
+    TextLayerSetting,
+    extract_page_text_layer,
+    segment_pdf,
+    iter_segment_pdf,
+    segment_word,
+    segment_ppt,
+    iter_segment_text,
+    iter_segment_excel,
+    segment_excel,
+    iter_line_chunks,
+    iter_segment_data,
+    iter_segment_json,
+)
 from aws_textract_pipeline.paths import dir_unit_test
 
 
 def test_segment_pdf():
     path_pdf = dir_unit_test / "data" / "f1040.pdf"
     res = segment_pdf(path_pdf.read_bytes())
+    assert res.is_repaired is True
+
+
+def test_segment_pdf_repair():
+    path_pdf = dir_unit_test / "data" / "f1040.pdf"
+    content = path_pdf.read_bytes()
+    res = segment_pdf(content, repair=None)
+    assert res.is_repaired is False
+    assert len(res.page_pdf_list) == 2
+
+    broken_content = content.replace(b"startxref", b"startxrex")
+    res = segment_pdf(broken_content, repair=None)
+    assert res.is_repaired is True
+    assert len(res.page_pdf_list) == 2
+
+    page_list = list(iter_segment_pdf(content, repair=None))
+    assert [page.is_repaired for page in page_list] == [False, False]
+
+
+def test_iter_segment_pdf():
+    path_pdf = dir_unit_test / "data" / "f1040.pdf"
+    res = segment_pdf(path_pdf.read_bytes())
+    page_list = list(iter_segment_pdf(path_pdf.read_bytes()))
+    assert [page.page_num for page in page_list] == [1, 2]
+    for page, pdf, pixmap in zip(page_list, res.page_pdf_list, res.page_image_list):
+        assert fitz.Document(stream=page.pdf_content).page_count == 1
+        assert page.image_content == pixmap.tobytes(output="png")
+
+
+def test_iter_segment_pdf_in_process_pool():
+    path_pdf = dir_unit_test / "data" / "f1040.pdf"
+    page_list = list(iter_segment_pdf(path_pdf.read_bytes()))
+    page_list_1 = list(
+        iter_segment_pdf(path_pdf.read_bytes(), max_workers=2, batch_size=1)
+    )
+    assert [page.page_num for page in page_list_1] == [1, 2]
+    for page, page_1 in zip(page_list, page_list_1):
+        assert page.image_content == page_1.image_content
+
+
+def test_iter_segment_pdf_from_file():
+    path_pdf = dir_unit_test / "data" / "f1040.pdf"
+    page_list = list(iter_segment_pdf(path_pdf.read_bytes()))
+    with tempfile.TemporaryDirectory() as dir_tmp:
+        path_tmp = os.path.join(dir_tmp, "f1040.pdf")
+        shutil.copy(str(path_pdf), path_tmp)
+        page_list_1 = list(iter_segment_pdf(pdf_path=path_tmp))
+        assert os.listdir(dir_tmp) == ["f1040.pdf"]
+    for page, page_1 in zip(page_list, page_list_1):
+        assert page.image_content == page_1.image_content
+
+
+def test_iter_segment_pdf_with_image_setting():
+    path_pdf = dir_unit_test / "data" / "f1040.pdf"
+    for image_setting in [
+        ImageSetting(format=ImageFormatEnum.jpg.value, quality=50, grayscale=True),
+        ImageSetting(format=ImageFormatEnum.webp.value, quality=50),
+        ImageSetting(max_width=850, max_height=850),
+    ]:
+        page = next(iter_segment_pdf(path_pdf.read_bytes(), image_setting=image_setting))
+        image = PIL.Image.open(io.BytesIO(page.image_content))
+        assert image.format == {"jpg": "JPEG", "webp": "WEBP", "png": "PNG"}[
+            image_setting.format
+        ]
+        if image_setting.grayscale:
+            assert image.mode == "L"
+        if image_setting.max_height:
+            assert image.width <= 850
+            assert image.height <= 850
+    assert ImageSetting(format="jpg").content_type == "image/jpeg"
+    assert ImageSetting(format="webp").content_type == "image/webp"
+
+
+def make_mixed_pdf() -> bytes:
+    """
+    Page 1 is born-digital, page 2 is a scanned image of page 2, page 3 is
+    blank.
+    """
+    pdf = fitz.Document(stream=(dir_unit_test / "data" / "f1040.pdf").read_bytes())
+    pixmap = pdf[1].get_pixmap(dpi=72)
+    rect = pdf[1].rect
+    pdf.delete_page(1)
+    page = pdf.new_page(width=rect.width, height=rect.height)
+    page.insert_image(page.rect, stream=pixmap.tobytes("png"))
+    pdf.new_page()
+    return pdf.tobytes()
+
+
+def test_extract_page_text_layer():
+    content = make_mixed_pdf()
+    pdf = fitz.Document(stream=content)
+    section = extract_page_text_layer(pdf[0], 1)
+    assert section.section_num == 1
+    assert len(section.lines) == len(section.bboxes)
+    assert "Form" in section.lines
+    left, top, width, height = section.bboxes[0]
+    assert 0 <= left <= 1 and 0 <= top <= 1 and 0 < width <= 1 and 0 < height <= 1
+    block = section.to_textract_response()["Blocks"][1]
+    assert block["Geometry"]["BoundingBox"]["Left"] == left
+    assert len(block["Geometry"]["Polygon"]) == 4
+
+    # scanned page and blank page
+    assert extract_page_text_layer(pdf[1], 2) is None
+    assert extract_page_text_layer(pdf[2], 3) is None
+    # image coverage is allowed
+    setting = TextLayerSetting(min_chars=0, max_image_coverage=1.0)
+    assert extract_page_text_layer(pdf[1], 2, setting) is not None
+
+    page_list = list(iter_segment_pdf(content, text_layer_setting=TextLayerSetting()))
+    assert [page.is_born_digital for page in page_list] == [True, False, False]
+    assert [page.is_born_digital for page in iter_segment_pdf(content)] == [
+        False,
+        False,
+        False,
+    ]
+    res = segment_pdf(content, text_layer_setting=TextLayerSetting())
+    assert [section is None for section in res.page_text_list] == [False, True, True]
+
+
+def make_docx() -> bytes:
+    import docx
+
+    document = docx.Document()
+    document.add_paragraph("Preface")
+    document.add_heading("Chapter 1", level=1)
+    document.add_paragraph("Hello")
+    document.add_paragraph("")
+    document.add_heading("Section 1.1", level=2)
+    table = document.add_table(rows=2, cols=2)
+    table.cell(0, 0).text = "a"
+    table.cell(0, 1).text = "b"
+    table.cell(1, 0).text = "c"
+    table.cell(1, 1).text = "d"
+    document.add_heading("Chapter 2", level=1)
+    document.add_paragraph("World")
+    buffer = io.BytesIO()
+    document.save(buffer)
+    return buffer.getvalue()
+
+
+def make_pptx() -> bytes:
+    import pptx
+    from pptx.util import Inches
+
+    presentation = pptx.Presentation()
+    slide = presentation.slides.add_slide(presentation.slide_layouts[1])
+    slide.shapes.title.text = "Slide 1"
+    slide.placeholders[1].text_frame.text = "Bullet 1"
+    slide.notes_slide.notes_text_frame.text = "Note 1"
+    slide = presentation.slides.add_slide(presentation.slide_layouts[5])
+    slide.shapes.title.text = "Slide 2"
+    group = slide.shapes.add_group_shape()
+    textbox = group.shapes.add_textbox(Inches(1), Inches(1), Inches(2), Inches(1))
+    textbox.text_frame.text = "Grouped"
+    table = slide.shapes.add_table(1, 2, Inches(1), Inches(3), Inches(4), Inches(1))
+    table.table.cell(0, 0).text = "x"
+    table.table.cell(0, 1).text = "y"
+    presentation.slides.add_slide(presentation.slide_layouts[6])
+    buffer = io.BytesIO()
+    presentation.save(buffer)
+    return buffer.getvalue()
+
+
+def test_segment_word():
+    section_list = segment_word(make_docx())
+    assert [section.title for section in section_list] == [
+        None,
+        "Chapter 1",
+        "Chapter 2",
+    ]
+    assert section_list[1].lines == ["Chapter 1", "Hello", "Section 1.1", "a\tb", "c\td"]
+    assert section_list[2].text == "Chapter 2\nWorld"
+
+    section_list = segment_word(make_docx(), heading_level=2)
+    assert len(section_list) == 4
+
+    res = section_list[1].to_textract_response()
+    assert res["DocumentMetadata"]["Pages"] == 1
+    page_block, *line_blocks = res["Blocks"]
+    assert page_block["BlockType"] == "PAGE"
+    assert page_block["Relationships"][0]["Ids"] == [block["Id"] for block in line_blocks]
+    assert [block["Text"] for block in line_blocks] == ["Chapter 1", "Hello"]
+    assert section_list[1].to_textract_response() == res
+
+
+def test_segment_ppt():
+    section_list = segment_ppt(make_pptx())
+    assert [section.section_num for section in section_list] == [1, 2, 3]
+    assert [section.title for section in section_list] == ["Slide 1", "Slide 2", None]
+    assert section_list[0].lines == ["Slide 1", "Bullet 1"]
+    assert section_list[1].lines == ["Slide 2", "Grouped", "x\ty"]
+    assert section_list[2].lines == []
+
+    section_list = segment_ppt(make_pptx(), include_notes=True)
+    assert section_list[0].lines == ["Slide 1", "Bullet 1", "Note 1"]
+
+
+def test_iter_segment_text():
+    content = "a\nb\fc\n".encode("utf-8")
+    section_list = list(iter_segment_text(content))
+    assert [section.lines for section in section_list] == [["a", "b"], ["c"]]
+
+    content = "\n".join(["x" * 10] * 10).encode("utf-8")
+    section_list = list(iter_segment_text(content, max_chars=33))
+    assert [len(section.lines) for section in section_list] == [3, 3, 3, 1]
+    assert [section.section_num for section in section_list] == [1, 2, 3, 4]
+
+
+def make_xlsx() -> bytes:
+    import openpyxl
+
+    workbook = openpyxl.Workbook()
+    worksheet = workbook.active
+    worksheet.title = "orders"
+    worksheet.append(["id", "date", "note"])
+    for ith in range(1, 6):
+        worksheet.append([ith, datetime.date(2024, 1, ith), "a,b" if ith == 1 else None])
+    worksheet.append([])
+    worksheet.append([6])
+    worksheet = workbook.create_sheet("empty")
+    worksheet = workbook.create_sheet("users")
+    worksheet.append(["name"])
+    worksheet.append(["alice"])
+    buffer = io.BytesIO()
+    workbook.save(buffer)
+    return buffer.getvalue()
+
+
+def test_segment_excel():
+    chunk_list = segment_excel(make_xlsx(), rows_per_chunk=3, header=True)
+    assert [
+        (chunk.section_num, chunk.sheet_name, chunk.start_row, len(chunk.rows))
+        for chunk in chunk_list
+    ] == [
+        (1, "orders", 2, 4),
+        (2, "orders", 5, 4),
+        (3, "users", 2, 2),
+    ]
+    assert chunk_list[0].text.splitlines() == [
+        "id,date,note",
+        '1,2024-01-01T00:00:00,"a,b"',
+        "2,2024-01-02T00:00:00",
+        "3,2024-01-03T00:00:00",
+    ]
+    # the empty row is skipped, the row number is kept
+    assert chunk_list[1].rows[-1] == ["6"]
+
+    chunk_list = segment_excel(make_xlsx(), rows_per_chunk=100)
+    assert [len(chunk.rows) for chunk in chunk_list] == [7, 2]
+
+    res = chunk_list[1].to_textract_response()
+    block_types = [block["BlockType"] for block in res["Blocks"]]
+    assert block_types == ["PAGE", "LINE", "LINE", "TABLE", "CELL", "CELL", "WORD", "WORD"]
+    cell = res["Blocks"][5]
+    assert (cell["RowIndex"], cell["ColumnIndex"]) == (2, 1)
+    assert cell["Relationships"][0]["Ids"] == [res["Blocks"][7]["Id"]]
+    assert res["Blocks"][7]["Text"] == "alice"
+
+    with tempfile.TemporaryDirectory() as dir_tmp:
+        path = os.path.join(dir_tmp, "book.xlsx")
+        with open(path, "wb") as f:
+            f.write(make_xlsx())
+        chunk_list = list(iter_segment_excel(excel_path=path, rows_per_chunk=100))
+        assert [len(chunk.rows) for chunk in chunk_list] == [7, 2]
+
+
+def test_iter_line_chunks():
+    content = b"".join(f"line {ith}\n".encode("utf-8") for ith in range(100))
+    chunk_list = list(iter_line_chunks(io.BytesIO(content), max_bytes=64, read_size=7))
+    assert b"".join(chunk_list) == content
+    assert all(len(chunk) <= 64 for chunk in chunk_list)
+    assert all(chunk.endswith(b"\n") for chunk in chunk_list)
+
+    # a record larger than max_bytes, and no trailing newline
+    content = b"a\n" + b"b" * 100 + b"\nc"
+    chunk_list = list(iter_line_chunks(io.BytesIO(content), max_bytes=10, read_size=3))
+    assert chunk_list == [b"a\n", b"b" * 100 + b"\n", b"c"]
+
+    # the newline in the quoted field is not a boundary
+    content = b'1,"x\ny"\n2,"a""\nb"\n3,z\n'
+    chunk_list = list(
+        iter_line_chunks(io.BytesIO(content), max_bytes=8, read_size=4, quotechar=b'"')
+    )
+    assert chunk_list == [b'1,"x\ny"\n', b'2,"a""\nb"\n', b"3,z\n"]
+
+
+def test_iter_segment_data():
+    content = "\ufeffid,name\n" + "".join(f'{ith},"n\n{ith}"\n' for ith in range(10))
+    chunk_list = list(
+        iter_segment_data(
+            io.BytesIO(content.encode("utf-8")),
+            delimiter=",",
+            max_bytes=30,
+            header=True,
+        )
+    )
+    assert [chunk.start_line for chunk in chunk_list] == [2, 6, 12, 18]
+    assert all(chunk.text.startswith("id,name\n") for chunk in chunk_list)
+    res = chunk_list[0].to_textract_response()
+    lines = [block["Text"] for block in res["Blocks"] if block["BlockType"] == "LINE"]
+    assert lines == ["id,name", '0,"n', '0"', '1,"n', '1"']
+
+    content = b'{"a": 1}\n{"a": 2}\n{"a": 3}\n'
+    chunk_list = list(iter_segment_data(io.BytesIO(content), max_bytes=20))
+    assert [chunk.text for chunk in chunk_list] == ['{"a": 1}\n{"a": 2}\n', '{"a": 3}\n']
+    res = chunk_list[1].to_textract_response()
+    assert res["Blocks"][1]["Text"] == '{"a": 3}'
+
+    # TSV fields are not quoted, a stray quote doesn't hide the boundaries
+    content = 'id\tsize\n0\t5" screen\n' + "".join(
+        f"{ith}\t{ith}\n" for ith in range(1, 20)
+    )
+    chunk_list = list(
+        iter_segment_data(
+            io.BytesIO(content.encode("utf-8")),
+            delimiter="\t",
+            max_bytes=30,
+            quotechar=None,
+        )
+    )
+    assert len(chunk_list) > 1
+    assert all(len(chunk.content) <= 30 for chunk in chunk_list)
+    assert "".join(chunk.text for chunk in chunk_list) == content
+
+
+def test_iter_segment_json():
+    # JSON Lines, split at the line boundary
+    content = b'\n{"a": 1}\n{"a": 2}\n{"a": 3}\n'
+    chunk_list = list(iter_segment_json(io.BytesIO(content), max_bytes=20, read_size=4))
+    assert "".join(chunk.text for chunk in chunk_list) == content.decode("utf-8")
+    assert len(chunk_list) == 2
+
+    # pretty-printed JSON, never split
+    content = ("\ufeff" + json.dumps({"a": list(range(20))}, indent=4)).encode("utf-8")
+    chunk_list = list(iter_segment_json(io.BytesIO(content), max_bytes=20, read_size=4))
+    assert len(chunk_list) == 1
+    assert json.loads(chunk_list[0].text) == {"a": list(range(20))}
+
+    assert list(iter_segment_json(io.BytesIO(b""))) == []
 
 
 if __name__ == "__main__":
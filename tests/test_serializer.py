@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+
+import gzip
+import json
+
+import pytest
+
+from aws_textract_pipeline.serializer import (
+    JsonFormatEnum,
+    JsonEngineEnum,
+    CompressionEnum,
+    JsonSetting,
+)
+
+res = {
+    "DocumentMetadata": {"Pages": 1},
+    "JobStatus": "SUCCEEDED",
+    "Blocks": [
+        {"BlockType": "PAGE", "Id": "1", "Page": 1},
+        {"BlockType": "LINE", "Id": "2", "Page": 1, "Text": "héllo"},
+    ],
+}
+
+
+def test_json_setting():
+    with pytest.raises(ValueError):
+        JsonSetting(format="xml")
+    with pytest.raises(ValueError):
+        JsonSetting(compression="bz2")
+
+    # the default encoder is the standard library
+    json_setting = JsonSetting()
+    assert json_setting.is_orjson is False
+    assert json_setting.encode(res) == json.dumps(res).encode("utf-8")
+
+    for engine in JsonEngineEnum:
+        json_setting = JsonSetting(engine=engine.value)
+        b = json_setting.encode(res)
+        assert json.loads(b) == res
+        assert json_setting.decode(b) == res
+        assert json_setting.content_type == "application/json"
+        assert json_setting.content_encoding is None
+
+    json_setting = JsonSetting(compression=CompressionEnum.gzip.value)
+    b = json_setting.encode(res)
+    assert json.loads(gzip.decompress(b)) == res
+    assert json_setting.decode(b) == res
+    assert json_setting.content_encoding == "gzip"
+
+    json_setting = JsonSetting(format=JsonFormatEnum.jsonl.value)
+    b = json_setting.encode(res)
+    assert [json.loads(line) for line in b.splitlines()] == res["Blocks"]
+    assert json_setting.decode(b) == {"Blocks": res["Blocks"]}
+    assert json_setting.content_type == "application/x-ndjson"
+
+
+def test_json_setting_zstd():
+    json_setting = JsonSetting(compression=CompressionEnum.zstd.value)
+    assert json_setting.decode(json_setting.encode(res)) == res
+
+
+def test_json_setting_parquet():
+    json_setting = JsonSetting(
+        format=JsonFormatEnum.parquet.value,
+        compression=CompressionEnum.zstd.value,
+    )
+    blocks = json_setting.decode(json_setting.encode(res))["Blocks"]
+    assert [block["Id"] for block in blocks] == ["1", "2"]
+    assert json_setting.content_encoding is None
+
+
+if __name__ == "__main__":
+    from aws_textract_pipeline.tests import run_cov_test
+
+    run_cov_test(__file__, "aws_textract_pipeline.serializer", preview=False)
@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+
+import pytest
+from botocore.exceptions import ClientError
+
+from aws_textract_pipeline.throttle import (
+    TokenBucket,
+    is_throttling_error,
+    call_with_backoff,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def clock(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float):
+        self.now += seconds
+
+
+def make_client_error(code: str) -> ClientError:
+    return ClientError(
+        error_response={"Error": {"Code": code, "Message": code}},
+        operation_name="StartDocumentAnalysis",
+    )
+
+
+def test_token_bucket():
+    fake = FakeClock()
+    bucket = TokenBucket(rate=2, clock=fake.clock, sleep=fake.sleep)
+    for _ in range(10):
+        bucket.acquire()
+    # the first 2 calls use the initial burst, the rest wait 0.5 sec each
+    assert fake.now == pytest.approx(4.0)
+
+    with pytest.raises(ValueError):
+        TokenBucket(rate=0)
+
+
+def test_call_with_backoff():
+    fake = FakeClock()
+    n_call = 0
+
+    def func(x):
+        nonlocal n_call
+        n_call += 1
+        if n_call < 3:
+            raise make_client_error("ProvisionedThroughputExceededException")
+        return x
+
+    assert call_with_backoff(func, 1, sleep=fake.sleep) == 1
+    assert n_call == 3
+
+    # not retryable
+    n_call = 0
+
+    def func():
+        nonlocal n_call
+        n_call += 1
+        raise make_client_error("AccessDeniedException")
+
+    with pytest.raises(ClientError):
+        call_with_backoff(func, sleep=fake.sleep)
+    assert n_call == 1
+
+    # give up after max attempts
+    n_call = 0
+
+    def func():
+        nonlocal n_call
+        n_call += 1
+        raise make_client_error("ThrottlingException")
+
+    with pytest.raises(ClientError):
+        call_with_backoff(func, max_attempts=3, sleep=fake.sleep)
+    assert n_call == 3
+
+    assert is_throttling_error(make_client_error("ThrottlingException")) is True
+    assert is_throttling_error(ValueError()) is False
+
+
+if __name__ == "__main__":
+    from aws_textract_pipeline.tests import run_cov_test
+
+    run_cov_test(__file__, "aws_textract_pipeline.throttle", preview=False)
@@ -1,19 +1,41 @@
 # -*- coding: utf-8 -*-
 
+import io
+import os
+import gzip
+import json
+import tempfile
+
+import docx
+import fitz
+import openpyxl
+import pytest
 import moto
+from botocore.stub import Stubber
 import pynamodb_mate as pm
 from s3pathlib import S3Path
 from boto_session_manager import BotoSesManager
 
 from aws_textract_pipeline.doc_type import DocTypeEnum
+from aws_textract_pipeline.segment import ImageSetting, TextLayerSetting
+from aws_textract_pipeline.serializer import JsonSetting
+from aws_textract_pipeline.analyze import SyncAnalyzeSetting
 from aws_textract_pipeline.workspace import Workspace
 from aws_textract_pipeline.landing import LandingDocument
 from aws_textract_pipeline.tracker import (
     StatusEnum,
     BaseStatusAndUpdateTimeIndex,
     BaseTracker,
+    ComponentStatusEnum,
+    BaseComponentTracker,
     Data,
     Component,
+    ComponentToTextractOutputResult,
+    ComponentUploadError,
+    TextractSubmitError,
+    TextAndJsonConvertError,
+    _write_components_to_s3,
+    _read_textract_output_from_s3,
 )
 from aws_textract_pipeline.paths import dir_unit_test
 from aws_textract_pipeline.tests.mock_test import BaseTest
@@ -32,11 +54,23 @@ class Tracker(BaseTracker):
     status_and_update_time_index = StatusAndUpdateTimeIndex()
 
 
+class ComponentTracker(BaseComponentTracker):
+    class Meta:
+        table_name = "test-component-table"
+        region = "us-east-1"
+        billing_mode = pm.PAY_PER_REQUEST_BILLING_MODE
+
+
+class TrackerWithComponentTable(Tracker):
+    COMPONENT_TRACKER_CLASS = ComponentTracker
+
+
 class TestTracker(BaseTest):
     @classmethod
     def setup_class_post_hook(cls):
         cls.setup_s3_and_dynamodb()
         Tracker.create_table(wait=True)
+        ComponentTracker.create_table(wait=True)
 
     def test(self):
         s3dir_root = S3Path(self.bucket, "root").to_dir()
@@ -64,9 +98,19 @@ class TestTracker(BaseTest):
         tracker.landing_to_raw(bsm=self.bsm, workspace=ws, debug=False)
         assert tracker.status == StatusEnum.s01060_landing_to_raw_succeeded.value
 
-        tracker.raw_to_component(bsm=self.bsm, workspace=ws, debug=False)
+        tracker.raw_to_component(bsm=self.bsm, workspace=ws, max_workers=4, debug=False)
         assert tracker.status == StatusEnum.s02060_raw_to_component_succeeded.value
         assert tracker.data_obj.n_components == 2
+        assert [comp.id for comp in tracker.data_obj.components] == ["000001", "000002"]
+
+        # data_obj is cached until the data attribute is replaced
+        data_obj = tracker.data_obj
+        assert tracker.data_obj is data_obj
+        assert not hasattr(data_obj, "__dict__")
+        assert not hasattr(data_obj.components[0], "__dict__")
+        tracker.refresh()
+        assert tracker.data_obj is not data_obj
+        assert tracker.data_obj == data_obj
 
         with tracker.start_component_to_textract_output(debug=False):
             pass
@@ -102,6 +146,676 @@ class TestTracker(BaseTest):
             == StatusEnum.s09060_hil_output_to_hil_post_process_succeeded.value
         )
 
+    def test_raw_to_component_on_disk(self):
+        s3dir_root = S3Path(self.bucket, "root-on-disk").to_dir()
+        ws = Workspace(
+            s3dir_uri=s3dir_root.uri,
+            image_setting=ImageSetting(format="jpg"),
+        )
+        # use a different content, so that it has a different doc_id
+        pdf = fitz.Document(stream=(dir_unit_test / "data" / "f1040.pdf").read_bytes())
+        pdf.delete_page(1)
+        s3path_landing = ws.s3dir_landing.joinpath("f1040-page1.pdf")
+        landing_doc = LandingDocument(
+            s3uri=s3path_landing.uri,
+            doc_type=DocTypeEnum.pdf.value,
+            features=["FORMS"],
+        )
+        landing_doc.dump(bsm=self.bsm, body=pdf.tobytes())
+        tracker = Tracker.new_from_landing_doc(bsm=self.bsm, landing_doc=landing_doc)
+        tracker.landing_to_raw(bsm=self.bsm, workspace=ws, debug=False)
+        with tempfile.TemporaryDirectory() as dir_tmp:
+            components = tracker.raw_to_component(
+                bsm=self.bsm,
+                workspace=ws,
+                tmp_dir=dir_tmp,
+                clear_tmp_dir=True,
+                in_memory=False,
+                debug=False,
+            )
+            assert os.listdir(os.path.join(dir_tmp, tracker.doc_id)) == []
+        assert [comp.id for comp in components] == ["000001"]
+        s3path_image = ws.get_image_s3path(doc_id=tracker.doc_id, comp_id="000001")
+        s3path_image.head_object(bsm=self.bsm)
+        assert s3path_image.response["ContentType"] == "image/jpeg"
+
+    def test_textract_output_to_text_and_json(self):
+        s3dir_root = S3Path(self.bucket, "root-text-and-json").to_dir()
+        ws = Workspace(s3dir_uri=s3dir_root.uri)
+        # use a different content, so that it has a different doc_id
+        pdf = fitz.Document(stream=(dir_unit_test / "data" / "f1040.pdf").read_bytes())
+        pdf.new_page()
+        s3path_landing = ws.s3dir_landing.joinpath("f1040-3-pages.pdf")
+        landing_doc = LandingDocument(
+            s3uri=s3path_landing.uri,
+            doc_type=DocTypeEnum.pdf.value,
+            features=["FORMS"],
+        )
+        landing_doc.dump(bsm=self.bsm, body=pdf.tobytes())
+        tracker = Tracker.new_from_landing_doc(bsm=self.bsm, landing_doc=landing_doc)
+        tracker.landing_to_raw(bsm=self.bsm, workspace=ws, debug=False)
+        tracker.raw_to_component(bsm=self.bsm, workspace=ws, debug=False)
+        comp_id_list = [comp.id for comp in tracker.data_obj.components]
+        assert len(comp_id_list) == 3
+
+        # pretend the Textract jobs are done, and wrote the output to S3
+        data_obj = tracker.data_obj
+        data_obj.component_to_textract_output_result = (
+            ComponentToTextractOutputResult(
+                is_single_textract_api_call=False,
+                job_id=None,
+                job_id_list=[f"job-{comp_id}" for comp_id in comp_id_list],
+            )
+        )
+        with tracker.start_component_to_textract_output(debug=False):
+            tracker.set_data(data_obj.to_dict())
+
+        def write_output(comp_id: str):
+            s3dir = ws.get_textract_output_s3dir(doc_id=tracker.doc_id, comp_id=comp_id)
+            s3dir.joinpath(f"job-{comp_id}", "1").write_text(
+                json.dumps(
+                    {
+                        "JobStatus": "SUCCEEDED",
+                        "Blocks": [{"BlockType": "LINE", "Text": f"page {comp_id}"}],
+                    }
+                ),
+                bsm=self.bsm,
+            )
+
+        # the last component has no output, the others are still converted
+        for comp_id in comp_id_list[:2]:
+            write_output(comp_id)
+        with pytest.raises(TextAndJsonConvertError) as e:
+            tracker.textract_output_to_text_and_json(
+                bsm=self.bsm,
+                workspace=ws,
+                from_s3_output=True,
+                max_workers=3,
+            )
+        assert list(e.value.errors) == [comp_id_list[2]]
+        s3path_text = ws.get_text_s3path(doc_id=tracker.doc_id, comp_id=comp_id_list[0])
+        assert s3path_text.read_text(bsm=self.bsm) == f"page {comp_id_list[0]}"
+        tracker.refresh()
+        assert (
+            tracker.status
+            == StatusEnum.s05040_textract_output_to_text_and_json_failed.value
+        )
+        # the converted components are checkpointed
+        assert tracker.progress.step == "textract_output_to_text_and_json"
+        assert tracker.progress.n_done == 2
+        assert tracker.progress.n_failed == 1
+        assert tracker.progress.n_pending == 0
+        components = tracker.get_components()
+        assert [comp.status for comp in components[:2]] == ["converted", "converted"]
+        assert components[2].status != "converted"
+        assert components[2].error is not None
+
+        # the converted components are not converted again
+        for comp_id in comp_id_list[:2]:
+            ws.get_textract_output_s3dir(
+                doc_id=tracker.doc_id, comp_id=comp_id
+            ).delete(bsm=self.bsm)
+        write_output(comp_id_list[2])
+        res = tracker.textract_output_to_text_and_json(
+            bsm=self.bsm,
+            workspace=ws,
+            from_s3_output=True,
+            max_workers=3,
+            text_max_workers=2,
+            json_setting=JsonSetting(compression="gzip"),
+        )
+        assert res.text_list == [f"page {comp_id}" for comp_id in comp_id_list]
+        assert res.json_list[0]["Blocks"][0]["Text"] == f"page {comp_id_list[0]}"
+        s3path_json = ws.get_json_s3path(doc_id=tracker.doc_id, comp_id=comp_id_list[2])
+        s3path_json.head_object(bsm=self.bsm)
+        assert "gzip" in s3path_json.response["ContentEncoding"].split(",")
+        assert s3path_json.response["ContentType"] == "application/json"
+        assert (
+            tracker.status
+            == StatusEnum.s05060_textract_output_to_text_and_json_succeeded.value
+        )
+        assert tracker.progress.n_done == 3
+        assert tracker.progress.n_failed == 0
+
+    def test_iter_textract_output_to_text_and_json(self):
+        s3dir_root = S3Path(self.bucket, "root-iter-text-and-json").to_dir()
+        ws = Workspace(s3dir_uri=s3dir_root.uri)
+        # use a different content, so that it has a different doc_id
+        pdf = fitz.Document(stream=(dir_unit_test / "data" / "f1040.pdf").read_bytes())
+        pdf.new_page()
+        pdf.new_page()
+        s3path_landing = ws.s3dir_landing.joinpath("f1040-4-pages.pdf")
+        landing_doc = LandingDocument(
+            s3uri=s3path_landing.uri,
+            doc_type=DocTypeEnum.pdf.value,
+            features=["FORMS"],
+        )
+        landing_doc.dump(bsm=self.bsm, body=pdf.tobytes())
+        tracker = Tracker.new_from_landing_doc(bsm=self.bsm, landing_doc=landing_doc)
+        tracker.landing_to_raw(bsm=self.bsm, workspace=ws, debug=False)
+        tracker.raw_to_component(bsm=self.bsm, workspace=ws, debug=False)
+        comp_id_list = [comp.id for comp in tracker.data_obj.components]
+        assert len(comp_id_list) == 4
+
+        # pretend the Textract jobs are done, and wrote the output to S3
+        data_obj = tracker.data_obj
+        data_obj.component_to_textract_output_result = (
+            ComponentToTextractOutputResult(
+                is_single_textract_api_call=False,
+                job_id=None,
+                job_id_list=[f"job-{comp_id}" for comp_id in comp_id_list],
+            )
+        )
+        with tracker.start_component_to_textract_output(debug=False):
+            tracker.set_data(data_obj.to_dict())
+        for comp_id in comp_id_list:
+            s3dir = ws.get_textract_output_s3dir(doc_id=tracker.doc_id, comp_id=comp_id)
+            s3dir.joinpath(f"job-{comp_id}", "1").write_text(
+                json.dumps(
+                    {
+                        "JobStatus": "SUCCEEDED",
+                        "Blocks": [{"BlockType": "LINE", "Text": f"page {comp_id}"}],
+                    }
+                ),
+                bsm=self.bsm,
+            )
+
+        # stop early, the step is failed and unlocked, the finished
+        # components are checkpointed
+        for summary in tracker.iter_textract_output_to_text_and_json(
+            bsm=self.bsm,
+            workspace=ws,
+            from_s3_output=True,
+            max_workers=1,
+        ):
+            assert summary.comp_id == comp_id_list[0]
+            assert summary.n_blocks == 1
+            assert summary.n_chars == len(f"page {comp_id_list[0]}")
+            break
+        tracker.refresh()
+        assert (
+            tracker.status
+            == StatusEnum.s05040_textract_output_to_text_and_json_failed.value
+        )
+        assert tracker.is_locked() is False
+        assert tracker.progress.step == "textract_output_to_text_and_json"
+        n_done = tracker.progress.n_done
+        assert 1 <= n_done < 4
+        assert tracker.get_components()[0].status == "converted"
+
+        # the retry only yields the rest of the components
+        summary_list = list(
+            tracker.iter_textract_output_to_text_and_json(
+                bsm=self.bsm,
+                workspace=ws,
+                from_s3_output=True,
+                max_workers=2,
+            )
+        )
+        assert len(summary_list) == 4 - n_done
+        assert comp_id_list[0] not in [summary.comp_id for summary in summary_list]
+        tracker.refresh()
+        assert (
+            tracker.status
+            == StatusEnum.s05060_textract_output_to_text_and_json_succeeded.value
+        )
+        assert tracker.progress.n_done == 4
+
+    def test_raw_to_component_text_native(self):
+        s3dir_root = S3Path(self.bucket, "root-text-native").to_dir()
+        ws = Workspace(s3dir_uri=s3dir_root.uri)
+        document = docx.Document()
+        for ith in range(1, 4):
+            document.add_heading(f"Chapter {ith}", level=1)
+            document.add_paragraph(f"Content {ith}")
+        buffer = io.BytesIO()
+        document.save(buffer)
+        s3path_landing = ws.s3dir_landing.joinpath("manual.docx")
+        landing_doc = LandingDocument(
+            s3uri=s3path_landing.uri,
+            doc_type=DocTypeEnum.word.value,
+            features=[],
+        )
+        landing_doc.dump(bsm=self.bsm, body=buffer.getvalue())
+        tracker = Tracker.new_from_landing_doc(bsm=self.bsm, landing_doc=landing_doc)
+        tracker.landing_to_raw(bsm=self.bsm, workspace=ws, debug=False)
+        components = tracker.raw_to_component(
+            bsm=self.bsm,
+            workspace=ws,
+            max_workers=2,
+            json_setting=JsonSetting(compression="gzip"),
+            debug=False,
+        )
+        assert [comp.id for comp in components] == ["000001", "000002", "000003"]
+        assert all(comp.status == "converted" for comp in components)
+        assert (
+            tracker.status
+            == StatusEnum.s05060_textract_output_to_text_and_json_succeeded.value
+        )
+        tracker.refresh()
+        assert (
+            tracker.status
+            == StatusEnum.s05060_textract_output_to_text_and_json_succeeded.value
+        )
+        assert tracker.data_obj.n_components == 3
+        s3path_text = ws.get_text_s3path(doc_id=tracker.doc_id, comp_id="000002")
+        assert s3path_text.read_text(bsm=self.bsm) == "Chapter 2\nContent 2"
+        s3path_json = ws.get_json_s3path(doc_id=tracker.doc_id, comp_id="000002")
+        s3path_json.head_object(bsm=self.bsm)
+        assert "gzip" in s3path_json.response["ContentEncoding"].split(",")
+        # no component pdf and image
+        s3path_component = ws.get_component_s3path(doc_id=tracker.doc_id, comp_id="000002")
+        assert s3path_component.exists(bsm=self.bsm) is False
+
+        # the status jump was interrupted, the next step finishes it
+        # without writing the converted components again
+        with tracker.update_context():
+            tracker.set_status(StatusEnum.s02060_raw_to_component_succeeded.value)
+        assert tracker.get_next_step().value == "raw_to_component"
+        s3path_text.delete(bsm=self.bsm)
+        tracker.raw_to_component(bsm=self.bsm, workspace=ws, debug=False)
+        assert (
+            tracker.status
+            == StatusEnum.s05060_textract_output_to_text_and_json_succeeded.value
+        )
+        assert s3path_text.exists(bsm=self.bsm) is False
+
+    def test_raw_to_component_gzip_text(self):
+        s3dir_root = S3Path(self.bucket, "root-gzip-text").to_dir()
+        ws = Workspace(s3dir_uri=s3dir_root.uri)
+        content = "héllo world\nthe second line"
+        s3path_landing = ws.s3dir_landing.joinpath("note.txt.gz")
+        landing_doc = LandingDocument(
+            s3uri=s3path_landing.uri,
+            doc_type=DocTypeEnum.detect_doc_type(s3path_landing.basename),
+            features=[],
+        )
+        landing_doc.dump(bsm=self.bsm, body=gzip.compress(content.encode("utf-8")))
+        tracker = Tracker.new_from_landing_doc(bsm=self.bsm, landing_doc=landing_doc)
+        tracker.landing_to_raw(bsm=self.bsm, workspace=ws, debug=False)
+        components = tracker.raw_to_component(bsm=self.bsm, workspace=ws, debug=False)
+        assert [comp.id for comp in components] == ["000001"]
+        s3path_text = ws.get_text_s3path(doc_id=tracker.doc_id, comp_id="000001")
+        assert s3path_text.read_text(bsm=self.bsm) == content
+
+        # the Office documents are zip archives already
+        document = docx.Document()
+        document.add_paragraph("gzip compressed")
+        buffer = io.BytesIO()
+        document.save(buffer)
+        s3path_landing = ws.s3dir_landing.joinpath("manual.docx.gz")
+        landing_doc = LandingDocument(
+            s3uri=s3path_landing.uri,
+            doc_type=DocTypeEnum.detect_doc_type(s3path_landing.basename),
+            features=[],
+        )
+        landing_doc.dump(bsm=self.bsm, body=gzip.compress(buffer.getvalue()))
+        tracker = Tracker.new_from_landing_doc(bsm=self.bsm, landing_doc=landing_doc)
+        tracker.landing_to_raw(bsm=self.bsm, workspace=ws, debug=False)
+        with pytest.raises(ValueError) as e:
+            tracker.raw_to_component(bsm=self.bsm, workspace=ws, debug=False)
+        assert "gzip compressed word document is not supported" in str(e.value)
+        tracker.refresh()
+        assert tracker.status == StatusEnum.s02040_raw_to_component_failed.value
+
+    def test_raw_to_component_excel(self):
+        s3dir_root = S3Path(self.bucket, "root-excel").to_dir()
+        ws = Workspace(s3dir_uri=s3dir_root.uri)
+        workbook = openpyxl.Workbook()
+        worksheet = workbook.active
+        for ith in range(1, 6):
+            worksheet.append([ith, f"row {ith}"])
+        buffer = io.BytesIO()
+        workbook.save(buffer)
+        s3path_landing = ws.s3dir_landing.joinpath("table.xlsx")
+        landing_doc = LandingDocument(
+            s3uri=s3path_landing.uri,
+            doc_type=DocTypeEnum.excel.value,
+            features=[],
+        )
+        landing_doc.dump(bsm=self.bsm, body=buffer.getvalue())
+        tracker = Tracker.new_from_landing_doc(bsm=self.bsm, landing_doc=landing_doc)
+        tracker.landing_to_raw(bsm=self.bsm, workspace=ws, debug=False)
+        with tempfile.TemporaryDirectory() as dir_tmp:
+            components = tracker.raw_to_component(
+                bsm=self.bsm,
+                workspace=ws,
+                tmp_dir=dir_tmp,
+                clear_tmp_dir=True,
+                in_memory=False,
+                rows_per_chunk=2,
+                debug=False,
+            )
+            assert os.listdir(os.path.join(dir_tmp, tracker.doc_id)) == []
+        assert [comp.id for comp in components] == ["000001", "000002", "000003"]
+        assert (
+            tracker.status
+            == StatusEnum.s05060_textract_output_to_text_and_json_succeeded.value
+        )
+        s3path_text = ws.get_text_s3path(doc_id=tracker.doc_id, comp_id="000003")
+        assert s3path_text.read_text(bsm=self.bsm) == "5,row 5"
+        s3path_json = ws.get_json_s3path(doc_id=tracker.doc_id, comp_id="000003")
+        res = json.loads(s3path_json.read_text(bsm=self.bsm))
+        assert res["Blocks"][1]["Text"] == "5,row 5"
+
+    def test_raw_to_component_csv(self):
+        s3dir_root = S3Path(self.bucket, "root-csv").to_dir()
+        ws = Workspace(s3dir_uri=s3dir_root.uri)
+        content = "id,name\n" + "".join(f"{ith},name {ith}\n" for ith in range(100))
+        s3path_landing = ws.s3dir_landing.joinpath("table.csv.gz")
+        landing_doc = LandingDocument(
+            s3uri=s3path_landing.uri,
+            doc_type=DocTypeEnum.csv.value,
+            features=[],
+        )
+        landing_doc.dump(bsm=self.bsm, body=gzip.compress(content.encode("utf-8")))
+        tracker = Tracker.new_from_landing_doc(bsm=self.bsm, landing_doc=landing_doc)
+        tracker.landing_to_raw(bsm=self.bsm, workspace=ws, debug=False)
+        components = tracker.raw_to_component(
+            bsm=self.bsm,
+            workspace=ws,
+            max_component_size=500,
+            has_header=True,
+            debug=False,
+        )
+        assert len(components) == 3
+        assert (
+            tracker.status
+            == StatusEnum.s05060_textract_output_to_text_and_json_succeeded.value
+        )
+        text_list = [
+            ws.get_text_s3path(doc_id=tracker.doc_id, comp_id=comp.id).read_text(
+                bsm=self.bsm
+            )
+            for comp in components
+        ]
+        assert all(text.startswith("id,name\n") for text in text_list)
+        assert "".join(text[len("id,name\n") :] for text in text_list) == content[
+            len("id,name\n") :
+        ]
+        s3path_json = ws.get_json_s3path(doc_id=tracker.doc_id, comp_id="000001")
+        res = json.loads(s3path_json.read_text(bsm=self.bsm))
+        assert res["Blocks"][1]["Text"] == "id,name"
+
+        # a stray quote in a TSV document doesn't make one big component
+        content = 'id\tsize\n0\t5" screen\n' + "".join(
+            f"{ith}\tsize {ith}\n" for ith in range(1, 100)
+        )
+        landing_doc = LandingDocument(
+            s3uri=ws.s3dir_landing.joinpath("table.tsv").uri,
+            doc_type=DocTypeEnum.tsv.value,
+            features=[],
+        )
+        landing_doc.dump(bsm=self.bsm, body=content.encode("utf-8"))
+        tracker = Tracker.new_from_landing_doc(bsm=self.bsm, landing_doc=landing_doc)
+        tracker.landing_to_raw(bsm=self.bsm, workspace=ws, debug=False)
+        components = tracker.raw_to_component(
+            bsm=self.bsm,
+            workspace=ws,
+            max_component_size=500,
+            debug=False,
+        )
+        assert len(components) == 3
+
+        # a pretty-printed JSON document is not split
+        content = json.dumps({"rows": list(range(200))}, indent=4)
+        landing_doc = LandingDocument(
+            s3uri=ws.s3dir_landing.joinpath("data.json").uri,
+            doc_type=DocTypeEnum.json.value,
+            features=[],
+        )
+        landing_doc.dump(bsm=self.bsm, body=content.encode("utf-8"))
+        tracker = Tracker.new_from_landing_doc(bsm=self.bsm, landing_doc=landing_doc)
+        tracker.landing_to_raw(bsm=self.bsm, workspace=ws, debug=False)
+        components = tracker.raw_to_component(
+            bsm=self.bsm,
+            workspace=ws,
+            max_component_size=500,
+            debug=False,
+        )
+        assert len(components) == 1
+        s3path_text = ws.get_text_s3path(doc_id=tracker.doc_id, comp_id="000001")
+        assert json.loads(s3path_text.read_text(bsm=self.bsm)) == {
+            "rows": list(range(200))
+        }
+
+    def test_raw_to_component_born_digital(self):
+        s3dir_root = S3Path(self.bucket, "root-born-digital").to_dir()
+        ws = Workspace(
+            s3dir_uri=s3dir_root.uri,
+            text_layer_setting=TextLayerSetting(),
+        )
+        # page 1 is born-digital, page 2 is a scanned image
+        pdf = fitz.Document(stream=(dir_unit_test / "data" / "f1040.pdf").read_bytes())
+        pixmap = pdf[1].get_pixmap(dpi=72)
+        rect = pdf[1].rect
+        pdf.delete_page(1)
+        page = pdf.new_page(width=rect.width, height=rect.height)
+        page.insert_image(page.rect, stream=pixmap.tobytes("png"))
+        landing_doc = LandingDocument(
+            s3uri=ws.s3dir_landing.joinpath("mixed.pdf").uri,
+            doc_type=DocTypeEnum.pdf.value,
+            features=["FORMS"],
+        )
+        landing_doc.dump(bsm=self.bsm, body=pdf.tobytes())
+        tracker = Tracker.new_from_landing_doc(bsm=self.bsm, landing_doc=landing_doc)
+        tracker.landing_to_raw(bsm=self.bsm, workspace=ws, debug=False)
+        components = tracker.raw_to_component(bsm=self.bsm, workspace=ws, debug=False)
+        assert [comp.status for comp in components] == ["converted", "created"]
+        assert tracker.status == StatusEnum.s02060_raw_to_component_succeeded.value
+        s3path_text = ws.get_text_s3path(doc_id=tracker.doc_id, comp_id="000001")
+        assert "Form" in s3path_text.read_text(bsm=self.bsm).splitlines()
+        s3path_image = ws.get_image_s3path(doc_id=tracker.doc_id, comp_id="000002")
+        assert s3path_image.exists(bsm=self.bsm)
+        s3path_text = ws.get_text_s3path(doc_id=tracker.doc_id, comp_id="000002")
+        assert s3path_text.exists(bsm=self.bsm) is False
+
+        # the born-digital page has no Textract job
+        result = ComponentToTextractOutputResult(
+            is_single_textract_api_call=False,
+            job_id=None,
+            job_id_list=[None, "job-2"],
+        )
+        assert result.all_job_id_list == ["job-2"]
+
+        # all pages are born-digital, skip the Textract steps
+        landing_doc = LandingDocument(
+            s3uri=ws.s3dir_landing.joinpath("f1040-born-digital.pdf").uri,
+            doc_type=DocTypeEnum.pdf.value,
+            features=["FORMS"],
+        )
+        # use a different content, so that it has a different doc_id
+        pdf = fitz.Document(stream=(dir_unit_test / "data" / "f1040.pdf").read_bytes())
+        pdf.set_metadata({"title": "born-digital"})
+        landing_doc.dump(bsm=self.bsm, body=pdf.tobytes())
+        tracker = Tracker.new_from_landing_doc(bsm=self.bsm, landing_doc=landing_doc)
+        tracker.landing_to_raw(bsm=self.bsm, workspace=ws, debug=False)
+        components = tracker.raw_to_component(bsm=self.bsm, workspace=ws, debug=False)
+        assert [comp.status for comp in components] == ["converted", "converted"]
+        assert (
+            tracker.status
+            == StatusEnum.s05060_textract_output_to_text_and_json_succeeded.value
+        )
+
+    def test_component_to_textract_output_sync(self):
+        s3dir_root = S3Path(self.bucket, "root-sync").to_dir()
+        ws = Workspace(
+            s3dir_uri=s3dir_root.uri,
+            sync_analyze_setting=SyncAnalyzeSetting(max_pages=2),
+        )
+        # use a different content, so that it has a different doc_id
+        pdf = fitz.Document(stream=(dir_unit_test / "data" / "f1040.pdf").read_bytes())
+        pdf.set_metadata({"title": "sync"})
+        landing_doc = LandingDocument(
+            s3uri=ws.s3dir_landing.joinpath("f1040-sync.pdf").uri,
+            doc_type=DocTypeEnum.pdf.value,
+            features=["FORMS"],
+        )
+        landing_doc.dump(bsm=self.bsm, body=pdf.tobytes())
+        tracker = Tracker.new_from_landing_doc(bsm=self.bsm, landing_doc=landing_doc)
+        tracker.landing_to_raw(bsm=self.bsm, workspace=ws, debug=False)
+        tracker.raw_to_component(bsm=self.bsm, workspace=ws, debug=False)
+        components = tracker.get_components()
+        assert tracker._is_sync_analyze_eligible(
+            bsm=self.bsm,
+            workspace=ws,
+            components=components,
+            setting=SyncAnalyzeSetting(max_pages=1),
+        ) is False
+        assert tracker._is_sync_analyze_eligible(
+            bsm=self.bsm,
+            workspace=ws,
+            components=components,
+            setting=SyncAnalyzeSetting(max_page_size=1),
+        ) is False
+
+        def make_response(text: str) -> dict:
+            return {
+                "DocumentMetadata": {"Pages": 1},
+                "Blocks": [{"BlockType": "LINE", "Id": "1", "Text": text}],
+            }
+
+        # the first page failed, the second page is still converted
+        with Stubber(self.bsm.textract_client) as stubber:
+            stubber.add_client_error("analyze_document", "InvalidParameterException")
+            stubber.add_response("analyze_document", make_response("page 2"))
+            with pytest.raises(TextractSubmitError) as e:
+                tracker.component_to_textract_output(
+                    bsm=self.bsm, workspace=ws, debug=False
+                )
+        assert list(e.value.errors) == ["000001"]
+        tracker.refresh()
+        assert (
+            tracker.status
+            == StatusEnum.s03040_component_to_textract_output_failed.value
+        )
+        assert [comp.status for comp in tracker.get_components()] == [
+            "created",
+            "converted",
+        ]
+        assert tracker.progress.n_failed == 1
+
+        # the retry only analyzes the failed page, and skips the wait
+        with Stubber(self.bsm.textract_client) as stubber:
+            stubber.add_response("analyze_document", make_response("page 1"))
+            result = tracker.component_to_textract_output(
+                bsm=self.bsm, workspace=ws, max_workers=2, debug=False
+            )
+        assert result.all_job_id_list == []
+        assert (
+            tracker.status
+            == StatusEnum.s05060_textract_output_to_text_and_json_succeeded.value
+        )
+        for comp_id, text in [("000001", "page 1"), ("000002", "page 2")]:
+            s3path_text = ws.get_text_s3path(doc_id=tracker.doc_id, comp_id=comp_id)
+            assert s3path_text.read_text(bsm=self.bsm) == text
+            s3path_json = ws.get_json_s3path(doc_id=tracker.doc_id, comp_id=comp_id)
+            assert json.loads(s3path_json.read_text(bsm=self.bsm))["Blocks"][0][
+                "Text"
+            ] == text
+
+    def test_component_table(self):
+        s3dir_root = S3Path(self.bucket, "root-component-table").to_dir()
+        ws = Workspace(s3dir_uri=s3dir_root.uri)
+        # use a different content, so that it has a different doc_id
+        pdf = fitz.Document(stream=(dir_unit_test / "data" / "f1040.pdf").read_bytes())
+        pdf.new_page(0)
+        s3path_landing = ws.s3dir_landing.joinpath("f1040-blank-first-page.pdf")
+        landing_doc = LandingDocument(
+            s3uri=s3path_landing.uri,
+            doc_type=DocTypeEnum.pdf.value,
+            features=["FORMS"],
+        )
+        landing_doc.dump(bsm=self.bsm, body=pdf.tobytes())
+        tracker = TrackerWithComponentTable.new_from_landing_doc(
+            bsm=self.bsm,
+            landing_doc=landing_doc,
+        )
+        tracker.landing_to_raw(bsm=self.bsm, workspace=ws, debug=False)
+        tracker.raw_to_component(bsm=self.bsm, workspace=ws, debug=False)
+        comp_id_list = ["000001", "000002", "000003"]
+
+        # the tracker item only keeps the count
+        tracker.refresh()
+        assert tracker.data_obj.components == []
+        assert tracker.data_obj.n_components == 3
+        assert [comp.id for comp in tracker.get_components()] == comp_id_list
+        items = ComponentTracker.batch_get_by_comp_id(
+            doc_id=tracker.doc_id,
+            comp_id_list=["000002", "999999", "000001"],
+        )
+        assert [None if item is None else item.comp_id for item in items] == [
+            "000002",
+            None,
+            "000001",
+        ]
+        assert items[0].status == ComponentStatusEnum.created.value
+
+        # job ids are stored in the component table
+        data_obj = tracker.data_obj
+        tracker._set_component_to_textract_output_result(
+            data_obj,
+            ComponentToTextractOutputResult(
+                is_single_textract_api_call=False,
+                job_id=None,
+                job_id_list=["job-1", None, "job-3"],
+            ),
+            tracker.get_components(),
+        )
+        with tracker.start_component_to_textract_output(debug=False):
+            tracker.set_data_obj(data_obj)
+        tracker.refresh()
+        assert tracker.data_obj.component_to_textract_output_result.job_id_list == []
+        result = tracker.get_component_to_textract_output_result()
+        assert result.job_id_list == ["job-1", None, "job-3"]
+        items = ComponentTracker.query_by_doc_id(tracker.doc_id)
+        assert [item.status for item in items] == [
+            ComponentStatusEnum.submitted.value,
+            ComponentStatusEnum.created.value,
+            ComponentStatusEnum.submitted.value,
+        ]
+
+    def test_write_components_to_s3(self):
+        s3path_ok = S3Path(self.bucket, "upload", "ok.txt")
+        s3path_bad = S3Path("not-exists-bucket", "upload", "bad.txt")
+        items = [
+            (s3path_ok, b"ok", {}, "text/plain"),
+            (s3path_bad, b"bad", {}, "text/plain"),
+        ]
+        with pytest.raises(ComponentUploadError) as e:
+            _write_components_to_s3(
+                s3_client=self.bsm.s3_client,
+                items=items,
+                max_workers=2,
+            )
+        assert list(e.value.errors) == [s3path_bad.uri]
+        assert s3path_ok.read_text(bsm=self.bsm) == "ok"
+
+    def test_read_textract_output_from_s3(self):
+        s3dir_output = S3Path(self.bucket, "textract-output", "doc", "comp").to_dir()
+        s3dir_job = s3dir_output.joinpath("job-1").to_dir()
+        s3dir_job.joinpath(".s3_access_check").write_text("", bsm=self.bsm)
+        # part 10 sorts after part 2
+        for part, block_id in [("1", "a"), ("2", "b"), ("10", "c")]:
+            s3dir_job.joinpath(part).write_text(
+                json.dumps({"JobStatus": "SUCCEEDED", "Blocks": [{"Id": block_id}]}),
+                bsm=self.bsm,
+            )
+        res = _read_textract_output_from_s3(
+            s3_client=self.bsm.s3_client,
+            s3dir_textract_output=s3dir_output,
+            job_id="job-1",
+            max_workers=2,
+        )
+        assert [block["Id"] for block in res["Blocks"]] == ["a", "b", "c"]
+
+        with pytest.raises(FileNotFoundError):
+            _read_textract_output_from_s3(
+                s3_client=self.bsm.s3_client,
+                s3dir_textract_output=s3dir_output,
+                job_id="job-2",
+            )
+
 
 if __name__ == "__main__":
     from aws_textract_pipeline.tests import run_cov_test
@@ -0,0 +1,95 @@
+# -*- coding: utf-8 -*-
+
+import pytest
+
+from aws_textract_pipeline.waiter import (
+    JobStatusEnum,
+    TextractJobFailedError,
+    wait_jobs_to_succeed,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def clock(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float):
+        self.now += seconds
+
+
+def make_get_job_status(clock: FakeClock, finish_time: dict, failed: set = None):
+    failed = failed or set()
+
+    def get_job_status(job_id: str) -> str:
+        if clock.now < finish_time[job_id]:
+            return JobStatusEnum.IN_PROGRESS.value
+        elif job_id in failed:
+            return JobStatusEnum.FAILED.value
+        else:
+            return JobStatusEnum.SUCCEEDED.value
+
+    return get_job_status
+
+
+def test_wait_jobs_to_succeed():
+    fake = FakeClock()
+    finish_time = {"j1": 0, "j2": 10, "j3": 30}
+    timing_list = wait_jobs_to_succeed(
+        get_job_status=make_get_job_status(fake, finish_time),
+        job_id_list=["j1", "j2", "j3"],
+        delays=5,
+        max_delays=10,
+        backoff=2,
+        clock=fake.clock,
+        sleep=fake.sleep,
+    )
+    # poll at 0, 5, 15, 25, 35; total wait is the slowest job
+    assert fake.now == 35
+    assert [timing.job_id for timing in timing_list] == ["j1", "j2", "j3"]
+    assert [timing.n_poll for timing in timing_list] == [1, 3, 5]
+    assert [timing.elapsed for timing in timing_list] == [0, 15, 35]
+    assert all(
+        timing.status == JobStatusEnum.SUCCEEDED.value for timing in timing_list
+    )
+
+
+def test_wait_jobs_to_succeed_fail_fast():
+    fake = FakeClock()
+    finish_time = {"j1": 100, "j2": 10}
+    with pytest.raises(TextractJobFailedError) as e:
+        wait_jobs_to_succeed(
+            get_job_status=make_get_job_status(fake, finish_time, failed={"j2"}),
+            job_id_list=["j1", "j2"],
+            delays=5,
+            backoff=1,
+            clock=fake.clock,
+            sleep=fake.sleep,
+        )
+    assert fake.now == 10
+    assert e.value.job_timing.job_id == "j2"
+    assert e.value.job_timing_list[0].status == JobStatusEnum.IN_PROGRESS.value
+
+
+def test_wait_jobs_to_succeed_timeout():
+    fake = FakeClock()
+    finish_time = {"j1": 100}
+    with pytest.raises(TimeoutError):
+        wait_jobs_to_succeed(
+            get_job_status=make_get_job_status(fake, finish_time),
+            job_id_list=["j1"],
+            delays=5,
+            backoff=1,
+            timeout=30,
+            clock=fake.clock,
+            sleep=fake.sleep,
+        )
+    assert fake.now <= 30
+
+
+if __name__ == "__main__":
+    from aws_textract_pipeline.tests import run_cov_test
+
+    run_cov_test(__file__, "aws_textract_pipeline.waiter", preview=False)